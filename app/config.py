@@ -0,0 +1,134 @@
+import os
+import tempfile
+from typing import Optional
+
+
+def _get_int(name: str, default: Optional[int]) -> Optional[int]:
+    """
+    Читает целочисленную переменную окружения
+
+    Args:
+        name: Имя переменной окружения
+        default: Значение по умолчанию
+
+    Returns:
+        Целое число или значение по умолчанию
+    """
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    """
+    Читает логическую переменную окружения
+
+    Args:
+        name: Имя переменной окружения
+        default: Значение по умолчанию
+
+    Returns:
+        True для значений 1/true/yes/on, False для остальных
+    """
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """
+    Настройки приложения, читаемые из переменных окружения
+    """
+
+    def __init__(self):
+        # Пул процессов для конвертации
+        self.converter_workers = _get_int("CONVERTER_WORKERS", os.cpu_count() or 1)
+        self.converter_start_method = os.environ.get("CONVERTER_START_METHOD", "spawn")
+        self.converter_max_tasks_per_child = _get_int("CONVERTER_MAX_TASKS_PER_CHILD", None)
+
+        # Прием загрузок: максимальный размер и порог сброса на диск
+        self.max_upload_size = _get_int("CONVERTER_MAX_UPLOAD_SIZE", 100 * 1024 * 1024)
+        self.spool_threshold = _get_int("CONVERTER_SPOOL_THRESHOLD", 1024 * 1024)
+        self.spool_dir = os.environ.get("CONVERTER_SPOOL_DIR", "")
+
+        # Размер части тела при потоковой отдаче HTML
+        self.stream_chunk_size = _get_int("CONVERTER_STREAM_CHUNK_SIZE", 64 * 1024)
+
+        # Внешнее хранилище изображений вместо data URI
+        self.image_mode = os.environ.get("CONVERTER_IMAGE_MODE", "inline")
+        self.image_store_dir = os.environ.get(
+            "CONVERTER_IMAGE_STORE_DIR",
+            os.path.join(tempfile.gettempdir(), "docx-converter-images")
+        )
+        self.image_url_prefix = os.environ.get("CONVERTER_IMAGE_URL_PREFIX", "/api/v1/images")
+
+        # Движок HTML: mammoth, native (потоковый, с откатом на Mammoth)
+        # или shadow (Mammoth, с фоновым сравнением нативного движка в логах)
+        self.html_engine = os.environ.get("CONVERTER_HTML_ENGINE", "mammoth")
+
+        # Превью: сколько элементов документа сначала читать через Mammoth,
+        # если задан только бюджет HTML в байтах (число растет до бюджета)
+        self.preview_max_blocks = _get_int("CONVERTER_PREVIEW_MAX_BLOCKS", 500)
+
+        # Сжатие ответов по Accept-Encoding
+        self.compression_min_size = _get_int("CONVERTER_COMPRESSION_MIN_SIZE", 1024)
+        self.compression_level = _get_int("CONVERTER_COMPRESSION_LEVEL", 6)
+
+        # Конвертация файлов с общего тома по пути (пустой список - отключена)
+        self.shared_dirs = [
+            d for d in os.environ.get("CONVERTER_SHARED_DIRS", "").split(os.pathsep) if d
+        ]
+        self.shared_max_file_size = _get_int("CONVERTER_SHARED_MAX_FILE_SIZE", 1024 * 1024 * 1024)
+        
+        # Лимит уникальных групп предупреждений и длины списков предупреждений
+        # (conversion_warnings, style_analysis) в ответе (0 - без ограничения)
+        self.warning_groups_max = _get_int("CONVERTER_WARNING_GROUPS_MAX", 200)
+        
+        # Очередь допуска запросов на конвертацию
+        self.max_in_flight = _get_int("CONVERTER_MAX_IN_FLIGHT", self.converter_workers)
+        self.max_waiting = _get_int("CONVERTER_MAX_WAITING", self.converter_workers * 4)
+
+        # Фоновые задачи конвертации
+        self.job_workers = _get_int("CONVERTER_JOB_WORKERS", self.converter_workers)
+        self.job_max_pending = _get_int("CONVERTER_JOB_MAX_PENDING", 100)
+        self.job_ttl_seconds = _get_int("CONVERTER_JOB_TTL_SECONDS", 3600)
+        # Лимиты хранимых результатов: сверх них удаляются самые старые
+        # завершенные задачи
+        self.job_max_stored = _get_int("CONVERTER_JOB_MAX_STORED", 1000)
+        self.job_max_stored_bytes = _get_int("CONVERTER_JOB_MAX_STORED_BYTES", 256 * 1024 * 1024)
+
+        # Пакетная конвертация
+        self.batch_max_files = _get_int("CONVERTER_BATCH_MAX_FILES", 500)
+        self.batch_concurrency = _get_int("CONVERTER_BATCH_CONCURRENCY", self.converter_workers)
+        self.archive_max_entry_size = _get_int("CONVERTER_ARCHIVE_MAX_ENTRY_SIZE", 100 * 1024 * 1024)
+
+        # Кэш результатов конвертации (0 - кэш отключен)
+        self.cache_max_bytes = _get_int("CONVERTER_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+        # Кэш сжатых представлений ответов
+        self.representation_cache_max_bytes = _get_int(
+            "CONVERTER_REPRESENTATION_CACHE_MAX_BYTES", 64 * 1024 * 1024
+        )
+
+        # Дисковый кэш, общий для процессов на хосте (пустой каталог - отключен)
+        self.disk_cache_dir = os.environ.get("CONVERTER_DISK_CACHE_DIR", "")
+        self.disk_cache_max_bytes = _get_int("CONVERTER_DISK_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+        self.disk_cache_compress = _get_bool("CONVERTER_DISK_CACHE_COMPRESS", True)
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """
+    Получить настройки приложения
+
+    Returns:
+        Экземпляр Settings (создается один раз на процесс)
+    """
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
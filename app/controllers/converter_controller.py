@@ -1,27 +1,147 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Query
-from fastapi.responses import JSONResponse, HTMLResponse
-from app.services.converter_service import ConverterService
+import html
+import json
+import os
+import time
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from urllib.parse import unquote
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query, Header, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.controllers.responses import (
+    build_json_content,
+    encode_response,
+    etag_matches,
+    not_modified,
+    render_result,
+    resolve_fields,
+    response_etag
+)
+from app.models.conversion_options import ConversionOptions
+from app.services.admission_controller import QueueFullError, get_admission_controller
+from app.services.archive_service import ArchiveConverter
+from app.services.batch_service import BatchConverter, BatchItem
+from app.services.converter_service import TEXT_PROFILE, ConverterService
+from app.services.disk_cache import get_disk_cache
+from app.services.result_cache import get_result_cache
+from app.services.shared_path_service import get_shared_path_service
+from app.services.single_flight import get_single_flight
+from app.services.upload_ingestor import IngestedUpload
+from app.utils.compression import StreamCompressor, negotiate_encoding
 from app.utils.logger import get_logger
 
 router = APIRouter(tags=["converter"])
 logger = get_logger(__name__)
 
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# Допустимые Content-Type тела для /convert/raw
+RAW_DOCX_CONTENT_TYPES = (DOCX_CONTENT_TYPE, "application/octet-stream")
+
+
+async def _enter_admission_slot() -> AsyncExitStack:
+    """
+    Занимает место в очереди допуска для потокового ответа.
+    
+    Место освобождается вызовом aclose() у возвращенного стека,
+    когда поток ответа завершен.
+    """
+    stack = AsyncExitStack()
+    try:
+        await stack.enter_async_context(get_admission_controller().slot())
+    except QueueFullError as qe:
+        raise HTTPException(
+            status_code=429,
+            detail="Сервер перегружен, повторите запрос позже",
+            headers={"Retry-After": str(qe.retry_after)}
+        )
+    return stack
+
+
+def _check_admission() -> None:
+    """
+    Отклоняет пакетный запрос с 429, если очередь допуска заполнена;
+    места занимают сами файлы пакета (BatchConverter)
+    """
+    try:
+        get_admission_controller().check()
+    except QueueFullError as qe:
+        raise HTTPException(
+            status_code=429,
+            detail="Сервер перегружен, повторите запрос позже",
+            headers={"Retry-After": str(qe.retry_after)}
+        )
+
+
+def _make_options(
+    images: Optional[str],
+    preview_blocks: Optional[int] = None,
+    preview_bytes: Optional[int] = None
+) -> ConversionOptions:
+    """
+    Собирает параметры конвертации из параметров запроса
+    """
+    image_mode = (images or get_settings().image_mode).lower()
+    if image_mode not in (ConversionOptions.IMAGES_INLINE, ConversionOptions.IMAGES_STORE):
+        raise HTTPException(status_code=400, detail="Параметр images: inline или store")
+    return ConversionOptions(
+        image_mode=image_mode,
+        preview_blocks=preview_blocks,
+        preview_bytes=preview_bytes
+    )
+
 
 @router.post("/convert")
 async def convert_file(
     file: UploadFile = File(...),
-    format: str = Query("json", description="Формат ответа: json или html")
+    format: str = Query("json", description="Формат ответа: json, html или text"),
+    stream: bool = Query(False, description="Потоковая отдача (для format=html и text)"),
+    images: Optional[str] = Query(None, description="Изображения: inline (data URI) или store (ссылки)"),
+    preview_blocks: Optional[int] = Query(None, ge=1, description="Превью: только первые N элементов документа"),
+    preview_bytes: Optional[int] = Query(None, ge=1, description="Превью: остановиться, когда HTML достигнет N байт"),
+    fields: Optional[str] = Query(None, description="Поля JSON ответа через запятую"),
+    profile: Optional[str] = Query(None, description="Набор полей: full, minimal, html, sections, diagnostics"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
 ):
     """
     Конвертирует DOCX файл в HTML
     
     Parameters:
     - file: DOCX файл для конвертации
-    - format: Формат ответа - 'json' (по умолчанию) или 'html'
+    - format: Формат ответа - 'json' (по умолчанию), 'html' или 'text'.
+      text - простой текст документа для индексации (параграфы разделены
+      пустой строкой), как mammoth.extract_raw_text: без карты стилей,
+      трансформаций, анализа предупреждений и HTML; параметры images,
+      fields и profile не учитываются, превью не поддерживается
+    - stream: При format=html отдавать тот же HTML, что и без stream,
+      частями: при CONVERTER_HTML_ENGINE=native - по мере конвертации,
+      иначе (а также для превью и документов, которые не поддерживает
+      нативный движок) - после конвертации целиком; при format=text
+      текст отдается по мере чтения документа
+    - images: 'inline' - встраивать изображения как data URI,
+      'store' - сохранять во внешнее хранилище и ссылаться на /images/{hash};
+      по умолчанию - значение CONVERTER_IMAGE_MODE
+    - preview_blocks: Превью - конвертировать только первые N элементов
+      верхнего уровня документа (параграфов, таблиц); разбор остального
+      документа не выполняется
+    - preview_bytes: Превью - остановиться, когда HTML достигнет N байт
+      (по границе элемента); в ответе truncated=true, если документ
+      показан не полностью. Превью кэшируются отдельно от полной конвертации
+    - fields: Поля JSON ответа через запятую (например, html_content,status)
+    - profile: Именованный набор полей JSON ответа: full (по умолчанию),
+      minimal, html, sections, diagnostics; fields имеет приоритет над profile.
+      Вычисляются только поля, попавшие в ответ. Поле sections - разделы
+      html_content по заголовкам h1/h2 со смещением и длиной в байтах
+      UTF-8; раздел сохраненного результата отдает /jobs/{job_id}/sections/{index}
+    - If-None-Match: ETag ранее полученного ответа
+    - Accept-Encoding: Ответ сжимается zstd, br или gzip (если поддерживается)
     
     Returns:
     - При format=json: JSON с информацией о конвертации
     - При format=html: HTML страница с результатом конвертации
+    - При format=text: text/plain с текстом документа
+    - 304 без тела, если If-None-Match совпадает с ETag результата
     """
     request_id = id(file)
     logger.info(
@@ -32,9 +152,232 @@ async def convert_file(
         response_format=format
     )
     
+    return await _convert_request(
+        lambda service: service.ingest_file(file),
+        file.filename,
+        format=format,
+        stream=stream,
+        options=_make_options(images, preview_blocks, preview_bytes),
+        response_fields=resolve_fields(fields, profile),
+        if_none_match=if_none_match,
+        accept_encoding=accept_encoding,
+        request_id=request_id
+    )
+
+
+@router.post("/convert/raw")
+async def convert_raw(
+    request: Request,
+    format: str = Query("json", description="Формат ответа: json, html или text"),
+    stream: bool = Query(False, description="Потоковая отдача (для format=html и text)"),
+    images: Optional[str] = Query(None, description="Изображения: inline (data URI) или store (ссылки)"),
+    preview_blocks: Optional[int] = Query(None, ge=1, description="Превью: только первые N элементов документа"),
+    preview_bytes: Optional[int] = Query(None, ge=1, description="Превью: остановиться, когда HTML достигнет N байт"),
+    fields: Optional[str] = Query(None, description="Поля JSON ответа через запятую"),
+    profile: Optional[str] = Query(None, description="Набор полей: full, minimal, html, sections, diagnostics"),
+    x_filename: Optional[str] = Header(None, description="Имя исходного файла (допускается percent-encoding)"),
+    content_type: Optional[str] = Header(None),
+    content_length: Optional[int] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Конвертирует DOCX файл, переданный телом запроса без multipart обертки
+    
+    Тело читается потоково сразу в конвейер приема (хэш, лимит размера,
+    временный файл), без разбора multipart/form-data.
+    
+    Parameters:
+    - Тело запроса: содержимое DOCX файла
+    - Content-Type: application/vnd.openxmlformats-officedocument.wordprocessingml.document
+      (или application/octet-stream)
+    - X-Filename: Имя исходного файла; по умолчанию document.docx
+    - Остальные параметры - как у /convert
+    
+    Returns:
+    - Как у /convert; 415 при неподдерживаемом Content-Type,
+      413 если Content-Length превышает максимальный размер загрузки
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in RAW_DOCX_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Ожидается тело с Content-Type {DOCX_CONTENT_TYPE}"
+        )
+    
+    max_size = get_settings().max_upload_size
+    if content_length is not None and content_length > max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Файл слишком большой (максимум {max_size} байт)"
+        )
+    
+    filename = unquote(x_filename) if x_filename else "document.docx"
+    request_id = id(request)
+    logger.info(
+        "Начало обработки запроса на конвертацию тела запроса",
+        request_id=request_id,
+        filename=filename,
+        content_length=content_length,
+        response_format=format
+    )
+    
+    return await _convert_request(
+        lambda service: service.ingest_stream(request.stream(), filename),
+        filename,
+        format=format,
+        stream=stream,
+        options=_make_options(images, preview_blocks, preview_bytes),
+        response_fields=resolve_fields(fields, profile),
+        if_none_match=if_none_match,
+        accept_encoding=accept_encoding,
+        request_id=request_id
+    )
+
+
+@router.post("/convert/path")
+async def convert_path(
+    path: str = Query(..., description="Путь к DOCX файлу в разрешенном каталоге общего тома"),
+    output: str = Query("return", description="return - вернуть результат, write - записать HTML рядом с файлом"),
+    format: str = Query("json", description="Формат ответа при output=return: json, html или text"),
+    images: Optional[str] = Query(None, description="Изображения: inline (data URI) или store (ссылки)"),
+    preview_blocks: Optional[int] = Query(None, ge=1, description="Превью: только первые N элементов документа"),
+    preview_bytes: Optional[int] = Query(None, ge=1, description="Превью: остановиться, когда HTML достигнет N байт"),
+    fields: Optional[str] = Query(None, description="Поля JSON ответа через запятую"),
+    profile: Optional[str] = Query(None, description="Набор полей: full, minimal, html, sections, diagnostics"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Конвертирует DOCX файл, уже лежащий на общем томе, без загрузки по HTTP
+    
+    Доступно только для каталогов из CONVERTER_SHARED_DIRS; исходный
+    файл не копируется и не удаляется.
+    
+    Parameters:
+    - path: Путь к DOCX файлу
+    - output: 'return' (по умолчанию) - ответ как у /convert;
+      'write' - записать полный HTML в файл <имя>.html рядом с исходным
+      и вернуть путь к нему
+    - Остальные параметры - как у /convert
+    
+    Returns:
+    - При output=return: как у /convert
+    - При output=write: JSON с путем к записанному файлу и сводкой
+    - 403 для путей вне разрешенных каталогов, 404 если файла нет
+    """
+    shared_paths = get_shared_path_service()
+    request_id = id(path)
+    logger.info(
+        "Начало обработки запроса на конвертацию по пути",
+        request_id=request_id,
+        path=path,
+        output=output
+    )
+    
+    async def ingest(service: ConverterService) -> IngestedUpload:
+        return await shared_paths.ingest(path, service.validate_filename)
+    
+    options = _make_options(images, preview_blocks, preview_bytes)
+    if output == "return":
+        return await _convert_request(
+            ingest,
+            os.path.basename(path),
+            format=format,
+            stream=False,
+            options=options,
+            response_fields=resolve_fields(fields, profile),
+            if_none_match=if_none_match,
+            accept_encoding=accept_encoding,
+            request_id=request_id
+        )
+    if output != "write":
+        raise HTTPException(status_code=400, detail="Параметр output: return или write")
+    if options.is_preview:
+        raise HTTPException(status_code=400, detail="Превью нельзя записать рядом с файлом")
+    
     try:
-        converter_service = ConverterService()
-        result = await converter_service.convert_file(file)
+        async with get_admission_controller().slot():
+            converter_service = ConverterService(options)
+            upload = await ingest(converter_service)
+            result = await converter_service.convert_upload(upload)
+            output_path = await run_in_threadpool(
+                shared_paths.write_output, upload.path, result["complete_html"]
+            )
+    except QueueFullError as qe:
+        raise HTTPException(
+            status_code=429,
+            detail="Сервер перегружен, повторите запрос позже",
+            headers={"Retry-After": str(qe.retry_after)}
+        )
+    except OSError as e:
+        logger.error("Не удалось записать результат рядом с исходным файлом",
+                     request_id=request_id,
+                     path=path,
+                     error_message=str(e))
+        raise HTTPException(status_code=500, detail=f"Не удалось записать результат: {str(e)}")
+    
+    logger.info("Результат записан на общий том",
+                request_id=request_id,
+                output_path=output_path,
+                status=result["status"])
+    
+    return JSONResponse(content={
+        "message": "Файл успешно конвертирован",
+        "original_filename": result["original_filename"],
+        "file_size": result["file_size"],
+        "output_path": output_path,
+        "warnings_count": result["warnings_count"],
+        "errors_count": result["errors_count"],
+        "status": result["status"]
+    })
+
+
+async def _convert_request(
+    ingest: Callable[[ConverterService], Awaitable[IngestedUpload]],
+    filename: str,
+    format: str,
+    stream: bool,
+    options: ConversionOptions,
+    response_fields: List[str],
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+    request_id: int
+) -> Response:
+    """
+    Общая часть /convert и /convert/raw: прием файла функцией ingest,
+    проверка ETag, конвертация и формирование ответа
+    """
+    if format.lower() == "text":
+        if options.is_preview:
+            raise HTTPException(status_code=400, detail="Превью не поддерживается для format=text")
+        return await _text_response(ingest, stream, if_none_match, accept_encoding, request_id)
+    
+    if stream and format.lower() == "html":
+        return await _stream_html(ingest, filename, options, if_none_match, accept_encoding, request_id)
+    
+    try:
+        admission = get_admission_controller()
+        async with admission.slot():
+            converter_service = ConverterService(options)
+            upload = await ingest(converter_service)
+            try:
+                if format.lower() == "html":
+                    variant = f"html:{filename}"
+                else:
+                    variant = f"json:{filename}:{','.join(response_fields)}"
+                etag = converter_service.make_etag(upload.content_hash, variant)
+                
+                encoding = negotiate_encoding(accept_encoding)
+                if etag_matches(if_none_match, etag, encoding):
+                    logger.info("Результат не изменился, возврат 304",
+                                request_id=request_id,
+                                etag=etag)
+                    return not_modified(etag, encoding)
+                
+                result = await converter_service.convert_upload(upload)
+            finally:
+                upload.cleanup()
         
         logger.info(
             "Конвертация успешно завершена",
@@ -48,30 +391,20 @@ async def convert_file(
         
         if format.lower() == "html":
             logger.debug("Возврат результата в HTML формате", request_id=request_id)
-            return HTMLResponse(
-                content=result["complete_html"],
-                status_code=200
-            )
-        
-        logger.debug("Возврат результата в JSON формате", request_id=request_id)
-        return JSONResponse(
-            status_code=200,
-            content={
-                "message": "Файл успешно конвертирован",
-                "original_filename": result["original_filename"],
-                "file_size": result["file_size"],
-                "html_content": result["html_content"],
-                "complete_html": result["complete_html"],
-                "conversion_warnings": result["conversion_warnings"],
-                "conversion_errors": result["conversion_errors"],
-                "style_analysis": result["style_analysis"],
-                "warning_summary": result["warning_summary"],
-                "warnings_count": result["warnings_count"],
-                "errors_count": result["errors_count"],
-                "status": result["status"]
-            }
+        else:
+            logger.debug("Возврат результата в JSON формате", request_id=request_id)
+        return await encode_response(
+            render_result(result, format, headers={"ETag": etag}, fields=response_fields),
+            accept_encoding,
+            etag
         )
         
+    except QueueFullError as qe:
+        raise HTTPException(
+            status_code=429,
+            detail="Сервер перегружен, повторите запрос позже",
+            headers={"Retry-After": str(qe.retry_after)}
+        )
     except HTTPException as he:
         logger.warning(
             "HTTP исключение при обработке запроса",
@@ -90,4 +423,395 @@ async def convert_file(
         raise HTTPException(
             status_code=500, 
             detail=f"Внутренняя ошибка сервера: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+async def _text_response(
+    ingest: Callable[[ConverterService], Awaitable[IngestedUpload]],
+    stream: bool,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+    request_id: int
+) -> Response:
+    """
+    Простой текст документа (format=text) для индексации
+    
+    Карта стилей, трансформации, анализ предупреждений и HTML не
+    используются; текст кэшируется по хэшу содержимого. При stream=true
+    текст отдается по мере чтения документа частями по
+    CONVERTER_STREAM_CHUNK_SIZE символов.
+    """
+    stack = await _enter_admission_slot()
+    converter_service = ConverterService()
+    try:
+        upload = await ingest(converter_service)
+    except BaseException:
+        await stack.aclose()
+        raise
+    stack.callback(upload.cleanup)
+    
+    etag = converter_service.make_etag(upload.content_hash, "text", profile=TEXT_PROFILE)
+    encoding = negotiate_encoding(accept_encoding)
+    if etag_matches(if_none_match, etag, encoding):
+        await stack.aclose()
+        logger.info("Результат не изменился, возврат 304",
+                    request_id=request_id,
+                    etag=etag)
+        return not_modified(etag, encoding)
+    
+    if not stream:
+        try:
+            text = await converter_service.extract_text(upload)
+        finally:
+            await stack.aclose()
+        logger.info("Текст документа извлечен",
+                    request_id=request_id,
+                    filename=upload.filename,
+                    text_length=len(text))
+        return await encode_response(
+            PlainTextResponse(text, headers={"ETag": etag}),
+            accept_encoding,
+            etag
+        )
+    
+    settings = get_settings()
+    
+    async def stream_text():
+        try:
+            async for chunk in converter_service.iter_text(upload, settings.stream_chunk_size):
+                yield chunk
+            logger.info("Потоковая отдача текста завершена",
+                        request_id=request_id,
+                        filename=upload.filename)
+        except Exception as e:
+            # Статус уже отправлен, ответ обрывается
+            logger.exception("Ошибка потокового извлечения текста",
+                             request_id=request_id,
+                             error_type=type(e).__name__,
+                             error_message=str(e))
+        finally:
+            await stack.aclose()
+    
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    body = stream_text()
+    if encoding is not None:
+        headers["ETag"] = response_etag(etag, encoding)
+        headers["Content-Encoding"] = encoding
+        body = _compress_stream(body, StreamCompressor(encoding, settings.compression_level))
+    
+    return StreamingResponse(body, media_type="text/plain", headers=headers)
+
+
+async def _stream_html(
+    ingest: Callable[[ConverterService], Awaitable[IngestedUpload]],
+    filename: str,
+    options: ConversionOptions,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+    request_id: int
+) -> Response:
+    """
+    Потоковая отдача HTML
+    
+    Тело совпадает с ответом format=html без stream (тот же HTML и ETag),
+    но отправляется по мере конвертации частями примерно по
+    CONVERTER_STREAM_CHUNK_SIZE символов (ConverterService.iter_html).
+    Анализ предупреждений и сборка JSON ответа не выполняются.
+    """
+    stack = await _enter_admission_slot()
+    converter_service = ConverterService(options)
+    try:
+        upload = await ingest(converter_service)
+    except BaseException:
+        await stack.aclose()
+        raise
+    stack.callback(upload.cleanup)
+    
+    etag = converter_service.make_etag(upload.content_hash, f"html:{filename}")
+    encoding = negotiate_encoding(accept_encoding)
+    if etag_matches(if_none_match, etag, encoding):
+        await stack.aclose()
+        logger.info("Результат не изменился, возврат 304",
+                    request_id=request_id,
+                    etag=etag)
+        return not_modified(etag, encoding)
+    
+    settings = get_settings()
+    
+    async def stream_document():
+        try:
+            async for chunk in converter_service.iter_html(upload, settings.stream_chunk_size):
+                yield chunk
+            logger.info("Потоковая отдача HTML завершена",
+                        request_id=request_id,
+                        filename=filename)
+        except HTTPException as he:
+            # Статус уже отправлен, сообщаем об ошибке в теле ответа
+            logger.warning("Ошибка потоковой конвертации",
+                           request_id=request_id,
+                           detail=he.detail)
+            yield f"<p class=\"conversion-error\">{html.escape(str(he.detail))}</p>"
+        except Exception as e:
+            # Статус уже отправлен, ответ обрывается
+            logger.exception("Ошибка потоковой конвертации",
+                             request_id=request_id,
+                             error_type=type(e).__name__,
+                             error_message=str(e))
+        finally:
+            await stack.aclose()
+    
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    body = stream_document()
+    if encoding is not None:
+        headers["ETag"] = response_etag(etag, encoding)
+        headers["Content-Encoding"] = encoding
+        body = _compress_stream(body, StreamCompressor(encoding, settings.compression_level))
+    
+    return StreamingResponse(body, media_type="text/html", headers=headers)
+
+
+async def _compress_stream(
+    chunks: AsyncIterator[str],
+    compressor: StreamCompressor
+) -> AsyncIterator[bytes]:
+    """
+    Сжимает потоковый ответ, сбрасывая буфер после каждой части
+    """
+    try:
+        async for chunk in chunks:
+            yield compressor.compress(chunk.encode("utf-8"))
+        yield compressor.finish()
+    finally:
+        await chunks.aclose()
+
+
+@router.post("/convert/batch")
+async def convert_batch(
+    files: List[UploadFile] = File(...),
+    fields: Optional[str] = Query(None, description="Поля JSON результата через запятую"),
+    profile: Optional[str] = Query(None, description="Набор полей: full, minimal, html, sections, diagnostics")
+):
+    """
+    Конвертирует несколько DOCX файлов за один запрос
+    
+    Parameters:
+    - files: DOCX файлы для конвертации
+    - fields, profile: Выбор полей результата, как у /convert
+    
+    Returns:
+    - Поток NDJSON: одна строка с результатом на каждый файл в порядке
+      завершения и итоговая строка со сводкой
+    """
+    settings = get_settings()
+    response_fields = resolve_fields(fields, profile)
+    if len(files) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Слишком много файлов в пакете (максимум {settings.batch_max_files})"
+        )
+    
+    logger.info("Начало пакетной конвертации", files_count=len(files))
+    
+    # Каждый файл пакета занимает свое место в очереди допуска
+    _check_admission()
+    
+    items = [
+        BatchItem(index, upload.filename, upload.read)
+        for index, upload in enumerate(files)
+    ]
+    batch_converter = BatchConverter(concurrency=settings.batch_concurrency)
+    
+    async def stream_results():
+        started = time.monotonic()
+        succeeded = 0
+        async for outcome in batch_converter.convert_all(items):
+            line = {
+                "type": "result",
+                "index": outcome["index"],
+                "filename": outcome["filename"],
+                "status_code": outcome["status_code"],
+                "duration_ms": outcome["duration_ms"]
+            }
+            if outcome["result"] is not None:
+                succeeded += 1
+                line["result"] = build_json_content(outcome["result"], response_fields)
+            else:
+                line["error"] = outcome["error"]
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+        
+        duration = round(time.monotonic() - started, 3)
+        logger.info("Пакетная конвертация завершена",
+                    files_count=len(items),
+                    succeeded=succeeded,
+                    duration=duration)
+        yield json.dumps({
+            "type": "summary",
+            "files_count": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "duration_seconds": duration
+        }, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.post("/convert/archive")
+async def convert_archive(
+    file: UploadFile = File(...),
+    format: str = Query("html", description="Формат результатов: html или json")
+):
+    """
+    Конвертирует ZIP архив с DOCX файлами в ZIP архив с результатами
+    
+    Parameters:
+    - file: ZIP архив с DOCX файлами
+    - format: Формат файлов в выходном архиве - 'html' (по умолчанию) или 'json'
+    
+    Returns:
+    - ZIP архив с результатами и manifest.json со статусом каждого файла
+    """
+    output_format = format.lower()
+    if output_format not in ("html", "json"):
+        raise HTTPException(status_code=400, detail="Поддерживаются форматы html и json")
+    
+    settings = get_settings()
+    archive_converter = ArchiveConverter(
+        BatchConverter(concurrency=settings.batch_concurrency),
+        max_entries=settings.batch_max_files,
+        max_entry_size=settings.archive_max_entry_size
+    )
+    archive = archive_converter.open_archive(file.file)
+    
+    logger.info("Начало конвертации архива",
+                filename=file.filename,
+                output_format=output_format)
+    
+    if output_format == "json":
+        def render(result):
+            return json.dumps(build_json_content(result), ensure_ascii=False).encode("utf-8")
+    else:
+        def render(result):
+            return result["complete_html"].encode("utf-8")
+    
+    # Места в очереди допуска занимают файлы архива (BatchConverter)
+    _check_admission()
+    
+    async def stream_archive():
+        async for chunk in archive_converter.convert(archive, output_format, render):
+            yield chunk
+    
+    return StreamingResponse(
+        stream_archive(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="converted.zip"'}
+    )
+
+
+@router.post("/outline")
+async def document_outline(
+    file: UploadFile = File(...),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Возвращает структуру заголовков DOCX файла без конвертации в HTML
+
+    Уровни заголовков определяются по стилям параграфов теми же
+    правилами, что и при конвертации (DocumentTransformer и карта стилей),
+    поэтому заголовок уровня N здесь - это hN в HTML. HTML и изображения
+    не формируются; результат кэшируется по хэшу содержимого.
+
+    Parameters:
+    - file: DOCX файл
+    - If-None-Match: ETag ранее полученного ответа
+
+    Returns:
+    - JSON: headings - список заголовков в порядке документа: level (1-6),
+      text, block - номер элемента верхнего уровня документа (заголовок
+      попадает в превью при preview_blocks > block), paragraph - номер
+      параграфа в документе; blocks_count и paragraphs_count
+    - 304 без тела, если If-None-Match совпадает с ETag результата
+    """
+    request_id = id(file)
+    logger.info("Начало чтения структуры документа",
+                request_id=request_id,
+                filename=file.filename)
+
+    try:
+        async with get_admission_controller().slot():
+            converter_service = ConverterService()
+            upload = await converter_service.ingest_file(file)
+            try:
+                etag = converter_service.make_etag(upload.content_hash, "outline")
+                encoding = negotiate_encoding(accept_encoding)
+                if etag_matches(if_none_match, etag, encoding):
+                    logger.info("Результат не изменился, возврат 304",
+                                request_id=request_id,
+                                etag=etag)
+                    return not_modified(etag, encoding)
+
+                outline = await converter_service.extract_outline(upload)
+            finally:
+                upload.cleanup()
+    except QueueFullError as qe:
+        raise HTTPException(
+            status_code=429,
+            detail="Сервер перегружен, повторите запрос позже",
+            headers={"Retry-After": str(qe.retry_after)}
+        )
+
+    logger.info("Структура документа прочитана",
+                request_id=request_id,
+                filename=upload.filename,
+                headings_count=len(outline["headings"]))
+
+    return await encode_response(
+        JSONResponse(
+            content={
+                "original_filename": upload.filename,
+                "file_size": upload.size,
+                "headings": outline["headings"],
+                "headings_count": len(outline["headings"]),
+                "blocks_count": outline["blocks"],
+                "paragraphs_count": outline["paragraphs"]
+            },
+            headers={"ETag": etag}
+        ),
+        accept_encoding,
+        etag
+    )
+
+
+@router.get("/queue")
+async def queue_status():
+    """
+    Возвращает текущую глубину очереди конвертаций
+    
+    Returns:
+    - JSON со статистикой очереди; статус 503, если очередь заполнена,
+      чтобы балансировщик мог направлять запросы на другие узлы
+    """
+    stats = get_admission_controller().get_stats()
+    return JSONResponse(
+        status_code=503 if stats["saturated"] else 200,
+        content=stats,
+        headers={"X-Queue-Depth": str(stats["queue_depth"])}
+    )
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """
+    Возвращает счетчики кэша результатов конвертации
+    
+    Returns:
+    - JSON с числом записей, занятым объемом и счетчиками попаданий,
+      промахов и вытеснений для кэша в памяти и дискового кэша,
+      а также счетчики объединенных одновременных конвертаций
+    """
+    disk_cache = get_disk_cache()
+    return {
+        "memory": get_result_cache().get_stats(),
+        "disk": disk_cache.get_stats() if disk_cache is not None else None,
+        "single_flight": get_single_flight().get_stats()
+    }
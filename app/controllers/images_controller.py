@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from app.services.image_store import get_image_store
+
+router = APIRouter(tags=["images"])
+
+# Изображения берутся из загруженных документов: при открытии по прямой
+# ссылке активное содержимое (скрипты в SVG) не должно выполняться
+# в origin API
+IMAGE_SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+}
+
+
+@router.get("/images/{name}")
+async def get_image(name: str):
+    """
+    Возвращает изображение, извлеченное из документа
+    
+    Parameters:
+    - name: Имя изображения вида <sha256>.<расширение>
+    
+    Returns:
+    - Изображение с заголовками долгого кэширования: содержимое
+      по данному адресу никогда не меняется. Ответ запрещает выполнение
+      скриптов (CSP sandbox, nosniff); SVG отдается как вложение
+      (Content-Disposition: attachment) - в <img> он отображается,
+      но не открывается как документ
+    """
+    found = get_image_store().find(name)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Изображение не найдено")
+    
+    path, content_type = found
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": f'"{name.partition(".")[0]}"',
+        **IMAGE_SECURITY_HEADERS
+    }
+    if content_type == "image/svg+xml":
+        headers["Content-Disposition"] = f'attachment; filename="{name}"'
+    return FileResponse(path, media_type=content_type, headers=headers)
@@ -0,0 +1,184 @@
+from typing import Optional
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query, Header
+from fastapi.responses import HTMLResponse, JSONResponse
+from app.controllers.responses import encode_response, render_result, resolve_fields
+from app.services.admission_controller import QueueFullError
+from app.services.converter_service import ConverterService
+from app.services.job_service import ConversionJob, get_job_manager
+from app.utils.logger import get_logger
+
+router = APIRouter(tags=["jobs"])
+logger = get_logger(__name__)
+
+
+def _get_job_or_404(job_id: str) -> ConversionJob:
+    """
+    Возвращает задачу или выбрасывает 404
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    return job
+
+
+@router.post("/jobs", status_code=202)
+async def create_job(file: UploadFile = File(...)):
+    """
+    Ставит DOCX файл в очередь на фоновую конвертацию
+    
+    Parameters:
+    - file: DOCX файл для конвертации
+    
+    Returns:
+    - JSON с идентификатором задачи и ссылками на статус и результат
+    """
+    upload = await ConverterService().ingest_file(file)
+    
+    try:
+        job = get_job_manager().submit(upload)
+    except QueueFullError as qe:
+        upload.cleanup()
+        raise HTTPException(
+            status_code=429,
+            detail="Очередь задач заполнена, повторите запрос позже",
+            headers={"Retry-After": str(qe.retry_after)}
+        )
+    
+    return JSONResponse(
+        status_code=202,
+        content={
+            **job.to_dict(),
+            "status_url": f"/api/v1/jobs/{job.job_id}",
+            "result_url": f"/api/v1/jobs/{job.job_id}/result",
+            "sections_url": f"/api/v1/jobs/{job.job_id}/sections"
+        },
+        headers={"Location": f"/api/v1/jobs/{job.job_id}"}
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    Возвращает статус фоновой задачи
+    
+    Parameters:
+    - job_id: Идентификатор задачи
+    """
+    return _get_job_or_404(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    format: str = Query("json", description="Формат ответа: json или html"),
+    fields: Optional[str] = Query(None, description="Поля JSON ответа через запятую"),
+    profile: Optional[str] = Query(None, description="Набор полей: full, minimal, html, sections, diagnostics"),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Возвращает результат фоновой задачи
+    
+    Parameters:
+    - job_id: Идентификатор задачи
+    - format: Формат ответа - 'json' (по умолчанию) или 'html'
+    - fields, profile: Выбор полей JSON ответа, как у /convert
+    - Accept-Encoding: Ответ сжимается zstd, br или gzip (если поддерживается)
+    
+    Returns:
+    - Результат конвертации; 409, если задача еще выполняется,
+      422, если конвертация завершилась ошибкой
+    """
+    response_fields = resolve_fields(fields, profile)
+    job = _get_job_or_404(job_id)
+    
+    if not job.finished:
+        return JSONResponse(status_code=409, content=job.to_dict())
+    
+    if job.status == ConversionJob.FAILED:
+        raise HTTPException(status_code=422, detail=job.error)
+    
+    logger.debug("Возврат результата задачи", job_id=job_id, response_format=format)
+    return await encode_response(
+        render_result(job.result, format, fields=response_fields),
+        accept_encoding
+    )
+
+
+@router.get("/jobs/{job_id}/sections")
+async def get_job_sections(
+    job_id: str,
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Возвращает оглавление разделов результата фоновой задачи
+    
+    HTML делится на разделы по заголовкам h1/h2 карты стилей; текст
+    до первого заголовка - раздел уровня 0 без названия.
+    
+    Parameters:
+    - job_id: Идентификатор задачи
+    
+    Returns:
+    - JSON со списком разделов (номер, уровень, название, смещение и
+      длина в байтах UTF-8 внутри html_content) и ссылками на каждый раздел
+    """
+    job = _get_job_or_404(job_id)
+    
+    if not job.finished:
+        return JSONResponse(status_code=409, content=job.to_dict())
+    
+    if job.status == ConversionJob.FAILED:
+        raise HTTPException(status_code=422, detail=job.error)
+    
+    sections = [
+        {**section, "url": f"/api/v1/jobs/{job_id}/sections/{section['index']}"}
+        for section in job.result["sections"]
+    ]
+    return await encode_response(
+        JSONResponse(content={
+            "job_id": job_id,
+            "original_filename": job.result["original_filename"],
+            "truncated": job.result["truncated"],
+            "sections": sections
+        }),
+        accept_encoding
+    )
+
+
+@router.get("/jobs/{job_id}/sections/{index}")
+async def get_job_section(
+    job_id: str,
+    index: int,
+    format: str = Query("html", description="Формат ответа: html или json"),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Возвращает один раздел результата фоновой задачи
+    
+    Parameters:
+    - job_id: Идентификатор задачи
+    - index: Номер раздела из оглавления
+    - format: 'html' (по умолчанию) - HTML фрагмент раздела;
+      'json' - описание раздела вместе с html_content
+    
+    Returns:
+    - Раздел; 404, если раздела с таким номером нет
+    """
+    job = _get_job_or_404(job_id)
+    
+    if not job.finished:
+        return JSONResponse(status_code=409, content=job.to_dict())
+    
+    if job.status == ConversionJob.FAILED:
+        raise HTTPException(status_code=422, detail=job.error)
+    
+    sections = job.result["sections"]
+    if not 0 <= index < len(sections):
+        raise HTTPException(status_code=404, detail="Раздел не найден")
+    
+    html_content = job.result.section_html(index)
+    if format.lower() == "json":
+        response = JSONResponse(content={**sections[index], "html_content": html_content})
+    else:
+        response = HTMLResponse(content=html_content)
+    return await encode_response(response, accept_encoding)
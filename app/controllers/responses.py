@@ -0,0 +1,258 @@
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.services.result_cache import get_representation_cache
+from app.utils.compression import compress, negotiate_encoding
+
+
+# Поля JSON ответа в порядке сериализации
+RESPONSE_FIELDS = [
+    "message",
+    "original_filename",
+    "file_size",
+    "html_content",
+    "complete_html",
+    "truncated",
+    "sections",
+    "conversion_warnings",
+    "conversion_errors",
+    "style_analysis",
+    "warning_summary",
+    "warning_groups",
+    "warnings_omitted",
+    "warnings_count",
+    "errors_count",
+    "status"
+]
+
+# Именованные наборы полей для параметра profile
+RESPONSE_PROFILES = {
+    "full": RESPONSE_FIELDS,
+    "minimal": [
+        "message", "original_filename", "file_size",
+        "warnings_count", "errors_count", "status"
+    ],
+    "html": [
+        "original_filename", "file_size", "html_content", "truncated", "status"
+    ],
+    "sections": [
+        "original_filename", "file_size", "sections", "truncated", "status"
+    ],
+    "diagnostics": [
+        "original_filename", "file_size", "conversion_warnings", "conversion_errors",
+        "style_analysis", "warning_summary", "warning_groups", "warnings_omitted",
+        "warnings_count", "errors_count", "status"
+    ]
+}
+
+
+def resolve_fields(fields: Optional[str], profile: Optional[str]) -> List[str]:
+    """
+    Определяет набор полей JSON ответа по параметрам запроса
+    
+    Args:
+        fields: Список полей через запятую
+        profile: Имя набора полей (full, minimal, html, sections, diagnostics)
+        
+    Returns:
+        Список полей в порядке сериализации
+        
+    Raises:
+        HTTPException: Если указано неизвестное поле или профиль
+    """
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(RESPONSE_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Неизвестные поля: {', '.join(sorted(unknown))}"
+            )
+        return [name for name in RESPONSE_FIELDS if name in requested]
+    
+    if profile:
+        if profile not in RESPONSE_PROFILES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Неизвестный профиль ответа. Доступны: {', '.join(RESPONSE_PROFILES)}"
+            )
+        return RESPONSE_PROFILES[profile]
+    
+    return RESPONSE_FIELDS
+
+
+def build_json_content(
+    result: Dict[str, Any],
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Формирует тело JSON ответа из результата конвертации
+    
+    Args:
+        result: Результат ConverterService
+        fields: Поля ответа (по умолчанию - все)
+        
+    Returns:
+        Словарь для сериализации в JSON
+    """
+    content = {}
+    for name in fields or RESPONSE_FIELDS:
+        if name == "message":
+            content[name] = "Файл успешно конвертирован"
+        else:
+            content[name] = result[name]
+    return content
+
+
+def render_result(
+    result: Dict[str, Any],
+    format: str,
+    headers: Optional[Dict[str, str]] = None,
+    fields: Optional[List[str]] = None
+) -> Response:
+    """
+    Возвращает результат конвертации в запрошенном формате
+    
+    Args:
+        result: Результат ConverterService
+        format: Формат ответа - 'json' или 'html'
+        headers: Дополнительные заголовки ответа
+        fields: Поля JSON ответа (по умолчанию - все)
+        
+    Returns:
+        HTMLResponse или JSONResponse
+    """
+    if format.lower() == "html":
+        return HTMLResponse(
+            content=result["complete_html"],
+            status_code=200,
+            headers=headers
+        )
+    
+    return JSONResponse(
+        status_code=200,
+        content=build_json_content(result, fields),
+        headers=headers
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str, encoding: Optional[str] = None) -> bool:
+    """
+    Проверяет заголовок If-None-Match на совпадение с ETag
+    
+    Для If-None-Match используется слабое сравнение (RFC 9110),
+    поэтому префикс W/ игнорируется. Сравнивается ETag, который
+    получил бы ответ 200 с согласованной кодировкой (response_etag).
+    
+    Args:
+        if_none_match: Значение заголовка If-None-Match
+        etag: ETag несжатого представления
+        encoding: Кодировка, согласованная по Accept-Encoding
+        
+    Returns:
+        True, если клиент уже имеет актуальное представление
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    expected = response_etag(etag, encoding)
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == expected:
+            return True
+    return False
+
+
+def not_modified(etag: str, encoding: Optional[str] = None) -> Response:
+    """
+    Ответ 304 Not Modified для совпавшего ETag
+    
+    Args:
+        etag: ETag несжатого представления
+        encoding: Кодировка, согласованная по Accept-Encoding; ETag
+            совпадает с ETag ответа 200 для той же кодировки
+    """
+    return Response(
+        status_code=304,
+        headers={"ETag": response_etag(etag, encoding), "Vary": "Accept-Encoding"}
+    )
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    ETag сжатого представления: строгий ETag должен отличаться
+    для разных Content-Encoding
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def response_etag(etag: str, encoding: Optional[str]) -> str:
+    """
+    ETag ответа для согласованной кодировки
+    
+    При согласованной кодировке ETag всегда имеет суффикс кодировки,
+    даже если тело меньше CONVERTER_COMPRESSION_MIN_SIZE и не сжато:
+    так ETag ответа 304 вычисляется до конвертации и совпадает с ETag 200.
+    """
+    return encoded_etag(etag, encoding) if encoding is not None else etag
+
+
+async def encode_response(
+    response: Response,
+    accept_encoding: Optional[str],
+    etag: Optional[str] = None
+) -> Response:
+    """
+    Сжимает тело ответа кодировкой, согласованной по Accept-Encoding
+    
+    Сжатые представления сохраняются в кэше по ETag и кодировке,
+    поэтому повторные ответы отдаются без повторного сжатия.
+    
+    Args:
+        response: Готовый ответ с телом
+        accept_encoding: Значение заголовка Accept-Encoding
+        etag: ETag несжатого представления (ключ кэша представлений)
+        
+    Returns:
+        Сжатый ответ или исходный, если сжатие не нужно
+    """
+    settings = get_settings()
+    body = response.body
+    response.headers["Vary"] = "Accept-Encoding"
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    if len(body) < settings.compression_min_size:
+        if etag:
+            response.headers["ETag"] = response_etag(etag, encoding)
+        return response
+    
+    cache = get_representation_cache()
+    cache_key = f"{etag}:{encoding}" if etag else None
+    compressed = cache.get(cache_key) if cache_key else None
+    if compressed is None:
+        compressed = await run_in_threadpool(
+            compress, body, encoding, settings.compression_level
+        )
+        if cache_key:
+            cache.put(cache_key, compressed)
+    
+    headers = {
+        key: value for key, value in response.headers.items()
+        if key.lower() not in ("content-length", "content-type", "etag")
+    }
+    headers["content-encoding"] = encoding
+    if etag:
+        headers["etag"] = response_etag(etag, encoding)
+    
+    return Response(
+        content=compressed,
+        status_code=response.status_code,
+        headers=headers,
+        media_type=response.media_type
+    )
@@ -0,0 +1,45 @@
+from typing import Optional
+
+
+class ConversionOptions:
+    """
+    Параметры конвертации, влияющие на результат.
+
+    Передаются в процесс пула вместе с файлом и входят в ключ кэша,
+    поэтому результаты с разными параметрами кэшируются раздельно.
+    """
+
+    IMAGES_INLINE = "inline"
+    IMAGES_STORE = "store"
+
+    def __init__(
+        self,
+        image_mode: str = IMAGES_INLINE,
+        preview_blocks: Optional[int] = None,
+        preview_bytes: Optional[int] = None
+    ):
+        self.image_mode = image_mode
+        # Превью: только первые N элементов документа и/или N байт HTML
+        self.preview_blocks = preview_blocks
+        self.preview_bytes = preview_bytes
+
+    @property
+    def is_preview(self) -> bool:
+        """Конвертируется только начало документа"""
+        return self.preview_blocks is not None or self.preview_bytes is not None
+
+    def cache_suffix(self) -> str:
+        """
+        Возвращает часть ключа кэша, зависящую от параметров
+        
+        Returns:
+            Строка для добавления к версии профиля (пустая для параметров по умолчанию)
+        """
+        parts = []
+        if self.image_mode != self.IMAGES_INLINE:
+            parts.append(f"img={self.image_mode}")
+        if self.preview_blocks is not None:
+            parts.append(f"preview_blocks={self.preview_blocks}")
+        if self.preview_bytes is not None:
+            parts.append(f"preview_bytes={self.preview_bytes}")
+        return ",".join(parts)
@@ -0,0 +1,154 @@
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from app.models.style_mapper import StyleMapper
+from app.utils.html_blocks import HtmlSection, split_sections
+
+
+class ConversionResult(Mapping):
+    """
+    Результат конвертации с ленивым вычислением производных полей.
+
+    HTML, предупреждения и ошибки Mammoth доступны сразу, а анализ стилей,
+    сводка и группы предупреждений, разделы и полный HTML документ
+    вычисляются при первом обращении и запоминаются. Объект ведет себя
+    как словарь только для чтения, поэтому result["status"] работает как раньше.
+
+    Размер ответа ограничен: conversion_warnings и style_analysis содержат
+    не больше max_warning_groups первых предупреждений (как и warning_groups),
+    число остальных - в warnings_omitted; счетчики и warning_summary
+    учитывают все предупреждения.
+    """
+
+    FIELDS = (
+        "original_filename",
+        "file_size",
+        "html_content",
+        "complete_html",
+        "truncated",
+        "sections",
+        "conversion_warnings",
+        "conversion_errors",
+        "style_analysis",
+        "warning_summary",
+        "warning_groups",
+        "warnings_omitted",
+        "warnings_count",
+        "errors_count",
+        "status"
+    )
+
+    def __init__(
+        self,
+        original_filename: str,
+        file_size: int,
+        html_content: str,
+        conversion_warnings: List[str],
+        conversion_errors: List[str],
+        style_mapper: StyleMapper,
+        build_complete_html: Callable[[str, str], str],
+        max_warning_groups: Optional[int] = None,
+        truncated: bool = False
+    ):
+        self.original_filename = original_filename
+        self.file_size = file_size
+        self.html_content = html_content
+        self.all_warnings = conversion_warnings
+        self.conversion_errors = conversion_errors
+        # Превью: HTML содержит только начало документа
+        self.truncated = truncated
+        self._style_mapper = style_mapper
+        self._build_complete_html = build_complete_html
+        self._max_warning_groups = max_warning_groups
+
+    @property
+    def conversion_warnings(self) -> List[str]:
+        """Первые предупреждения Mammoth (не больше max_warning_groups)"""
+        if self._max_warning_groups:
+            return self.all_warnings[:self._max_warning_groups]
+        return self.all_warnings
+
+    @property
+    def warnings_omitted(self) -> int:
+        """Число предупреждений, не вошедших в conversion_warnings и style_analysis"""
+        return len(self.all_warnings) - len(self.conversion_warnings)
+
+    @property
+    def warnings_count(self) -> int:
+        return len(self.all_warnings)
+
+    @property
+    def errors_count(self) -> int:
+        return len(self.conversion_errors)
+
+    @property
+    def status(self) -> str:
+        return "success" if not self.conversion_errors else "success_with_errors"
+
+    @cached_property
+    def style_analysis(self) -> Dict[str, List[str]]:
+        """Категоризированные предупреждения о стилях из conversion_warnings"""
+        if self.warnings_omitted:
+            return self._style_mapper.analyze_style_warnings(self.conversion_warnings)
+        return self._full_style_analysis
+
+    @cached_property
+    def _full_style_analysis(self) -> Dict[str, List[str]]:
+        return self._style_mapper.analyze_style_warnings(self.all_warnings)
+
+    @cached_property
+    def warning_summary(self) -> str:
+        """Текстовая сводка предупреждений"""
+        return self._style_mapper.get_warning_summary(self._full_style_analysis)
+
+    @cached_property
+    def warning_groups(self) -> Dict[str, Any]:
+        """Уникальные предупреждения с числом повторов"""
+        return self._style_mapper.aggregate_warnings(
+            self.all_warnings, self._max_warning_groups
+        )
+
+    @cached_property
+    def section_index(self) -> List[HtmlSection]:
+        """Разделы html_content по заголовкам h1/h2"""
+        return split_sections(self.html_content, self._style_mapper.section_heading_tags)
+
+    @property
+    def sections(self) -> List[Dict[str, Any]]:
+        """Оглавление разделов: уровень, название, смещение и длина в байтах"""
+        return [
+            {
+                "index": index,
+                "level": section.level,
+                "title": section.title,
+                "offset": section.offset,
+                "length": section.length
+            }
+            for index, section in enumerate(self.section_index)
+        ]
+
+    def section_html(self, index: int) -> str:
+        """
+        HTML одного раздела
+
+        Raises:
+            IndexError: Раздела с таким номером нет
+        """
+        section = self.section_index[index]
+        return self.html_content[section.start:section.end]
+
+    @cached_property
+    def complete_html(self) -> str:
+        """Полный HTML документ"""
+        return self._build_complete_html(self.html_content, self.original_filename)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
@@ -1,6 +1,8 @@
+import hashlib
 import mammoth
+import mammoth.images
 import mammoth.transforms
-from typing import Any
+from typing import Any, Callable, Optional
 from app.utils.logger import get_logger
 
 
@@ -9,6 +11,9 @@ class DocumentTransformer:
     Класс для трансформации документов перед конвертацией в HTML
     """
     
+    # Увеличивать при изменении логики transform_paragraph
+    RULES_VERSION = 1
+    
     def __init__(self):
         self.logger = get_logger(__name__)
         self.undefined_style_ids = [
@@ -26,63 +31,103 @@ class DocumentTransformer:
         Returns:
             Функция трансформации для mammoth
         """
-        def transform_paragraph(element):
-            """
-            Трансформирует параграфы с неопределенными стилями
-            
-            Args:
-                element: Элемент параграфа
-                
-            Returns:
-                Трансформированный элемент
-            """
-            # Обработка параграфов с неопределенными стилями
-            if element.style_id in self.undefined_style_ids:
-                # Определяем тип стиля по ID
-                if element.style_id in ['11', '24']:  # Заголовки
-                    heading_level = 1 if element.style_id == '11' else 2
-                    return element.copy(
-                        style_id=f"Heading{heading_level}",
-                        style_name=f"Заголовок №{heading_level}"
-                    )
-                elif element.style_id == 'a9':  # Подпись к таблице
-                    return element.copy(
-                        style_id="TableCaption",
-                        style_name="Подпись к таблице"
-                    )
-                else:  # Остальные как обычный текст
-                    return element.copy(
-                        style_id="Normal",
-                        style_name="Основной текст"
-                    )
-            
-            # Обработка параграфов без имени стиля (None)
-            if element.style_name == "None" and element.style_id:
-                # Определяем по ID что это может быть
-                if element.style_id in ['Style2', 'Style4', 'Style18']:
-                    return element.copy(
-                        style_id="Normal",
-                        style_name="Основной текст"
-                    )
+        return mammoth.transforms.paragraph(self.transform_paragraph)
+    
+    def transform_paragraph(self, element):
+        """
+        Трансформирует параграфы с неопределенными стилями
+        
+        Используется как трансформация Mammoth и нативным конвертером,
+        поэтому правила для обоих движков совпадают
+        
+        Args:
+            element: Элемент параграфа
             
-            # Обработка параграфов без стиля вообще
-            if not element.style_id and not element.style_name:
+        Returns:
+            Трансформированный элемент
+        """
+        # Обработка параграфов с неопределенными стилями
+        if element.style_id in self.undefined_style_ids:
+            # Определяем тип стиля по ID
+            if element.style_id in ['11', '24']:  # Заголовки
+                heading_level = 1 if element.style_id == '11' else 2
+                return element.copy(
+                    style_id=f"Heading{heading_level}",
+                    style_name=f"Заголовок №{heading_level}"
+                )
+            elif element.style_id == 'a9':  # Подпись к таблице
+                return element.copy(
+                    style_id="TableCaption",
+                    style_name="Подпись к таблице"
+                )
+            else:  # Остальные как обычный текст
                 return element.copy(
                     style_id="Normal",
                     style_name="Основной текст"
                 )
+        
+        # Обработка параграфов без имени стиля (None)
+        if element.style_name == "None" and element.style_id:
+            # Определяем по ID что это может быть
+            if element.style_id in ['Style2', 'Style4', 'Style18']:
+                return element.copy(
+                    style_id="Normal",
+                    style_name="Основной текст"
+                )
+        
+        # Обработка параграфов без стиля вообще
+        if not element.style_id and not element.style_name:
+            return element.copy(
+                style_id="Normal",
+                style_name="Основной текст"
+            )
+        
+        return element
+    
+    def create_image_converter(self, save_image: Callable[[str, bytes], str]):
+        """
+        Создает обработчик изображений, сохраняющий их во внешнее хранилище
+        
+        Args:
+            save_image: Функция (content_type, данные) -> URL изображения
             
-            return element
+        Returns:
+            Обработчик изображений для mammoth
+        """
+        def convert_image(image):
+            with image.open() as image_bytes:
+                src = save_image(image.content_type, image_bytes.read())
+            return {"src": src}
         
-        return mammoth.transforms.paragraph(transform_paragraph)
+        return mammoth.images.img_element(convert_image)
     
-    def get_transform_options(self) -> dict:
+    def get_transform_options(
+        self,
+        save_image: Optional[Callable[[str, bytes], str]] = None
+    ) -> dict:
         """
         Возвращает опции трансформации для mammoth
         
+        Args:
+            save_image: Функция сохранения изображений; если не задана,
+                изображения встраиваются как data URI (поведение mammoth)
+        
         Returns:
             Словарь с опциями трансформации
         """
-        return {
+        options = {
             'transform_document': self.create_transform_function()
-        }
\ No newline at end of file
+        }
+        if save_image is not None:
+            options['convert_image'] = self.create_image_converter(save_image)
+        return options
+    
+    def get_rules_fingerprint(self) -> str:
+        """
+        Возвращает отпечаток правил трансформации
+        
+        Returns:
+            Строка, меняющаяся при изменении правил
+        """
+        rules = f"{self.RULES_VERSION}:{','.join(self.undefined_style_ids)}"
+        return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,30 @@
+from typing import Iterator
+
+
+class HtmlDocument:
+    """
+    Деление HTML от Mammoth на части для потоковой отдачи
+    """
+
+    def iter_fragments(self, body: str, chunk_size: int) -> Iterator[str]:
+        """
+        Делит тело документа на части примерно по chunk_size символов.
+        
+        Граница части всегда ставится перед открывающей скобкой тега,
+        поэтому ни один тег не разрезается между частями.
+        
+        Args:
+            body: HTML тела документа
+            chunk_size: Желаемый размер части
+            
+        Yields:
+            Очередные фрагменты тела
+        """
+        start = 0
+        length = len(body)
+        while start < length:
+            end = body.find("<", start + chunk_size)
+            if end == -1:
+                end = length
+            yield body[start:end]
+            start = end
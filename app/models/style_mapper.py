@@ -1,5 +1,5 @@
-from typing import Dict, List, Pattern
-import re
+from typing import Any, Dict, List, Optional, Pattern, Sequence
+from app.models.warning_classifier import WarningClassifier, WarningRule
 from app.utils.logger import get_logger
 
 
@@ -8,8 +8,9 @@ class StyleMapper:
     Класс для работы с маппингом стилей и обработки нераспознанных стилей
     """
     
-    def __init__(self):
+    def __init__(self, warning_rules: Optional[Sequence[WarningRule]] = None):
         self.logger = get_logger(__name__)
+        self.warning_classifier = WarningClassifier(warning_rules)
         self.russian_headings = [
             'Заголовок №1', 'Заголовок №2', 'Заголовок №3', 
             'Заголовок №4', 'Заголовок №5', 'Заголовок №6'
@@ -23,6 +24,8 @@ class StyleMapper:
             'Другое': 'other',
             'None': 'default'
         }
+        # Заголовки №1 и №2 (h1, h2) начинают разделы при разбиении HTML
+        self.section_heading_tags = ['h1', 'h2']
         
         self.logger.debug("StyleMapper инициализирован",
                          headings_count=len(self.russian_headings),
@@ -92,19 +95,12 @@ class StyleMapper:
             'table_formatting_ignored': [],
             'other_warnings': []
         }
+        for category in self.warning_classifier.categories:
+            categorized.setdefault(category, [])
         
+        classify = self.warning_classifier.classify
         for warning in warnings:
-            if 'was referenced but not defined' in warning:
-                categorized['undefined_styles'].append(warning)
-            elif 'Unrecognised paragraph style' in warning:
-                categorized['unrecognized_styles'].append(warning)
-            elif 'unrecognised element was ignored' in warning:
-                if 'w:tblPrEx' in warning:
-                    categorized['table_formatting_ignored'].append(warning)
-                else:
-                    categorized['missing_elements'].append(warning)
-            else:
-                categorized['other_warnings'].append(warning)
+            categorized[classify(warning)[0]].append(warning)
         
         self.logger.debug("Анализ завершен",
                          undefined_styles=len(categorized['undefined_styles']),
@@ -113,6 +109,70 @@ class StyleMapper:
         
         return categorized
     
+    def classify_warning(self, warning: str) -> str:
+        """
+        Определяет категорию предупреждения Mammoth
+        
+        Args:
+            warning: Текст предупреждения
+            
+        Returns:
+            Ключ категории из результата analyze_style_warnings
+        """
+        return self.warning_classifier.classify(warning)[0]
+    
+    def aggregate_warnings(
+        self,
+        warnings: List[str],
+        max_entries: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Группирует одинаковые предупреждения с подсчетом повторов
+        
+        Предупреждения обрабатываются за один проход; категория и сведения
+        о стиле извлекаются один раз для каждого уникального текста.
+        
+        Args:
+            warnings: Список предупреждений от Mammoth
+            max_entries: Максимум уникальных записей (None или 0 - без ограничения);
+                повторы уже учтенных записей подсчитываются и после достижения
+                лимита, новые тексты попадают в omitted
+            
+        Returns:
+            Словарь с группами (entries), общим числом предупреждений (total),
+            числом уникальных текстов (distinct) и числом неучтенных
+            предупреждений (omitted)
+        """
+        groups: Dict[str, Dict[str, Any]] = {}
+        omitted: Dict[str, int] = {}
+        
+        for warning in warnings:
+            group = groups.get(warning)
+            if group is not None:
+                group['count'] += 1
+                continue
+            
+            if max_entries and len(groups) >= max_entries:
+                omitted[warning] = omitted.get(warning, 0) + 1
+                continue
+            
+            category, style_info = self.warning_classifier.classify(warning)
+            group = {'message': warning, 'category': category, 'count': 1}
+            group.update(style_info)
+            groups[warning] = group
+        
+        if omitted:
+            self.logger.debug("Превышен лимит групп предупреждений",
+                             max_entries=max_entries,
+                             omitted_distinct=len(omitted))
+        
+        return {
+            'entries': sorted(groups.values(), key=lambda g: -g['count']),
+            'total': len(warnings),
+            'distinct': len(groups) + len(omitted),
+            'omitted': sum(omitted.values())
+        }
+    
     def extract_style_info(self, warning: str) -> Dict[str, str]:
         """
         Извлекает информацию о стиле из предупреждения
@@ -123,27 +183,8 @@ class StyleMapper:
         Returns:
             Словарь с информацией о стиле
         """
-        # Паттерн для извлечения имени стиля и ID
-        style_pattern = r"Unrecognised paragraph style: (.+?) \(Style ID: (.+?)\)"
-        match = re.search(style_pattern, warning)
-        
-        if match:
-            return {
-                'style_name': match.group(1),
-                'style_id': match.group(2)
-            }
-        
-        # Паттерн для неопределенных стилей
-        undefined_pattern = r"Paragraph style with ID (.+?) was referenced"
-        match = re.search(undefined_pattern, warning)
-        
-        if match:
-            return {
-                'style_id': match.group(1),
-                'style_name': 'Unknown'
-            }
-        
-        return {'style_name': 'Unknown', 'style_id': 'Unknown'}
+        _, style_info = self.warning_classifier.classify(warning)
+        return dict(style_info) or {'style_name': 'Unknown', 'style_id': 'Unknown'}
     
     def get_warning_summary(self, style_analysis: Dict[str, List[str]]) -> str:
         """
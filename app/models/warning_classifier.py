@@ -0,0 +1,107 @@
+import re
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+# Категория предупреждений, не подошедших ни под одно правило
+OTHER_CATEGORY = "other_warnings"
+
+
+class WarningRule:
+    """
+    Правило классификации предупреждения Mammoth.
+
+    Предупреждение подходит под правило, если содержит все подстроки
+    markers. Необязательный шаблон pattern может содержать именованные
+    группы style_name и style_id - они извлекаются как сведения о стиле.
+    """
+
+    def __init__(self, category: str, markers: Union[str, Sequence[str]], pattern: Optional[str] = None):
+        self.category = category
+        self.markers = (markers,) if isinstance(markers, str) else tuple(markers)
+        self.pattern = pattern
+
+
+# Правила проверяются по порядку, побеждает первое подошедшее
+# (тот же порядок проверок, что и в прежней цепочке if)
+DEFAULT_WARNING_RULES = [
+    WarningRule(
+        "undefined_styles",
+        "was referenced but not defined",
+        r"Paragraph style with ID (?P<style_id>.+?) was referenced"
+    ),
+    WarningRule(
+        "unrecognized_styles",
+        "Unrecognised paragraph style",
+        r"Unrecognised paragraph style: (?P<style_name>.+?) \(Style ID: (?P<style_id>.+?)\)"
+    ),
+    WarningRule(
+        "table_formatting_ignored",
+        ("unrecognised element was ignored", "w:tblPrEx")
+    ),
+    WarningRule(
+        "missing_elements",
+        "unrecognised element was ignored"
+    ),
+]
+
+
+class WarningClassifier:
+    """
+    Классификатор предупреждений по списку правил.
+
+    Категория определяется поиском подстрок (в CPython это быстрее
+    регулярного выражения), скомпилированный шаблон применяется только
+    для извлечения сведений о стиле у подошедшего правила. Результаты
+    запоминаются: в документах много одинаковых предупреждений.
+    """
+
+    # Предел запомненных результатов
+    CACHE_SIZE = 4096
+
+    def __init__(self, rules: Optional[Sequence[WarningRule]] = None):
+        self._cache: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self.rules = list(rules if rules is not None else DEFAULT_WARNING_RULES)
+        self.categories = list(dict.fromkeys(rule.category for rule in self.rules))
+        if OTHER_CATEGORY not in self.categories:
+            self.categories.append(OTHER_CATEGORY)
+        self._compiled: List[Tuple[str, Tuple[str, ...], Optional[Pattern[str]]]] = [
+            (rule.category, rule.markers, re.compile(rule.pattern, re.DOTALL) if rule.pattern else None)
+            for rule in self.rules
+        ]
+
+    def classify(self, warning: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Определяет категорию предупреждения и извлекает сведения о стиле
+
+        Args:
+            warning: Текст предупреждения
+
+        Returns:
+            Категория и словарь style_name/style_id (пустой, если правило
+            не извлекает сведения о стиле); словарь общий для повторов
+            предупреждения и не должен изменяться
+        """
+        cached = self._cache.get(warning)
+        if cached is not None:
+            return cached
+
+        result = self._classify(warning)
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[warning] = result
+        return result
+
+    def _classify(self, warning: str) -> Tuple[str, Dict[str, str]]:
+        for category, markers, regex in self._compiled:
+            for marker in markers:
+                if marker not in warning:
+                    break
+            else:
+                if regex is None:
+                    return category, {}
+                match = regex.search(warning)
+                fields = match.groupdict() if match is not None else {}
+                return category, {
+                    "style_name": fields.get("style_name") or "Unknown",
+                    "style_id": fields.get("style_id") or "Unknown"
+                }
+        return OTHER_CATEGORY, {}
@@ -0,0 +1,143 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+
+class QueueFullError(Exception):
+    """
+    Очередь конвертаций заполнена, запрос должен быть отклонен
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Очередь конвертаций заполнена")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Ограниченная очередь допуска перед ConverterService.
+
+    Не более max_in_flight конвертаций выполняются одновременно и не более
+    max_waiting ожидают своей очереди; остальные запросы отклоняются сразу.
+    """
+
+    def __init__(self, max_in_flight: int, max_waiting: int):
+        self.logger = get_logger(__name__)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_waiting = max(0, max_waiting)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._in_flight = 0
+        self._waiting = 0
+        self._rejected = 0
+        # Экспоненциально сглаженное время обработки одного запроса, секунды
+        self._avg_duration = 1.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Текущее число запросов в работе и в ожидании"""
+        return self._in_flight + self._waiting
+
+    @property
+    def saturated(self) -> bool:
+        """Очередь ожидания заполнена"""
+        return self._in_flight >= self.max_in_flight and self._waiting >= self.max_waiting
+
+    def retry_after(self) -> int:
+        """
+        Оценка времени (в секундах), через которое освободится место
+
+        Returns:
+            Целое число секунд, не меньше 1
+        """
+        batches = (self.queue_depth + 1) / self.max_in_flight
+        return max(1, math.ceil(batches * self._avg_duration))
+
+    def check(self) -> None:
+        """
+        Отклоняет запрос, если очередь ожидания заполнена
+
+        Raises:
+            QueueFullError: Если очередь ожидания заполнена
+        """
+        if self.saturated:
+            self._rejected += 1
+            retry_after = self.retry_after()
+            self.logger.warning("Очередь конвертаций заполнена, запрос отклонен",
+                                in_flight=self._in_flight,
+                                waiting=self._waiting,
+                                retry_after=retry_after)
+            raise QueueFullError(retry_after)
+
+    @asynccontextmanager
+    async def slot(self, reject: bool = True) -> AsyncIterator[None]:
+        """
+        Занимает место для выполнения конвертации
+
+        Args:
+            reject: Отклонить запрос при заполненной очереди ожидания;
+                False - только ждать места (для частей уже принятого
+                запроса, например файлов пакета)
+
+        Raises:
+            QueueFullError: Если очередь ожидания заполнена
+        """
+        if reject:
+            self.check()
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+            duration = time.monotonic() - started
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает состояние очереди
+
+        Returns:
+            Словарь со статистикой очереди
+        """
+        return {
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "queue_depth": self.queue_depth,
+            "max_in_flight": self.max_in_flight,
+            "max_waiting": self.max_waiting,
+            "saturated": self.saturated,
+            "rejected": self._rejected,
+            "avg_duration_seconds": round(self._avg_duration, 3)
+        }
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Получить общий для процесса контроллер допуска
+
+    Returns:
+        Экземпляр AdmissionController, настроенный из Settings
+    """
+    global _admission_controller
+    if _admission_controller is None:
+        settings = get_settings()
+        _admission_controller = AdmissionController(
+            max_in_flight=settings.max_in_flight,
+            max_waiting=settings.max_waiting
+        )
+    return _admission_controller
@@ -0,0 +1,168 @@
+import json
+import posixpath
+import zipfile
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.services.batch_service import BatchConverter, BatchItem
+from app.utils.logger import get_logger
+
+
+class _ZipStreamBuffer:
+    """
+    Несчитываемый поток для zipfile: накапливает записанные байты,
+    которые затем забираются и отправляются клиенту по частям.
+
+    Поскольку у потока нет tell/seek, zipfile пишет записи
+    с дескрипторами данных и не возвращается к уже записанным байтам.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """Возвращает и очищает накопленные байты"""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ArchiveConverter:
+    """
+    Конвертация ZIP архива с DOCX файлами в ZIP архив с результатами
+    """
+
+    def __init__(self, batch_converter: BatchConverter, max_entries: int, max_entry_size: int):
+        self.logger = get_logger(__name__)
+        self.batch_converter = batch_converter
+        self.max_entries = max_entries
+        self.max_entry_size = max_entry_size
+
+    def open_archive(self, source: BinaryIO) -> zipfile.ZipFile:
+        """
+        Открывает загруженный архив и проверяет его ограничения
+
+        Args:
+            source: Файловый объект с ZIP архивом
+
+        Returns:
+            Открытый ZipFile
+
+        Raises:
+            HTTPException: Если архив поврежден или превышает ограничения
+        """
+        try:
+            archive = zipfile.ZipFile(source)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Файл не является ZIP архивом")
+
+        entries = self._docx_entries(archive)
+        if len(entries) > self.max_entries:
+            archive.close()
+            raise HTTPException(
+                status_code=413,
+                detail=f"Слишком много файлов в архиве (максимум {self.max_entries})"
+            )
+        return archive
+
+    async def convert(
+        self,
+        archive: zipfile.ZipFile,
+        extension: str,
+        render: Callable[[Dict[str, Any]], bytes]
+    ) -> AsyncIterator[bytes]:
+        """
+        Конвертирует записи архива и отдает выходной ZIP по частям
+
+        Args:
+            archive: Открытый входной архив
+            extension: Расширение выходных файлов (html или json)
+            render: Функция сериализации результата конвертации
+
+        Yields:
+            Очередные байты выходного ZIP архива
+        """
+        buffer = _ZipStreamBuffer()
+        output = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+        manifest: List[Dict[str, Any]] = []
+
+        try:
+            items = [
+                BatchItem(index, info.filename, self._make_loader(archive, info))
+                for index, info in enumerate(self._docx_entries(archive))
+            ]
+
+            async for outcome in self.batch_converter.convert_all(items):
+                entry = {
+                    "source": outcome["filename"],
+                    "status_code": outcome["status_code"],
+                    "duration_ms": outcome["duration_ms"]
+                }
+                if outcome["result"] is not None:
+                    entry["output"] = self._output_name(outcome["filename"], extension)
+                    data = render(outcome["result"])
+                    await run_in_threadpool(output.writestr, entry["output"], data)
+                else:
+                    entry["error"] = outcome["error"]
+                manifest.append(entry)
+
+                chunk = buffer.drain()
+                if chunk:
+                    yield chunk
+
+            manifest.sort(key=lambda e: e["source"])
+            output.writestr(
+                "manifest.json",
+                json.dumps(manifest, ensure_ascii=False, indent=2)
+            )
+            output.close()
+            yield buffer.drain()
+
+            self.logger.info("Конвертация архива завершена",
+                             entries_count=len(manifest),
+                             failed=sum(1 for e in manifest if "error" in e))
+        finally:
+            archive.close()
+
+    def _docx_entries(self, archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+        """
+        Возвращает записи архива, подлежащие конвертации
+        """
+        return [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and info.filename.lower().endswith(".docx")
+        ]
+
+    def _make_loader(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+        """
+        Создает функцию ленивого чтения записи архива
+        """
+        async def load() -> bytes:
+            if info.file_size > self.max_entry_size:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Файл в архиве слишком большой (максимум {self.max_entry_size} байт)"
+                )
+            return await run_in_threadpool(archive.read, info)
+        return load
+
+    def _output_name(self, source_name: str, extension: str) -> str:
+        """
+        Формирует имя выходной записи по имени исходной
+        """
+        # Убираем абсолютные пути и выходы за пределы архива ("../")
+        parts = [
+            part for part in posixpath.normpath(source_name).split("/")
+            if part not in ("", ".", "..")
+        ]
+        root, _ = posixpath.splitext("/".join(parts))
+        return f"{root}.{extension}"
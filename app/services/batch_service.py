@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Set
+from fastapi import HTTPException
+from app.services.admission_controller import get_admission_controller
+from app.services.converter_service import ConverterService
+from app.utils.logger import get_logger
+
+
+class BatchItem:
+    """
+    Элемент пакетной конвертации: имя файла и функция чтения содержимого.
+
+    Содержимое читается только перед конвертацией, поэтому в памяти
+    одновременно находятся лишь файлы, которые конвертируются сейчас.
+    """
+
+    def __init__(self, index: int, filename: str, load: Callable[[], Awaitable[bytes]]):
+        self.index = index
+        self.filename = filename
+        self.load = load
+
+
+class BatchConverter:
+    """
+    Параллельная конвертация набора файлов через общий пул процессов.
+
+    Каждый файл занимает свое место в очереди допуска, поэтому пакеты
+    делят лимит одновременных конвертаций с остальными запросами.
+    Результаты отдаются по мере готовности; ошибка в одном файле
+    не прерывает обработку остальных.
+    """
+
+    def __init__(self, concurrency: int, converter_service: Optional[ConverterService] = None):
+        self.logger = get_logger(__name__)
+        self.concurrency = max(1, concurrency)
+        self.converter_service = converter_service or ConverterService()
+
+    async def convert_all(self, items: Iterable[BatchItem]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Конвертирует элементы, одновременно выполняя не более concurrency задач
+
+        Args:
+            items: Элементы для конвертации (итерируются лениво)
+
+        Yields:
+            Результат по каждому элементу в порядке завершения
+        """
+        iterator = iter(items)
+        pending: Set[asyncio.Task] = set()
+
+        def schedule() -> None:
+            while len(pending) < self.concurrency:
+                item = next(iterator, None)
+                if item is None:
+                    return
+                pending.add(asyncio.create_task(self._convert_one(item)))
+
+        schedule()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                schedule()
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _convert_one(self, item: BatchItem) -> Dict[str, Any]:
+        """
+        Конвертирует один элемент, превращая исключения в описание ошибки
+
+        Args:
+            item: Элемент пакета
+
+        Returns:
+            Словарь с результатом или ошибкой конвертации
+        """
+        started = time.monotonic()
+        outcome: Dict[str, Any] = {
+            "index": item.index,
+            "filename": item.filename,
+            "result": None,
+            "error": None,
+            "status_code": 200
+        }
+        try:
+            self.converter_service.validate_filename(item.filename)
+            # Пакет уже принят, поэтому файлы ждут места, а не отклоняются
+            async with get_admission_controller().slot(reject=False):
+                content = await item.load()
+                outcome["result"] = await self.converter_service.convert_bytes(
+                    content, item.filename
+                )
+        except HTTPException as he:
+            outcome["error"] = str(he.detail)
+            outcome["status_code"] = he.status_code
+        except Exception as e:
+            self.logger.exception("Ошибка конвертации элемента пакета",
+                                  filename=item.filename,
+                                  error_type=type(e).__name__,
+                                  error_message=str(e))
+            outcome["error"] = f"{type(e).__name__}: {str(e)}"
+            outcome["status_code"] = 500
+        outcome["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+        return outcome
@@ -0,0 +1,140 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+
+class ConversionEngine:
+    """
+    Движок выполнения CPU-bound конвертаций в пуле процессов.
+
+    Event loop uvicorn только ожидает результат, поэтому продолжает
+    принимать загрузки и отвечать на другие запросы во время конвертации.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        start_method: str = "spawn",
+        max_tasks_per_child: Optional[int] = None
+    ):
+        self.logger = get_logger(__name__)
+        self.workers = max(1, workers)
+        self.start_method = start_method
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        """
+        Запускает пул процессов (повторный вызов ничего не делает)
+        """
+        if self._executor is not None:
+            return
+
+        kwargs: Dict[str, Any] = {
+            "max_workers": self.workers,
+            "mp_context": multiprocessing.get_context(self.start_method)
+        }
+        if self.max_tasks_per_child:
+            kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+
+        self._executor = ProcessPoolExecutor(**kwargs)
+        self.logger.info("Пул процессов конвертации запущен",
+                         workers=self.workers,
+                         start_method=self.start_method,
+                         max_tasks_per_child=self.max_tasks_per_child)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Останавливает пул процессов
+
+        Args:
+            wait: Дождаться завершения выполняющихся задач
+        """
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+        self.logger.info("Пул процессов конвертации остановлен")
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Выполняет функцию в одном из процессов пула
+
+        Args:
+            func: Функция уровня модуля (должна сериализоваться pickle)
+            *args: Аргументы функции
+
+        Returns:
+            Результат выполнения функции
+        """
+        self.start()
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        try:
+            result = await loop.run_in_executor(
+                executor, functools.partial(func, *args)
+            )
+            self._completed += 1
+            return result
+        except BrokenProcessPool:
+            # Процесс пула аварийно завершился (например, OOM) - пересоздаем пул.
+            # Ошибку получают все задачи сломанного пула одновременно: пул
+            # пересоздает только первая, новый пул не останавливается
+            self._failed += 1
+            if self._executor is executor:
+                self.logger.error("Пул процессов поврежден, выполняется перезапуск")
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.start()
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику движка
+
+        Returns:
+            Словарь со статистикой
+        """
+        return {
+            "workers": self.workers,
+            "start_method": self.start_method,
+            "max_tasks_per_child": self.max_tasks_per_child,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed
+        }
+
+
+_engine: Optional[ConversionEngine] = None
+
+
+def get_conversion_engine() -> ConversionEngine:
+    """
+    Получить общий для процесса движок конвертации
+
+    Returns:
+        Экземпляр ConversionEngine, настроенный из Settings
+    """
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        _engine = ConversionEngine(
+            workers=settings.converter_workers,
+            start_method=settings.converter_start_method,
+            max_tasks_per_child=settings.converter_max_tasks_per_child
+        )
+    return _engine
@@ -1,28 +1,60 @@
-import io
+import hashlib
+import logging
+import math
+import time
 import mammoth
 from fastapi import UploadFile, HTTPException
-from typing import Dict, Any
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from app.config import get_settings
 from app.models.style_mapper import StyleMapper
+from app.models.conversion_options import ConversionOptions
+from app.models.conversion_result import ConversionResult
 from app.models.document_transformer import DocumentTransformer
+from app.models.html_document import HtmlDocument
+from app.services.conversion_engine import get_conversion_engine
+from app.services.disk_cache import get_disk_cache
+from app.services.docx_preview import truncate_docx
+from app.services.image_store import get_image_store
+from app.services.native_converter import NativeHtmlConverter, NativeUnsupported
+from app.services.outline_extractor import OutlineExtractor, extract_docx_outline
+from app.services.result_cache import ResultCache, get_result_cache
+from app.services.single_flight import get_single_flight
+from app.services.text_extractor import TextExtractor, extract_docx_text
+from app.services.upload_ingestor import IngestedUpload, SourceChangedError, get_upload_ingestor, run_verified
+from app.utils.docx_source import DocxSource, open_source
+from app.utils.html_blocks import cut_at_budget
 from app.utils.logger import get_logger
 
+# Профиль кэша простого текста: не зависит от карты стилей и трансформаций
+TEXT_PROFILE = f"text:{TextExtractor.VERSION}"
+
 
 class ConverterService:
     """
     Сервис для конвертации DOCX файлов в HTML
     """
     
-    def __init__(self):
+    def __init__(self, options: Optional[ConversionOptions] = None):
         self.logger = get_logger(__name__)
+        self.options = options or ConversionOptions()
         self.style_mapper = StyleMapper()
         self.style_map = self.style_mapper.create_style_mapping()
         self.document_transformer = DocumentTransformer()
+        self.html_engine = get_settings().html_engine
+        self.native_converter: Optional[NativeHtmlConverter] = None
+        if self.html_engine in ("native", "shadow"):
+            self.native_converter = NativeHtmlConverter(self.style_map, self.document_transformer)
+            if not self.native_converter.enabled:
+                self.logger.warning("Нативный движок отключен для карты стилей",
+                                    reason=self.native_converter.unsupported_reason)
+        self.profile_version = self._compute_profile_version()
         
-        self.logger.info("Инициализирован ConverterService")
+        self.logger.info("Инициализирован ConverterService", html_engine=self.html_engine)
         self.logger.debug("Создано маппингов стилей", 
                          style_mappings_count=len(self.style_map))
     
-    async def convert_file(self, file: UploadFile) -> Dict[str, Any]:
+    async def convert_file(self, file: UploadFile) -> ConversionResult:
         """
         Конвертирует DOCX файл в HTML
         
@@ -30,93 +62,200 @@ class ConverterService:
             file: Загруженный DOCX файл
             
         Returns:
-            Dict с результатом конвертации
+            ConversionResult с результатом конвертации
+        """
+        upload = await self.ingest_file(file)
+        try:
+            return await self.convert_upload(upload)
+        finally:
+            upload.cleanup()
+    
+    async def ingest_file(self, file: UploadFile) -> IngestedUpload:
+        """
+        Проверяет и потоково принимает загруженный DOCX файл
+        
+        Args:
+            file: Загруженный DOCX файл
+            
+        Returns:
+            Принятый файл с вычисленными хэшем и размером; вызывающий
+            отвечает за вызов cleanup()
         """
         self.logger.info("Начало конвертации файла", 
                          filename=file.filename,
                          content_type=file.content_type)
         
-        if not file.filename:
+        self.validate_filename(file.filename)
+        
+        try:
+            return await get_upload_ingestor().ingest_upload(file)
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.exception("Ошибка чтения загруженного файла",
+                                filename=file.filename,
+                                error_type=type(e).__name__,
+                                error_message=str(e))
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Ошибка при конвертации файла: {str(e)}"
+            )
+    
+    async def ingest_stream(self, chunks: AsyncIterator[bytes], filename: str) -> IngestedUpload:
+        """
+        Проверяет и принимает DOCX файл из потока байтов (тело запроса
+        без multipart обертки)
+        
+        Args:
+            chunks: Асинхронный поток частей тела запроса
+            filename: Имя исходного файла
+            
+        Returns:
+            Принятый файл с вычисленными хэшем и размером; вызывающий
+            отвечает за вызов cleanup()
+        """
+        self.logger.info("Начало конвертации файла из тела запроса", filename=filename)
+        
+        self.validate_filename(filename)
+        
+        try:
+            return await get_upload_ingestor().ingest(chunks, filename)
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.exception("Ошибка чтения тела запроса",
+                                filename=filename,
+                                error_type=type(e).__name__,
+                                error_message=str(e))
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Ошибка при конвертации файла: {str(e)}"
+            )
+    
+    def make_etag(self, content_hash: str, variant: str, profile: Optional[str] = None) -> str:
+        """
+        Формирует строгий ETag ответа
+        
+        ETag зависит от хэша содержимого, версии профиля конвертации
+        и варианта представления (формат ответа, имя файла), поэтому
+        его можно вычислить и сравнить с If-None-Match до конвертации.
+        
+        Args:
+            content_hash: SHA-256 содержимого файла
+            variant: Строка, описывающая вариант представления
+            profile: Профиль вместо профиля конвертации (например, TEXT_PROFILE)
+            
+        Returns:
+            Значение заголовка ETag в кавычках
+        """
+        source = f"{content_hash}:{profile or self._cache_profile()}:{variant}"
+        return '"' + hashlib.sha256(source.encode("utf-8")).hexdigest()[:32] + '"'
+    
+    def validate_filename(self, filename: Optional[str]) -> None:
+        """
+        Проверяет, что имя файла задано и относится к формату DOCX
+        
+        Args:
+            filename: Имя загруженного файла
+            
+        Raises:
+            HTTPException: Если файл не выбран или формат не поддерживается
+        """
+        if not filename:
             self.logger.error("Попытка конвертации без выбора файла")
             raise HTTPException(status_code=400, detail="Файл не выбран")
         
-        if not file.filename.lower().endswith('.docx'):
+        if not filename.lower().endswith('.docx'):
             self.logger.error("Попытка конвертации неподдерживаемого формата",
-                            filename=file.filename)
+                            filename=filename)
             raise HTTPException(
                 status_code=400, 
                 detail="Поддерживаются только DOCX файлы"
             )
+    
+    async def convert_bytes(
+        self,
+        content: bytes,
+        filename: str,
+        content_hash: Optional[str] = None
+    ) -> ConversionResult:
+        """
+        Конвертирует уже прочитанное содержимое DOCX файла в HTML
+        
+        Args:
+            content: Байты DOCX файла
+            filename: Имя исходного файла
+            content_hash: SHA-256 содержимого, если уже вычислен
+            
+        Returns:
+            ConversionResult с результатом конвертации
+        """
+        return await self.convert_upload(
+            IngestedUpload.from_bytes(filename, content, content_hash)
+        )
+    
+    async def convert_upload(self, upload: IngestedUpload) -> ConversionResult:
+        """
+        Конвертирует принятый DOCX файл в HTML
         
+        Анализ стилей, сводка предупреждений и полный HTML документ
+        вычисляются лениво - только если вызывающий к ним обратится.
+        
+        Args:
+            upload: Принятый файл (в памяти или во временном файле)
+            
+        Returns:
+            ConversionResult с результатом конвертации
+        """
+        filename = upload.filename
         try:
-            content = await file.read()
-            file_size = len(content)
-            file_like = io.BytesIO(content)
+            file_size = upload.size
             
             self.logger.debug("Файл прочитан", 
-                            filename=file.filename,
+                            filename=filename,
                             file_size=file_size)
             
-            # Получаем опции трансформации
-            transform_options = self.document_transformer.get_transform_options()
-            
-            self.logger.debug("Начало конвертации через Mammoth")
-            # Конвертируем с использованием стилей и трансформации
-            result = mammoth.convert_to_html(
-                file_like, 
-                style_map=self.style_map,
-                **transform_options
-            )
-            html_content = result.value
-            messages = result.messages
-            
-            warnings = [msg.message for msg in messages if msg.type == "warning"]
-            errors = [msg.message for msg in messages if msg.type == "error"]
+            conversion = await self._convert_cached(upload)
+            warnings = conversion["warnings"]
+            errors = conversion["errors"]
             
             self.logger.info("Mammoth конвертация завершена",
                            warnings_count=len(warnings),
                            errors_count=len(errors))
             
-            # Анализ предупреждений о стилях
-            self.logger.debug("Анализ стилевых предупреждений")
-            style_analysis = self.style_mapper.analyze_style_warnings(warnings)
-            warning_summary = self.style_mapper.get_warning_summary(style_analysis)
-            
-            complete_html = self._create_complete_html(html_content, file.filename)
-            
-            status = "success" if not errors else "success_with_errors"
+            result = ConversionResult(
+                original_filename=filename,
+                file_size=file_size,
+                html_content=conversion["html_content"],
+                conversion_warnings=warnings,
+                conversion_errors=errors,
+                style_mapper=self.style_mapper,
+                build_complete_html=self._create_complete_html,
+                max_warning_groups=get_settings().warning_groups_max,
+                truncated=conversion.get("truncated", False)
+            )
             
-            if warnings:
+            if warnings and self.logger.is_enabled_for(logging.WARNING):
                 self.logger.warning("Конвертация с предупреждениями",
-                                  filename=file.filename,
+                                  filename=filename,
                                   warnings_sample=warnings[:3])
             
-            if errors:
+            if errors and self.logger.is_enabled_for(logging.ERROR):
                 self.logger.error("Конвертация с ошибками",
-                                filename=file.filename,
+                                filename=filename,
                                 errors_sample=errors[:3])
             
             self.logger.info("Конвертация файла завершена успешно",
-                           filename=file.filename,
-                           status=status)
-            
-            return {
-                "original_filename": file.filename,
-                "file_size": file_size,
-                "html_content": html_content,
-                "complete_html": complete_html,
-                "conversion_warnings": warnings,
-                "conversion_errors": errors,
-                "style_analysis": style_analysis,
-                "warning_summary": warning_summary,
-                "warnings_count": len(warnings),
-                "errors_count": len(errors),
-                "status": status
-            }
+                           filename=filename,
+                           status=result.status)
+            
+            return result
             
+        except SourceChangedError:
+            raise self._source_changed(upload)
         except Exception as e:
             self.logger.exception("Критическая ошибка при конвертации файла",
-                                filename=file.filename,
+                                filename=filename,
                                 error_type=type(e).__name__,
                                 error_message=str(e))
             raise HTTPException(
@@ -124,6 +263,517 @@ class ConverterService:
                 detail=f"Ошибка при конвертации файла: {str(e)}"
             )
     
+    def _source_changed(self, upload: IngestedUpload) -> HTTPException:
+        """
+        Ошибка 409 для файла, изменившегося после приема
+        """
+        self.logger.warning("Файл изменился после приема", filename=upload.filename)
+        return HTTPException(
+            status_code=409,
+            detail="Файл изменился во время конвертации, повторите запрос"
+        )
+    
+    async def get_conversion(self, upload: IngestedUpload) -> Dict[str, Any]:
+        """
+        Возвращает только результат Mammoth (HTML, предупреждения, ошибки)
+        без анализа стилей и сборки полного ответа
+        
+        Args:
+            upload: Принятый файл
+            
+        Returns:
+            Dict с HTML и списками предупреждений и ошибок
+        """
+        try:
+            return await self._convert_cached(upload)
+        except Exception as e:
+            self.logger.exception("Критическая ошибка при конвертации файла",
+                                filename=upload.filename,
+                                error_type=type(e).__name__,
+                                error_message=str(e))
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Ошибка при конвертации файла: {str(e)}"
+            )
+    
+    async def _convert_cached(self, upload: IngestedUpload) -> Dict[str, Any]:
+        """
+        Возвращает результат Mammoth из кэша (память, затем диск)
+        или выполняет конвертацию.
+        
+        Одновременные запросы с одинаковым содержимым объединяются:
+        конвертация выполняется один раз, результат получают все.
+        
+        Args:
+            upload: Принятый файл
+            
+        Returns:
+            Dict с HTML и списками предупреждений и ошибок
+        """
+        return await self._run_cached(
+            ResultCache.make_key(upload.content_hash, self._cache_profile()),
+            upload,
+            convert_docx_content,
+            self.options
+        )
+    
+    async def extract_text(self, upload: IngestedUpload) -> str:
+        """
+        Извлекает простой текст документа без карты стилей, трансформаций
+        и анализа предупреждений
+        
+        Результат кэшируется по хэшу содержимого отдельно от HTML
+        и не зависит от профиля конвертации.
+        
+        Args:
+            upload: Принятый файл
+            
+        Returns:
+            Текст документа (параграфы разделены пустой строкой)
+        """
+        try:
+            extraction = await self._run_cached(
+                ResultCache.make_key(upload.content_hash, TEXT_PROFILE),
+                upload,
+                extract_docx_text
+            )
+        except SourceChangedError:
+            raise self._source_changed(upload)
+        except Exception as e:
+            self.logger.exception("Ошибка извлечения текста",
+                                filename=upload.filename,
+                                error_type=type(e).__name__,
+                                error_message=str(e))
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Ошибка при извлечении текста: {str(e)}"
+            )
+        return extraction["text"]
+
+    async def extract_outline(self, upload: IngestedUpload) -> Dict[str, Any]:
+        """
+        Читает структуру заголовков документа без конвертации в HTML
+        
+        Уровни заголовков определяются той же картой стилей и трансформацией,
+        что и при конвертации; результат кэшируется по хэшу содержимого
+        и версии профиля конвертации.
+        
+        Args:
+            upload: Принятый файл
+            
+        Returns:
+            Dict с заголовками (headings) и числом элементов (blocks)
+            и параграфов (paragraphs) документа
+        """
+        try:
+            return await self._run_cached(
+                ResultCache.make_key(
+                    upload.content_hash, f"outline:{OutlineExtractor.VERSION}:{self.profile_version}"
+                ),
+                upload,
+                extract_docx_outline
+            )
+        except Exception as e:
+            self.logger.exception("Ошибка чтения структуры документа",
+                                filename=upload.filename,
+                                error_type=type(e).__name__,
+                                error_message=str(e))
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Ошибка при чтении структуры документа: {str(e)}"
+            )
+    
+    async def iter_text(self, upload: IngestedUpload, chunk_size: int) -> AsyncIterator[str]:
+        """
+        Выдает простой текст документа по мере чтения word/document.xml
+
+        Текст из кэша отдается частями сразу; иначе документ читается
+        потоковым извлекателем в пуле потоков, и после чтения до конца
+        текст сохраняется в кэш.
+
+        Args:
+            upload: Принятый файл; не должен удаляться до конца потока
+            chunk_size: Примерный размер части в символах
+        """
+        cache = get_result_cache()
+        cache_key = ResultCache.make_key(upload.content_hash, TEXT_PROFILE)
+        extraction = cache.get(cache_key)
+        if extraction is not None:
+            text = extraction["text"]
+            for start in range(0, len(text), chunk_size):
+                yield text[start:start + chunk_size]
+            return
+
+        parts = []
+        chunks = TextExtractor().iter_text(upload.source, chunk_size)
+        async for chunk in iterate_in_threadpool(chunks):
+            parts.append(chunk)
+            yield chunk
+        cache.put(cache_key, {"text": "".join(parts)})
+
+    async def iter_html(self, upload: IngestedUpload, chunk_size: int) -> AsyncIterator[str]:
+        """
+        Выдает HTML документа (тот же, что html_content) по мере конвертации
+
+        Постепенная выдача возможна только при CONVERTER_HTML_ENGINE=native:
+        документ читается нативным движком в пуле потоков, HTML уходит
+        клиенту по мере разбора word/document.xml, а после чтения до конца
+        результат сохраняется в кэш. При других движках, для превью и для
+        результата из кэша HTML получается через get_conversion (кэш и пул
+        процессов, с учетом выбранного движка) и отдается частями. Если
+        нативный движок отказался от документа после выдачи части HTML,
+        отдается оставшаяся часть результата get_conversion.
+
+        Args:
+            upload: Принятый файл; не должен удаляться до конца потока
+            chunk_size: Примерный размер части в символах
+
+        Raises:
+            HTTPException: Ошибка конвертации
+            RuntimeError: Результат Mammoth не продолжает уже выданный HTML
+        """
+        cache_key = ResultCache.make_key(upload.content_hash, self._cache_profile())
+        conversion = get_result_cache().get(cache_key)
+        disk_cache = get_disk_cache()
+        if conversion is None and disk_cache is not None:
+            conversion = await run_in_threadpool(disk_cache.get, cache_key)
+            if conversion is not None:
+                get_result_cache().put(cache_key, conversion)
+        native = self.native_converter if self.html_engine == "native" else None
+        if conversion is None and (native is None or not native.enabled or self.options.is_preview):
+            conversion = await self.get_conversion(upload)
+        if conversion is not None:
+            for fragment in HtmlDocument().iter_fragments(conversion["html_content"], chunk_size):
+                yield fragment
+            return
+
+        report: Dict[str, Any] = {}
+        sent: List[str] = []
+        pending: List[str] = []
+        pending_size = 0
+        try:
+            async for fragment in iterate_in_threadpool(native.iter_html(upload.source, report)):
+                pending.append(fragment)
+                pending_size += len(fragment)
+                if pending_size >= chunk_size:
+                    chunk = "".join(pending)
+                    sent.append(chunk)
+                    pending = []
+                    pending_size = 0
+                    yield chunk
+        except Exception as e:
+            self.logger.debug("Потоковая конвертация передана Mammoth",
+                              error_type=type(e).__name__,
+                              reason=str(e))
+            conversion = await self.get_conversion(upload)
+            html_content = conversion["html_content"]
+            prefix = "".join(sent)
+            if not html_content.startswith(prefix):
+                raise RuntimeError("Результат Mammoth расходится с уже отправленным HTML")
+            for fragment in HtmlDocument().iter_fragments(html_content[len(prefix):], chunk_size):
+                yield fragment
+            return
+
+        if pending:
+            chunk = "".join(pending)
+            sent.append(chunk)
+            yield chunk
+        conversion = {
+            "html_content": "".join(sent),
+            "warnings": report["warnings"],
+            "errors": [],
+            "truncated": report["truncated"]
+        }
+        get_result_cache().put(cache_key, conversion)
+        if disk_cache is not None:
+            await run_in_threadpool(disk_cache.put, cache_key, conversion)
+
+    async def _run_cached(
+        self,
+        cache_key: str,
+        upload: IngestedUpload,
+        func: Callable[..., Dict[str, Any]],
+        *args: Any
+    ) -> Dict[str, Any]:
+        """
+        Возвращает результат из кэша в памяти или выполняет func
+        с одновременными одинаковыми запросами, объединенными в один
+        """
+        cache = get_result_cache()
+        conversion = cache.get(cache_key)
+        if conversion is not None:
+            self.logger.debug("Результат конвертации найден в кэше", cache_key=cache_key)
+            return conversion
+        
+        def start() -> Awaitable[Dict[str, Any]]:
+            # Файл удерживается синхронно, до создания задачи: если запрос,
+            # начавший конвертацию, будет отменен, его cleanup() не удалит
+            # содержимое, которое еще нужно задаче и присоединившимся запросам
+            upload.retain()
+            return self._load_or_convert(cache_key, upload, func, *args)
+        
+        return await get_single_flight().do(cache_key, start)
+    
+    async def _load_or_convert(
+        self,
+        cache_key: str,
+        upload: IngestedUpload,
+        func: Callable[..., Dict[str, Any]],
+        *args: Any
+    ) -> Dict[str, Any]:
+        """
+        Читает результат из дискового кэша или вызывает func в пуле
+        процессов и сохраняет результат в оба уровня кэша
+        
+        Args:
+            cache_key: Ключ кэша
+            upload: Принятый файл, удержанный вызывающим (retain);
+                освобождается по завершении
+            func: Точка входа для процессов пула (source, *args)
+            args: Дополнительные аргументы func
+            
+        Returns:
+            Результат func
+        """
+        cache = get_result_cache()
+        disk_cache = get_disk_cache()
+        try:
+            if disk_cache is not None:
+                conversion = await run_in_threadpool(disk_cache.get, cache_key)
+                if conversion is not None:
+                    self.logger.debug("Результат конвертации найден в дисковом кэше",
+                                    cache_key=cache_key)
+                    cache.put(cache_key, conversion)
+                    return conversion
+            
+            # Конвертация выполняется в пуле процессов, event loop не блокируется;
+            # большие файлы передаются путем, а не содержимым
+            if upload.verify_source:
+                # Файл на общем томе может измениться после расчета хэша:
+                # процесс пула конвертирует только содержимое с этим хэшем
+                conversion = await get_conversion_engine().run(
+                    run_verified, func, upload.path, upload.content_hash, *args
+                )
+            else:
+                conversion = await get_conversion_engine().run(func, upload.source, *args)
+        finally:
+            upload.release()
+        
+        cache.put(cache_key, conversion)
+        if disk_cache is not None:
+            await run_in_threadpool(disk_cache.put, cache_key, conversion)
+        return conversion
+    
+    def convert_content(
+        self,
+        source: DocxSource,
+        options: Optional[ConversionOptions] = None
+    ) -> Dict[str, Any]:
+        """
+        Синхронно конвертирует содержимое DOCX файла движком из настроек
+        
+        Args:
+            source: Байты DOCX файла, путь к нему или открытый файл
+            options: Параметры конвертации (по умолчанию - параметры сервиса)
+            
+        Returns:
+            Dict с HTML и списками предупреждений и ошибок
+        """
+        options = options or self.options
+        if options.is_preview:
+            return self._convert_preview(source, options)
+        if self.native_converter is None or not self.native_converter.enabled:
+            return self.convert_with_mammoth(source, options)
+        if self.html_engine == "shadow":
+            return self._convert_shadow(source, options)
+        
+        result = self._try_native(source)
+        return result if result is not None else self.convert_with_mammoth(source, options)
+    
+    def _try_native(self, source: DocxSource, **limits: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        Конвертирует нативным движком
+        
+        Returns:
+            Результат или None, если документ нужно передать Mammoth
+        """
+        try:
+            return self.native_converter.convert(source, **limits)
+        except NativeUnsupported as e:
+            self.logger.debug("Документ передан Mammoth", reason=str(e))
+        except Exception as e:
+            # Ошибки чтения сообщает Mammoth, чтобы они не зависели от движка
+            self.logger.warning("Ошибка нативного движка, документ передан Mammoth",
+                                error_type=type(e).__name__,
+                                error_message=str(e))
+        return None
+    
+    def _convert_preview(self, source: DocxSource, options: ConversionOptions) -> Dict[str, Any]:
+        """
+        Конвертирует только начало документа
+        
+        Нативный движок прекращает разбор, как только достигнут лимит.
+        Для Mammoth документ сначала усекается до первых preview_blocks
+        элементов, а HTML обрезается по границе элемента. Если задан
+        только бюджет в байтах, конвертируются первые
+        CONVERTER_PREVIEW_MAX_BLOCKS элементов, и их число увеличивается
+        (по оценке размера HTML на элемент, не меньше чем вдвое), пока HTML
+        не достигнет бюджета или не закончится документ, - результат
+        совпадает с нативным движком.
+        
+        Returns:
+            Dict с HTML, предупреждениями, ошибками и признаком truncated
+        """
+        if (self.html_engine == "native"
+                and self.native_converter is not None
+                and self.native_converter.enabled):
+            result = self._try_native(
+                source, max_blocks=options.preview_blocks, max_bytes=options.preview_bytes
+            )
+            if result is not None:
+                return result
+        
+        max_blocks = options.preview_blocks or get_settings().preview_max_blocks
+        while True:
+            head, truncated = truncate_docx(source, max_blocks)
+            result = self.convert_with_mammoth(head, options)
+            if options.preview_bytes is not None:
+                cut = cut_at_budget(result["html_content"], options.preview_bytes)
+                if cut is not None:
+                    result["html_content"] = result["html_content"][:cut]
+                    truncated = True
+                    break
+            if not truncated or options.preview_blocks is not None:
+                break
+            # Бюджет в байтах не достигнут, а документ не закончился:
+            # число элементов оценивается по размеру HTML на элемент
+            produced = len(result["html_content"].encode("utf-8"))
+            estimate = math.ceil(max_blocks * options.preview_bytes * 1.2 / produced) if produced else 0
+            max_blocks = max(max_blocks * 2, estimate)
+        result["truncated"] = truncated
+        return result
+    
+    def _convert_shadow(
+        self,
+        source: DocxSource,
+        options: Optional[ConversionOptions] = None
+    ) -> Dict[str, Any]:
+        """
+        Конвертирует через Mammoth и сравнивает с нативным движком
+        
+        Returns:
+            Результат Mammoth; расхождения и время обоих движков пишутся в лог
+        """
+        started = time.perf_counter()
+        result = self.convert_with_mammoth(source, options)
+        mammoth_ms = round((time.perf_counter() - started) * 1000, 1)
+        
+        started = time.perf_counter()
+        try:
+            native = self.native_converter.convert(source)
+        except NativeUnsupported as e:
+            self.logger.info("Теневое сравнение: документ не поддерживается нативным движком",
+                             reason=str(e),
+                             mammoth_ms=mammoth_ms)
+            return result
+        except Exception as e:
+            self.logger.warning("Теневое сравнение: ошибка нативного движка",
+                                error_type=type(e).__name__,
+                                error_message=str(e),
+                                mammoth_ms=mammoth_ms)
+            return result
+        native_ms = round((time.perf_counter() - started) * 1000, 1)
+        
+        html_matches = native["html_content"] == result["html_content"]
+        warnings_match = native["warnings"] == result["warnings"]
+        if html_matches and warnings_match:
+            self.logger.info("Теневое сравнение: результаты совпадают",
+                             mammoth_ms=mammoth_ms,
+                             native_ms=native_ms)
+            return result
+        
+        details: Dict[str, Any] = {}
+        if not html_matches:
+            expected, actual = result["html_content"], native["html_content"]
+            offset = next(
+                (i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+                min(len(expected), len(actual))
+            )
+            details.update(
+                diff_offset=offset,
+                mammoth_fragment=expected[max(0, offset - 40):offset + 80],
+                native_fragment=actual[max(0, offset - 40):offset + 80]
+            )
+        if not warnings_match:
+            details.update(
+                mammoth_warnings_count=len(result["warnings"]),
+                native_warnings_count=len(native["warnings"])
+            )
+        self.logger.warning("Теневое сравнение: результаты расходятся",
+                            mammoth_ms=mammoth_ms,
+                            native_ms=native_ms,
+                            **details)
+        return result
+    
+    def convert_with_mammoth(
+        self,
+        source: DocxSource,
+        options: Optional[ConversionOptions] = None
+    ) -> Dict[str, Any]:
+        """
+        Синхронно конвертирует содержимое DOCX файла через Mammoth
+        
+        Args:
+            source: Байты DOCX файла, путь к нему или открытый файл
+            options: Параметры конвертации (по умолчанию - параметры сервиса)
+            
+        Returns:
+            Dict с HTML и списками предупреждений и ошибок
+        """
+        options = options or self.options
+        save_image = None
+        if options.image_mode == ConversionOptions.IMAGES_STORE:
+            save_image = get_image_store().save
+        
+        # Получаем опции трансформации
+        transform_options = self.document_transformer.get_transform_options(save_image)
+        
+        self.logger.debug("Начало конвертации через Mammoth")
+        # Файл на диске открывается напрямую, без чтения в память целиком
+        with open_source(source) as file_like:
+            # Конвертируем с использованием стилей и трансформации
+            result = mammoth.convert_to_html(
+                file_like, 
+                style_map=self.style_map,
+                **transform_options
+            )
+        messages = result.messages
+        
+        return {
+            "html_content": result.value,
+            "warnings": [msg.message for msg in messages if msg.type == "warning"],
+            "errors": [msg.message for msg in messages if msg.type == "error"]
+        }
+    
+    def _cache_profile(self) -> str:
+        """
+        Версия профиля вместе с параметрами конвертации, для ключей кэша и ETag
+        """
+        suffix = self.options.cache_suffix()
+        return f"{self.profile_version}+{suffix}" if suffix else self.profile_version
+    
+    def _compute_profile_version(self) -> str:
+        """
+        Вычисляет версию профиля конвертации по карте стилей и правилам трансформации
+        
+        Returns:
+            Короткий хэш профиля
+        """
+        profile = f"{self.style_map}\n{self.document_transformer.get_rules_fingerprint()}"
+        if self.html_engine == "native":
+            profile += f"\nnative:{NativeHtmlConverter.VERSION}"
+        return hashlib.sha256(profile.encode("utf-8")).hexdigest()[:16]
+    
     def _create_complete_html(self, html_content: str, filename: str) -> str:
         """
         Создает полный HTML документ с необходимыми тегами
@@ -136,4 +786,30 @@ class ConverterService:
             Полный HTML документ
         """
         self.logger.debug("Создание полного HTML документа", filename=filename)
-        return f"""{html_content}"""
\ No newline at end of file
+        return f"""{html_content}"""
+
+
+_worker_service: Optional[ConverterService] = None
+
+
+def convert_docx_content(
+    source: DocxSource,
+    options: Optional[ConversionOptions] = None
+) -> Dict[str, Any]:
+    """
+    Точка входа для процессов пула: конвертирует DOCX в HTML.
+    
+    ConverterService создается один раз на процесс, поэтому карта стилей
+    и трансформер не пересобираются для каждой задачи.
+    
+    Args:
+        source: Байты DOCX файла, путь к нему или открытый файл
+        options: Параметры конвертации
+        
+    Returns:
+        Dict с HTML и списками предупреждений и ошибок
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = ConverterService()
+    return _worker_service.convert_content(source, options)
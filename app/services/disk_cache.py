@@ -0,0 +1,230 @@
+import json
+import os
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class DiskCache:
+    """
+    Дисковый кэш результатов конвертации, переживающий перезапуски.
+
+    Записи хранятся в отдельных файлах, имя которых образовано ключом кэша,
+    и записываются атомарно (временный файл + os.replace), поэтому каталог
+    может одновременно использоваться несколькими процессами uvicorn.
+    Вытеснение - по времени последнего доступа (mtime) при превышении
+    бюджета в байтах.
+    """
+
+    # Первый байт файла записи определяет формат содержимого
+    _RAW = b"J"
+    _ZLIB = b"Z"
+
+    def __init__(self, directory: str, max_bytes: int, compress: bool = True, compression_level: int = 6):
+        self.logger = get_logger(__name__)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.compression_level = compression_level
+        self._approx_bytes: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Читает запись из кэша
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            Значение или None при промахе
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Обновляем mtime, чтобы запись считалась недавно использованной
+            os.utime(path, None)
+            value = self._decode(data)
+        except FileNotFoundError:
+            self._misses += 1
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            self.logger.warning("Поврежденная запись дискового кэша удалена",
+                                path=path,
+                                error_message=str(e))
+            self._remove(path)
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Атомарно сохраняет запись и при необходимости вытесняет старые
+
+        Args:
+            key: Ключ записи
+            value: Сериализуемый в JSON результат конвертации
+        """
+        data = self._encode(value)
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self._remove(tmp_path)
+            self.logger.warning("Не удалось записать дисковый кэш",
+                                path=path,
+                                error_message=str(e))
+            return
+
+        self._writes += 1
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan_total()
+        else:
+            self._approx_bytes += len(data)
+
+        if self._approx_bytes > self.max_bytes:
+            self._evict()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает счетчики дискового кэша
+
+        Returns:
+            Словарь со статистикой
+        """
+        return {
+            "directory": self.directory,
+            "approx_bytes": self._approx_bytes,
+            "max_bytes": self.max_bytes,
+            "compress": self.compress,
+            "hits": self._hits,
+            "misses": self._misses,
+            "writes": self._writes,
+            "evictions": self._evictions
+        }
+
+    def _path(self, key: str) -> str:
+        """
+        Путь к файлу записи; каталоги разбиты по первым символам хэша
+        """
+        name = key.replace(":", "-")
+        return os.path.join(self.directory, name[:2], name[2:4], f"{name}.entry")
+
+    def _encode(self, value: Any) -> bytes:
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self.compress:
+            return self._ZLIB + zlib.compress(payload, self.compression_level)
+        return self._RAW + payload
+
+    def _decode(self, data: bytes) -> Any:
+        marker, payload = data[:1], data[1:]
+        if marker == self._ZLIB:
+            payload = zlib.decompress(payload)
+        elif marker != self._RAW:
+            raise ValueError("Неизвестный формат записи")
+        return json.loads(payload.decode("utf-8"))
+
+    def _list_entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Возвращает (mtime, размер, путь) для всех записей кэша
+        """
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".entry"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._list_entries())
+
+    def _evict(self) -> None:
+        """
+        Удаляет самые давно использованные записи, пока объем
+        не опустится до 90% бюджета
+        """
+        lock_path = os.path.join(self.directory, ".evict.lock")
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Вытеснение уже выполняет другой процесс
+                    return
+
+            started = time.monotonic()
+            entries = sorted(self._list_entries())
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                if self._remove(path):
+                    total -= size
+                    evicted += 1
+
+            self._approx_bytes = total
+            self._evictions += evicted
+            self.logger.info("Вытеснение дискового кэша завершено",
+                             evicted=evicted,
+                             total_bytes=total,
+                             duration=round(time.monotonic() - started, 3))
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+_disk_cache: Optional[DiskCache] = None
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """
+    Получить дисковый кэш процесса
+
+    Returns:
+        Экземпляр DiskCache или None, если каталог кэша не настроен
+    """
+    global _disk_cache
+    settings = get_settings()
+    if _disk_cache is None and settings.disk_cache_dir:
+        _disk_cache = DiskCache(
+            directory=settings.disk_cache_dir,
+            max_bytes=settings.disk_cache_max_bytes,
+            compress=settings.disk_cache_compress
+        )
+    return _disk_cache
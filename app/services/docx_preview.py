@@ -0,0 +1,75 @@
+import io
+import zipfile
+from typing import Tuple
+from xml.etree import ElementTree
+from app.services.native_converter import W, find_document_part
+from app.utils.docx_source import DocxSource, open_source
+
+
+def truncate_docx(source: DocxSource, max_blocks: int) -> Tuple[DocxSource, bool]:
+    """
+    Оставляет в документе только первые max_blocks элементов w:body
+
+    word/document.xml разбирается инкрементально и только до нужного
+    элемента; остальные части пакета (стили, нумерация, изображения)
+    копируются без изменений, поэтому Mammoth конвертирует начало
+    документа так же, как конвертировал бы его в полном файле.
+
+    Args:
+        source: Байты DOCX файла, путь к нему или открытый файл
+        max_blocks: Число элементов верхнего уровня
+
+    Returns:
+        Кортеж (DOCX для конвертации, был ли документ усечен);
+        если документ короче лимита, возвращается исходный source
+    """
+    with open_source(source) as file_like, zipfile.ZipFile(file_like) as docx:
+        document_path = find_document_part(docx)
+        root = _read_head(docx, document_path, max_blocks)
+        if root is None:
+            return source, False
+
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as truncated:
+            for info in docx.infolist():
+                if info.filename == document_path:
+                    truncated.writestr(
+                        document_path,
+                        ElementTree.tostring(root, encoding="utf-8", xml_declaration=True)
+                    )
+                else:
+                    # Без повторного сжатия: файл живет только до конца конвертации
+                    truncated.writestr(info.filename, docx.read(info.filename))
+    return output.getvalue(), True
+
+
+def _read_head(docx: zipfile.ZipFile, document_path: str, max_blocks: int):
+    """
+    Читает word/document.xml до элемента w:body с номером max_blocks + 1
+
+    Returns:
+        Корень усеченного дерева или None, если элементов не больше max_blocks
+    """
+    body_tag = f"{{{W}}}body"
+    depth = 0
+    root = None
+    body = None
+    blocks = 0
+    with docx.open(document_path) as document_xml:
+        for event, element in ElementTree.iterparse(document_xml, events=("start", "end")):
+            if event == "end":
+                depth -= 1
+                continue
+            depth += 1
+            if depth == 1:
+                root = element
+            elif depth == 2 and element.tag == body_tag:
+                body = element
+            elif depth == 3 and body is not None:
+                blocks += 1
+                if blocks > max_blocks:
+                    # Парсер читает поток блоками, и дерево уже может содержать
+                    # элементы дальше текущего события
+                    del body[max_blocks:]
+                    return root
+    return None
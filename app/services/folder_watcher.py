@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from app.services.offline_converter import ConversionReport, OfflineConverter
+from app.utils.logger import get_logger
+
+
+class FolderWatcher:
+    """
+    Наблюдение за входными каталогами и инкрементальная конвертация.
+
+    Каталоги опрашиваются через os.scandir: на каждом проходе читаются
+    только метаданные (размер и mtime), содержимое хэшируется лишь при
+    изменении mtime, а неизмененные файлы отсекаются по манифесту.
+    Файл конвертируется, когда его размер и mtime не изменились
+    между двумя проходами, - так не обрабатываются файлы, которые
+    еще копируются в каталог.
+    """
+
+    def __init__(
+        self,
+        converters: List[OfflineConverter],
+        executor: ProcessPoolExecutor,
+        max_pending: int,
+        interval: float = 2.0
+    ):
+        self.logger = get_logger(__name__)
+        self.converters = converters
+        self.executor = executor
+        self.max_pending = max_pending
+        self.interval = interval
+        # Кандидаты на конвертацию: (каталог, ключ) -> (размер, mtime) на прошлом проходе
+        self._candidates: Dict[Tuple[int, str], Tuple[int, float]] = {}
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Просит цикл наблюдения завершиться после текущего прохода"""
+        self._stop.set()
+
+    def poll_once(self) -> ConversionReport:
+        """
+        Один проход по всем каталогам
+
+        Returns:
+            Отчет о сконвертированных за проход файлах
+        """
+        report = ConversionReport()
+        candidates: Dict[Tuple[int, str], Tuple[int, float]] = {}
+
+        for index, converter in enumerate(self.converters):
+            present = set()
+            stable = []
+            try:
+                for key, path, stat in converter.scan():
+                    present.add(key)
+                    if converter.is_current(key, path, stat):
+                        report.skipped += 1
+                        continue
+                    signature = (stat.st_size, stat.st_mtime)
+                    if self._candidates.get((index, key)) == signature:
+                        stable.append((key, path, stat))
+                    else:
+                        candidates[(index, key)] = signature
+            except OSError as e:
+                # Каталог недоступен целиком: ничего не удаляется и не
+                # конвертируется до следующего прохода
+                self.logger.warning("Входной каталог недоступен, проход пропущен",
+                                    input_dir=converter.input_dir,
+                                    error_message=str(e))
+                continue
+
+            # Для исходников, удаленных из каталога, удаляются результат
+            # и запись манифеста; файлы в непрочитанных подкаталогах
+            # удаленными не считаются
+            for key in list(converter.manifest.entries):
+                if key not in present and not converter.is_unlisted(key):
+                    converter.remove_output(key)
+
+            if stable:
+                self.logger.info("Обнаружены новые или измененные файлы",
+                                 input_dir=converter.input_dir,
+                                 count=len(stable))
+                converter.convert(self.executor, stable, report, self.max_pending)
+            else:
+                converter.manifest.save()
+
+        self._candidates = candidates
+        return report
+
+    def run_forever(self, on_report: Optional[Callable[[ConversionReport], None]] = None) -> None:
+        """
+        Опрашивает каталоги до вызова stop()
+
+        Args:
+            on_report: Вызывается с отчетом после каждого прохода,
+                в котором что-то было сконвертировано
+        """
+        self.logger.info("Наблюдение за каталогами запущено",
+                         input_dirs=[c.input_dir for c in self.converters],
+                         interval=self.interval)
+        while not self._stop.is_set():
+            started = time.monotonic()
+            report = self.poll_once()
+            if report.timings and on_report is not None:
+                on_report(report)
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+        self.logger.info("Наблюдение за каталогами остановлено")
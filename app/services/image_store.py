@@ -0,0 +1,109 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import Dict, Optional, Tuple
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+_EXTENSIONS: Dict[str, str] = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/bmp": "bmp",
+    "image/tiff": "tiff",
+    "image/svg+xml": "svg",
+    "image/x-emf": "emf",
+    "image/x-wmf": "wmf",
+}
+_CONTENT_TYPES: Dict[str, str] = {ext: ct for ct, ext in _EXTENSIONS.items()}
+
+
+class ImageStore:
+    """
+    Хранилище изображений, адресуемое по SHA-256 содержимого.
+
+    Одинаковые изображения из разных документов сохраняются один раз.
+    Файлы записываются атомарно, поэтому хранилище может одновременно
+    использоваться всеми процессами пула.
+    """
+
+    def __init__(self, directory: str, url_prefix: str):
+        self.logger = get_logger(__name__)
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def save(self, content_type: str, data: bytes) -> str:
+        """
+        Сохраняет изображение, если такого еще нет
+
+        Args:
+            content_type: MIME тип изображения
+            data: Содержимое изображения
+
+        Returns:
+            URL изображения
+        """
+        image_hash = hashlib.sha256(data).hexdigest()
+        extension = _EXTENSIONS.get(content_type, "bin")
+        path = self._path(image_hash, extension)
+
+        if not os.path.exists(path):
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.logger.debug("Изображение сохранено",
+                              image_hash=image_hash,
+                              content_type=content_type,
+                              size=len(data))
+
+        return f"{self.url_prefix}/{image_hash}.{extension}"
+
+    def find(self, name: str) -> Optional[Tuple[str, str]]:
+        """
+        Находит изображение по имени вида <hash>.<ext>
+
+        Args:
+            name: Имя изображения из URL
+
+        Returns:
+            (путь к файлу, MIME тип) или None, если изображение не найдено
+        """
+        image_hash, _, extension = name.partition(".")
+        if not _HASH_PATTERN.match(image_hash):
+            return None
+        if extension not in _CONTENT_TYPES and extension != "bin":
+            return None
+        path = self._path(image_hash, extension)
+        if not os.path.exists(path):
+            return None
+        return path, _CONTENT_TYPES.get(extension, "application/octet-stream")
+
+    def _path(self, image_hash: str, extension: str) -> str:
+        return os.path.join(self.directory, image_hash[:2], f"{image_hash}.{extension}")
+
+
+_image_store: Optional[ImageStore] = None
+
+
+def get_image_store() -> ImageStore:
+    """
+    Получить хранилище изображений процесса
+
+    Returns:
+        Экземпляр ImageStore, настроенный из Settings
+    """
+    global _image_store
+    if _image_store is None:
+        settings = get_settings()
+        _image_store = ImageStore(
+            directory=settings.image_store_dir,
+            url_prefix=settings.image_url_prefix
+        )
+    return _image_store
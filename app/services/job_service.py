@@ -0,0 +1,283 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.models.conversion_result import ConversionResult
+from app.services.admission_controller import QueueFullError
+from app.services.converter_service import ConverterService
+from app.services.result_cache import estimate_size
+from app.services.upload_ingestor import IngestedUpload
+from app.utils.logger import get_logger
+
+
+class ConversionJob:
+    """
+    Фоновая задача конвертации одного DOCX файла
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, upload: IngestedUpload):
+        self.job_id = uuid.uuid4().hex
+        self.filename = upload.filename
+        self.upload: Optional[IngestedUpload] = upload
+        self.status = self.PENDING
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[ConversionResult] = None
+        self.result_size = 0
+        self.error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        """Задача завершена (успешно или с ошибкой)"""
+        return self.status in (self.DONE, self.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает описание состояния задачи
+
+        Returns:
+            Словарь со статусом задачи
+        """
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """
+    Очередь фоновых конвертаций и пул обработчиков.
+
+    Обработчики - это задачи asyncio, которые передают работу в общий
+    ConversionEngine через ConverterService, поэтому время загрузки
+    не зависит от времени конвертации.
+
+    Задачи и результаты хранятся в памяти процесса: при нескольких
+    процессах uvicorn задача доступна только в том процессе, который
+    ее принял. Число и объем хранимых результатов ограничены,
+    устаревшие задачи удаляются при постановке и при чтении.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        ttl_seconds: int,
+        max_stored: int = 1000,
+        max_stored_bytes: int = 256 * 1024 * 1024
+    ):
+        self.logger = get_logger(__name__)
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.ttl_seconds = ttl_seconds
+        self.max_stored = max(1, max_stored)
+        self.max_stored_bytes = max_stored_bytes
+        self._stored_bytes = 0
+        self._jobs: Dict[str, ConversionJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._converter_service: Optional[ConverterService] = None
+
+    def start(self) -> None:
+        """
+        Запускает обработчики очереди (повторный вызов ничего не делает)
+        """
+        if self._worker_tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._converter_service = ConverterService()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        self.logger.info("Обработчики фоновых задач запущены", workers=self.workers)
+        if _get_web_concurrency() > 1:
+            self.logger.warning("Фоновые задачи хранятся в памяти процесса: при нескольких "
+                                "процессах uvicorn GET /jobs/{job_id} находит задачу только "
+                                "в принявшем ее процессе",
+                                web_concurrency=_get_web_concurrency())
+
+    async def shutdown(self) -> None:
+        """
+        Останавливает обработчики очереди
+        """
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+        self.logger.info("Обработчики фоновых задач остановлены")
+
+    def submit(self, upload: IngestedUpload) -> ConversionJob:
+        """
+        Ставит файл в очередь на конвертацию
+
+        Args:
+            upload: Принятый файл; временный файл удаляется после конвертации
+
+        Returns:
+            Созданная задача
+
+        Raises:
+            QueueFullError: Если очередь задач заполнена
+        """
+        self.start()
+        self._purge_expired()
+
+        job = ConversionJob(upload)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.logger.warning("Очередь фоновых задач заполнена",
+                                max_pending=self.max_pending)
+            raise QueueFullError(retry_after=max(1, self._queue.qsize() // self.workers))
+
+        self._jobs[job.job_id] = job
+        self.logger.info("Задача поставлена в очередь",
+                         job_id=job.job_id,
+                         filename=upload.filename,
+                         file_size=upload.size)
+        return job
+
+    def get(self, job_id: str) -> Optional[ConversionJob]:
+        """
+        Возвращает задачу по идентификатору
+
+        Args:
+            job_id: Идентификатор задачи
+
+        Returns:
+            Задача или None, если она не найдена или устарела
+        """
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    async def _worker(self, worker_index: int) -> None:
+        """
+        Цикл обработчика: берет задачи из очереди и конвертирует их
+        """
+        while True:
+            job: ConversionJob = await self._queue.get()
+            job.status = ConversionJob.RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = await self._converter_service.convert_upload(job.upload)
+                job.result_size = await run_in_threadpool(_stored_size, job.result)
+                job.status = ConversionJob.DONE
+            except asyncio.CancelledError:
+                raise
+            except HTTPException as he:
+                job.status = ConversionJob.FAILED
+                job.error = str(he.detail)
+            except Exception as e:
+                job.status = ConversionJob.FAILED
+                job.error = f"{type(e).__name__}: {str(e)}"
+            finally:
+                job.upload.cleanup()
+                job.upload = None
+                job.finished_at = time.time()
+                self._queue.task_done()
+            self._stored_bytes += job.result_size
+            self._enforce_limits(keep=job.job_id)
+
+            self.logger.info("Задача завершена",
+                             job_id=job.job_id,
+                             worker=worker_index,
+                             status=job.status,
+                             duration=round(job.finished_at - job.started_at, 3))
+
+    def _purge_expired(self) -> None:
+        """
+        Удаляет завершенные задачи, срок хранения которых истек
+        """
+        deadline = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < deadline
+        ]
+        for job_id in expired:
+            self._remove(job_id)
+        if expired:
+            self.logger.debug("Удалены устаревшие задачи", count=len(expired))
+
+    def _enforce_limits(self, keep: str) -> None:
+        """
+        Удаляет самые старые завершенные задачи, пока число задач
+        и объем результатов превышают лимиты
+
+        Args:
+            keep: Только что завершенная задача, которая не удаляется,
+                даже если ее результат один превышает лимит
+        """
+        removed = 0
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job_id != keep]:
+            if len(self._jobs) <= self.max_stored and self._stored_bytes <= self.max_stored_bytes:
+                break
+            self._remove(job_id)
+            removed += 1
+        if removed:
+            self.logger.info("Удалены старые задачи сверх лимита хранения",
+                             count=removed,
+                             stored=len(self._jobs),
+                             stored_bytes=self._stored_bytes)
+
+    def _remove(self, job_id: str) -> None:
+        job = self._jobs.pop(job_id)
+        self._stored_bytes -= job.result_size
+
+
+def _stored_size(result: ConversionResult) -> int:
+    """
+    Оценка памяти, которую результат задачи занимает до ее удаления
+
+    Полный HTML документ, разделы и анализ стилей вычисляются лениво при
+    первом чтении /result или /sections и остаются в результате, поэтому
+    они вычисляются сразу и учитываются вместе с html_content и всеми
+    предупреждениями
+    """
+    return estimate_size(dict(result)) + estimate_size(result.all_warnings)
+
+
+def _get_web_concurrency() -> int:
+    """Число процессов uvicorn по WEB_CONCURRENCY (значение --workers по умолчанию)"""
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """
+    Получить общий для процесса менеджер фоновых задач
+
+    Returns:
+        Экземпляр JobManager, настроенный из Settings
+    """
+    global _job_manager
+    if _job_manager is None:
+        settings = get_settings()
+        _job_manager = JobManager(
+            workers=settings.job_workers,
+            max_pending=settings.job_max_pending,
+            ttl_seconds=settings.job_ttl_seconds,
+            max_stored=settings.job_max_stored,
+            max_stored_bytes=settings.job_max_stored_bytes
+        )
+    return _job_manager
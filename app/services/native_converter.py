@@ -0,0 +1,574 @@
+import posixpath
+import zipfile
+import mammoth
+import mammoth.conversion
+import mammoth.documents
+import mammoth.options
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+from app.models.document_transformer import DocumentTransformer
+from app.utils.docx_source import DocxSource, open_source
+from app.utils.logger import get_logger
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PR = "http://schemas.openxmlformats.org/package/2006/relationships"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+# Префиксы, под которыми Mammoth называет элементы в предупреждениях
+NAMESPACE_PREFIXES = {
+    W: "w",
+    "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing": "wp",
+    "http://schemas.openxmlformats.org/drawingml/2006/main": "a",
+    "http://schemas.openxmlformats.org/drawingml/2006/picture": "pic",
+    R: "r",
+    "urn:schemas-microsoft-com:vml": "v",
+    MC: "mc",
+    "urn:schemas-microsoft-com:office:word": "office-word",
+}
+
+# Элементы, которые Mammoth пропускает без предупреждения
+IGNORED_ELEMENTS = frozenset(f"{{{W}}}{name}" for name in (
+    "annotationRef", "bookmarkEnd", "sectPr", "proofErr", "lastRenderedPageBreak",
+    "commentRangeStart", "commentRangeEnd", "del", "footnoteRef", "endnoteRef",
+    "pPr", "rPr", "tblPr", "tblGrid", "trPr", "tcPr",
+)) | {"{urn:schemas-microsoft-com:office:word}wrap",
+      "{urn:schemas-microsoft-com:vml}shadow",
+      "{urn:schemas-microsoft-com:vml}shapetype"}
+
+# Конструкции, которые Mammoth обрабатывает, а нативный движок - нет:
+# таблицы, изображения, поля, символы, сноски и комментарии
+UNSUPPORTED_ELEMENTS = frozenset(f"{{{W}}}{name}" for name in (
+    "tbl", "tr", "tc", "fldChar", "instrText", "sym", "object", "drawing", "pict",
+    "txbxContent", "footnoteReference", "endnoteReference", "commentReference",
+)) | frozenset(f"{{urn:schemas-microsoft-com:vml}}{name}" for name in (
+    "group", "rect", "roundrect", "shape", "textbox", "imagedata",
+)) | frozenset(f"{{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}}{name}"
+               for name in ("inline", "anchor"))
+
+
+def _w(name: str) -> str:
+    return f"{{{W}}}{name}"
+
+
+def _val(element: Optional[ElementTree.Element], name: str = "val") -> Optional[str]:
+    if element is None:
+        return None
+    return element.get(_w(name))
+
+
+def _is_on(element: Optional[ElementTree.Element]) -> bool:
+    return element is not None and element.get(_w("val")) not in ("false", "0")
+
+
+def _display_name(tag: str) -> str:
+    """Имя элемента в том виде, в каком его выводит Mammoth"""
+    if tag.startswith("{"):
+        uri, local = tag[1:].split("}", 1)
+        prefix = NAMESPACE_PREFIXES.get(uri)
+        return f"{prefix}:{local}" if prefix else tag
+    return tag
+
+
+def _has_entry(docx: zipfile.ZipFile, name: str) -> bool:
+    try:
+        docx.getinfo(name)
+        return True
+    except KeyError:
+        return False
+
+
+def read_relationships(docx: zipfile.ZipFile, path: str) -> List[Dict[str, str]]:
+    """Связи части документа (пустой список, если файла связей нет)"""
+    if not _has_entry(docx, path):
+        return []
+    root = ElementTree.fromstring(docx.read(path))
+    return [
+        {"id": rel.get("Id"), "target": rel.get("Target"), "type": rel.get("Type")}
+        for rel in root.iter(f"{{{PR}}}Relationship")
+    ]
+
+
+def find_part(
+    docx: zipfile.ZipFile,
+    relationships: List[Dict[str, str]],
+    relationship_type: str,
+    base_path: str,
+    fallback_path: str
+) -> str:
+    """
+    Путь к части документа по связям, как его ищет Mammoth
+    """
+    for rel in relationships:
+        if rel["type"] == REL_TYPE + relationship_type:
+            target = posixpath.join(base_path, rel["target"]).lstrip("/")
+            if _has_entry(docx, target):
+                return target
+    return fallback_path
+
+
+def find_document_part(docx: zipfile.ZipFile) -> str:
+    """
+    Путь к основной части документа (обычно word/document.xml)
+    """
+    return find_part(
+        docx, read_relationships(docx, "_rels/.rels"), "officeDocument", "", "word/document.xml"
+    )
+
+
+def find_styles_part(docx: zipfile.ZipFile, document_path: str) -> str:
+    """
+    Путь к стилям документа (обычно word/styles.xml)
+    """
+    base_path, document_name = posixpath.split(document_path)
+    relationships = read_relationships(
+        docx, posixpath.join(base_path, "_rels", document_name + ".rels")
+    )
+    return find_part(docx, relationships, "styles", base_path, "word/styles.xml")
+
+
+def read_styles(docx: zipfile.ZipFile, path: str) -> Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]]:
+    """
+    Имена стилей параграфов и символов по идентификатору
+    (пустые словари, если части стилей нет)
+    """
+    paragraph_styles: Dict[str, Optional[str]] = {}
+    character_styles: Dict[str, Optional[str]] = {}
+    if not _has_entry(docx, path):
+        return paragraph_styles, character_styles
+    root = ElementTree.fromstring(docx.read(path))
+    for style in root.iter(_w("style")):
+        styles = {"paragraph": paragraph_styles, "character": character_styles}.get(
+            style.get(_w("type"))
+        )
+        if styles is not None:
+            styles[style.get(_w("styleId"))] = _val(style.find(_w("name")))
+    return paragraph_styles, character_styles
+
+
+class NativeUnsupported(Exception):
+    """
+    Документ содержит конструкцию, которую нативный движок не обрабатывает
+    """
+
+
+class NativeHtmlConverter:
+    """
+    Потоковый конвертер DOCX в HTML для текстовых документов.
+
+    word/document.xml читается инкрементально (ElementTree.iterparse):
+    каждый параграф верхнего уровня разбирается, трансформируется
+    тем же DocumentTransformer, переводится в HTML по той же карте стилей
+    и сразу удаляется из дерева, поэтому память не растет с размером
+    документа. Модель документа Mammoth строится только для одного
+    параграфа, а его HTML получается функцией Mammoth - результат и
+    предупреждения совпадают с полной конвертацией.
+
+    Таблицы, изображения, списки, поля, сноски и комментарии не
+    поддерживаются: при их обнаружении выбрасывается NativeUnsupported
+    и документ нужно конвертировать через Mammoth.
+    """
+
+    # Увеличивать при изменении логики чтения документа
+    VERSION = 1
+
+    def __init__(self, style_map: str, transformer: DocumentTransformer):
+        self.logger = get_logger(__name__)
+        self.transformer = transformer
+        options = mammoth.options.read_options({"style_map": style_map})
+        self.style_map = options.value["style_map"]
+        self.style_map_warnings = [m.message for m in options.messages if m.type == "warning"]
+        self.unsupported_reason = self._check_style_map()
+        self._handlers: Dict[str, Callable[..., List[Any]]] = {
+            _w("r"): self._read_run,
+            _w("t"): self._read_text,
+            _w("tab"): lambda element, context: [mammoth.documents.tab()],
+            _w("noBreakHyphen"): lambda element, context: [mammoth.documents.text("\u2011")],
+            _w("softHyphen"): lambda element, context: [mammoth.documents.text("\u00ad")],
+            _w("br"): self._read_break,
+            _w("ins"): self._read_children,
+            _w("smartTag"): self._read_children,
+            _w("sdt"): self._read_sdt,
+            _w("hyperlink"): self._read_hyperlink,
+            _w("bookmarkStart"): self._read_bookmark,
+            f"{{{MC}}}AlternateContent": self._read_alternate_content,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Совместима ли карта стилей с нативным движком"""
+        return self.unsupported_reason is None
+
+    def convert(
+        self,
+        source: DocxSource,
+        max_blocks: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Конвертирует документ целиком или его начало (превью)
+
+        Args:
+            source: Байты DOCX файла, путь к нему или открытый файл
+            max_blocks: Остановиться после N элементов верхнего уровня w:body
+            max_bytes: Остановиться, когда HTML достигнет N байт
+
+        Returns:
+            Dict с HTML и списками предупреждений и ошибок, как у Mammoth,
+            и признаком truncated (документ прочитан не полностью)
+
+        Raises:
+            NativeUnsupported: Документ нужно конвертировать через Mammoth
+        """
+        report: Dict[str, Any] = {}
+        html_content = "".join(self.iter_html(source, report, max_blocks, max_bytes))
+        return {
+            "html_content": html_content,
+            "warnings": report["warnings"],
+            "errors": [],
+            "truncated": report["truncated"]
+        }
+
+    def iter_html(
+        self,
+        source: DocxSource,
+        report: Dict[str, Any],
+        max_blocks: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Выдает HTML по мере чтения документа, по одному параграфу
+
+        При заданных лимитах разбор останавливается, как только они
+        достигнуты: остаток word/document.xml не читается.
+
+        Args:
+            source: Байты DOCX файла, путь к нему или открытый файл
+            report: Словарь, в который после выдачи последнего фрагмента
+                записываются warnings и truncated
+            max_blocks: Остановиться после N элементов верхнего уровня w:body
+            max_bytes: Остановиться, когда HTML достигнет N байт
+
+        Raises:
+            NativeUnsupported: Документ нужно конвертировать через Mammoth;
+                может быть выброшено после выдачи части HTML
+        """
+        if not self.enabled:
+            raise NativeUnsupported(self.unsupported_reason)
+
+        blocks = 0
+        emitted = 0
+        truncated = False
+
+        def limit_reached() -> bool:
+            nonlocal truncated
+            truncated = (
+                (max_blocks is not None and blocks >= max_blocks)
+                or (max_bytes is not None and emitted >= max_bytes)
+            )
+            return truncated
+
+        with open_source(source) as file_like, zipfile.ZipFile(file_like) as docx:
+            context = self._open_document(docx)
+            read_messages: List[str] = []
+            conversion_messages: List[str] = []
+            context["messages"] = read_messages
+
+            with docx.open(context["document_path"]) as document_xml:
+                for element in self._iter_body(document_xml, limit_reached):
+                    blocks += 1
+                    for paragraph in self._read_body_element(element, context):
+                        result = mammoth.conversion.convert_document_element_to_html(
+                            self.transformer.transform_paragraph(paragraph),
+                            style_map=self.style_map,
+                            output_format="html"
+                        )
+                        conversion_messages.extend(
+                            m.message for m in result.messages if m.type == "warning"
+                        )
+                        if result.value:
+                            if max_bytes is not None:
+                                emitted += len(result.value.encode("utf-8"))
+                            yield result.value
+
+        # Mammoth отдает предупреждения чтения перед предупреждениями конвертации
+        # и убирает повторы
+        report["warnings"] = list(dict.fromkeys(
+            self.style_map_warnings + read_messages + conversion_messages
+        ))
+        report["truncated"] = truncated
+
+    def _check_style_map(self) -> Optional[str]:
+        """
+        Проверяет, что соседние параграфы никогда не объединяются
+        (Mammoth схлопывает одинаковые элементы без :fresh), иначе
+        HTML нельзя выдавать по одному параграфу
+        """
+        for style in self.style_map:
+            matcher = style.document_matcher
+            if getattr(matcher, "element_type", None) != "paragraph" or matcher.numbering is not None:
+                continue
+            elements = getattr(style.html_path, "elements", None)
+            if elements is None:
+                # Параграф игнорируется (=> !)
+                continue
+            if not elements or elements[0].tag.collapsible:
+                return f"Карта стилей объединяет параграфы: {matcher}"
+        return None
+
+    def _open_document(self, docx: zipfile.ZipFile) -> Dict[str, Any]:
+        """
+        Находит части документа и читает стили, нумерацию и связи
+        """
+        names = set(docx.namelist())
+        if "mammoth/style-map" in names:
+            raise NativeUnsupported("Встроенная карта стилей")
+
+        document_path = find_document_part(docx)
+        if document_path not in names:
+            raise NativeUnsupported("Основная часть документа не найдена")
+
+        base_path, document_name = posixpath.split(document_path)
+        relationships = read_relationships(
+            docx, posixpath.join(base_path, "_rels", document_name + ".rels")
+        )
+
+        def find(name: str) -> str:
+            return find_part(docx, relationships, name, base_path, f"word/{name}.xml")
+
+        for part, note_tag in (("footnotes", "footnote"), ("endnotes", "endnote")):
+            path = find(part)
+            if path in names and self._has_notes(docx, path, _w(note_tag)):
+                raise NativeUnsupported(f"Документ содержит {part}")
+        path = find("comments")
+        if path in names and self._has_notes(docx, path, _w("comment")):
+            raise NativeUnsupported("Документ содержит comments")
+
+        paragraph_styles, character_styles = read_styles(docx, find("styles"))
+
+        numbered_styles = set()
+        path = find("numbering")
+        if path in names:
+            root = ElementTree.fromstring(docx.read(path))
+            for level in root.iter(_w("lvl")):
+                style_id = _val(level.find(_w("pStyle")))
+                if style_id is not None:
+                    numbered_styles.add(style_id)
+
+        return {
+            "document_path": document_path,
+            "relationship_targets": {rel["id"]: rel["target"] for rel in relationships},
+            "paragraph_styles": paragraph_styles,
+            "character_styles": character_styles,
+            "numbered_styles": numbered_styles,
+            "deleted_children": []
+        }
+
+    @staticmethod
+    def _has_notes(docx: zipfile.ZipFile, path: str, tag: str) -> bool:
+        """Есть ли в части сноски или комментарии, кроме разделителей"""
+        with docx.open(path) as part:
+            for _, element in ElementTree.iterparse(part):
+                if element.tag == tag and element.get(_w("type")) not in ("separator", "continuationSeparator"):
+                    return True
+        return False
+
+    def _iter_body(
+        self,
+        document_xml,
+        stop: Callable[[], bool]
+    ) -> Iterator[ElementTree.Element]:
+        """
+        Выдает элементы верхнего уровня w:body по мере разбора
+        и удаляет их из дерева после обработки
+
+        Args:
+            document_xml: Поток word/document.xml
+            stop: Проверяется перед каждым элементом верхнего уровня;
+                True завершает разбор
+        """
+        depth = 0
+        body = None
+        for event, element in ElementTree.iterparse(document_xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 1 and element.tag != _w("document"):
+                    raise NativeUnsupported(f"Неподдерживаемый корневой элемент: {element.tag}")
+                if depth == 2 and element.tag == _w("body"):
+                    body = element
+                if depth == 3 and body is not None and stop():
+                    return
+                # Таблицу или рисунок не нужно дочитывать до конца, чтобы отказаться
+                if element.tag in UNSUPPORTED_ELEMENTS:
+                    raise NativeUnsupported(f"Элемент {_display_name(element.tag)}")
+                continue
+            depth -= 1
+            if depth == 2 and body is not None:
+                yield element
+                body.remove(element)
+
+    def _read_body_element(self, element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        """
+        Читает элемент верхнего уровня и возвращает готовые параграфы
+        """
+        tag = element.tag
+        if tag == _w("p"):
+            paragraph = self._read_paragraph(element, context)
+            return [] if paragraph is None else [paragraph]
+        if tag == _w("sdt"):
+            content = element.find(_w("sdtContent"))
+            return self._read_body_children(content, context)
+        if tag == f"{{{MC}}}AlternateContent":
+            return self._read_body_children(element.find(f"{{{MC}}}Fallback"), context)
+        if tag in self._handlers or tag in UNSUPPORTED_ELEMENTS:
+            raise NativeUnsupported(f"Элемент верхнего уровня {_display_name(tag)}")
+        if tag not in IGNORED_ELEMENTS:
+            context["messages"].append(f"An unrecognised element was ignored: {_display_name(tag)}")
+        return []
+
+    def _read_body_children(self, element: Optional[ElementTree.Element], context: Dict[str, Any]) -> List[Any]:
+        if element is None:
+            return []
+        return [p for child in element for p in self._read_body_element(child, context)]
+
+    def _read_paragraph(self, element: ElementTree.Element, context: Dict[str, Any]):
+        properties = element.find(_w("pPr"))
+        if properties is None:
+            properties = ElementTree.Element(_w("pPr"))
+
+        run_properties = properties.find(_w("rPr"))
+        if run_properties is not None and run_properties.find(_w("del")) is not None:
+            # Содержимое удаленного параграфа переносится в следующий
+            context["deleted_children"].extend(element)
+            return None
+
+        if properties.find(_w("numPr")) is not None:
+            raise NativeUnsupported("Нумерованный список")
+
+        style_id, style_name = self._read_style(
+            properties, "pStyle", "Paragraph", context["paragraph_styles"], context
+        )
+        if style_id is not None and style_id in context["numbered_styles"]:
+            raise NativeUnsupported("Нумерованный список")
+
+        children_xml = list(element)
+        if context["deleted_children"]:
+            children_xml = context["deleted_children"] + children_xml
+            context["deleted_children"] = []
+
+        indent = properties.find(_w("ind"))
+        return mammoth.documents.paragraph(
+            children=self._read_all(children_xml, context),
+            style_id=style_id,
+            style_name=style_name,
+            alignment=_val(properties.find(_w("jc"))),
+            indent=mammoth.documents.paragraph_indent(
+                start=_val(indent, "start") or _val(indent, "left"),
+                end=_val(indent, "end") or _val(indent, "right"),
+                first_line=_val(indent, "firstLine"),
+                hanging=_val(indent, "hanging"),
+            )
+        )
+
+    @staticmethod
+    def _read_style(properties, tag: str, style_type: str, styles: Dict[str, Optional[str]], context):
+        style_id = _val(properties.find(_w(tag))) if properties is not None else None
+        if style_id is None:
+            return None, None
+        if style_id not in styles:
+            context["messages"].append(
+                f"{style_type} style with ID {style_id} was referenced but not defined in the document"
+            )
+            return style_id, None
+        return style_id, styles[style_id]
+
+    def _read_all(self, elements, context: Dict[str, Any]) -> List[Any]:
+        result = []
+        for element in elements:
+            handler = self._handlers.get(element.tag)
+            if handler is not None:
+                result.extend(handler(element, context))
+            elif element.tag in UNSUPPORTED_ELEMENTS or element.tag == _w("p"):
+                raise NativeUnsupported(f"Элемент {_display_name(element.tag)}")
+            elif element.tag not in IGNORED_ELEMENTS:
+                context["messages"].append(
+                    f"An unrecognised element was ignored: {_display_name(element.tag)}"
+                )
+        return result
+
+    def _read_children(self, element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        return self._read_all(element, context)
+
+    def _read_run(self, element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        properties = element.find(_w("rPr"))
+        if properties is None:
+            properties = ElementTree.Element(_w("rPr"))
+        style_id, style_name = self._read_style(
+            properties, "rStyle", "Run", context["character_styles"], context
+        )
+        font_size = _val(properties.find(_w("sz")))
+        underline = _val(properties.find(_w("u")))
+        return [mammoth.documents.run(
+            children=self._read_all(element, context),
+            style_id=style_id,
+            style_name=style_name,
+            is_bold=_is_on(properties.find(_w("b"))),
+            is_italic=_is_on(properties.find(_w("i"))),
+            is_underline=properties.find(_w("u")) is not None
+                and underline not in (None, "false", "0", "none"),
+            is_strikethrough=_is_on(properties.find(_w("strike"))),
+            is_all_caps=_is_on(properties.find(_w("caps"))),
+            is_small_caps=_is_on(properties.find(_w("smallCaps"))),
+            vertical_alignment=_val(properties.find(_w("vertAlign"))),
+            font=_val(properties.find(_w("rFonts")), "ascii"),
+            font_size=int(font_size) / 2 if font_size and font_size.lstrip("-").isdigit() else None,
+        )]
+
+    @staticmethod
+    def _read_text(element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        return [mammoth.documents.text("".join(element.itertext()))]
+
+    @staticmethod
+    def _read_break(element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        break_type = element.get(_w("type"))
+        if not break_type or break_type == "textWrapping":
+            return [mammoth.documents.line_break]
+        if break_type == "page":
+            return [mammoth.documents.page_break]
+        if break_type == "column":
+            return [mammoth.documents.column_break]
+        context["messages"].append(f"Unsupported break type: {break_type}")
+        return []
+
+    def _read_sdt(self, element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        content = element.find(_w("sdtContent"))
+        return [] if content is None else self._read_all(content, context)
+
+    def _read_alternate_content(self, element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        fallback = element.find(f"{{{MC}}}Fallback")
+        return [] if fallback is None else self._read_all(fallback, context)
+
+    def _read_hyperlink(self, element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        relationship_id = element.get(f"{{{R}}}id")
+        anchor = element.get(_w("anchor"))
+        target_frame = element.get(_w("tgtFrame")) or None
+        children = self._read_all(element, context)
+
+        if relationship_id is not None:
+            href = context["relationship_targets"].get(relationship_id)
+            if href is None:
+                raise NativeUnsupported(f"Связь {relationship_id} не найдена")
+            if anchor is not None:
+                href = href.split("#", 1)[0] + "#" + anchor
+            return [mammoth.documents.hyperlink(children=children, href=href, target_frame=target_frame)]
+        if anchor is not None:
+            return [mammoth.documents.hyperlink(children=children, anchor=anchor, target_frame=target_frame)]
+        return children
+
+    @staticmethod
+    def _read_bookmark(element: ElementTree.Element, context: Dict[str, Any]) -> List[Any]:
+        name = element.get(_w("name"))
+        if name == "_GoBack":
+            return []
+        return [mammoth.documents.bookmark(name)]
@@ -0,0 +1,470 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from app.models.conversion_options import ConversionOptions
+from app.services.converter_service import convert_docx_content
+from app.utils.logger import get_logger
+
+MANIFEST_NAME = "manifest.json"
+# Версия 2: результат - HTML без обрамления <html>/<body>, как complete_html в API
+MANIFEST_VERSION = 2
+
+
+def _default_file_mode() -> int:
+    """
+    Права нового файла с учетом umask процесса (как у open)
+
+    umask нельзя прочитать, не изменив, поэтому значение читается
+    один раз при импорте, до запуска потоков
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# mkstemp создает файлы с правами 0600; результат получает обычные права
+FILE_MODE = _default_file_mode()
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Записывает файл атомарно: временный файл в том же каталоге + os.replace,
+    поэтому читатели никогда не видят частично записанный результат
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), FILE_MODE)
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def hash_file(path: str) -> str:
+    """
+    SHA-256 содержимого файла
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def convert_to_file(
+    source_path: str,
+    output_path: str,
+    options: Optional[ConversionOptions] = None
+) -> Dict[str, Any]:
+    """
+    Точка входа для процессов пула: конвертирует DOCX и атомарно
+    записывает HTML - тот же, что complete_html в ответе API и файл
+    режима output=write у /convert/path.
+
+    HTML не передается обратно в родительский процесс - возвращаются
+    только хэш, счетчики и время.
+
+    Args:
+        source_path: Путь к DOCX файлу
+        output_path: Путь к результату
+        options: Параметры конвертации
+
+    Returns:
+        Словарь с хэшем исходного файла, счетчиками и временем конвертации
+    """
+    started = time.monotonic()
+    with open(source_path, "rb") as f:
+        content = f.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+
+    conversion = convert_docx_content(content, options)
+    write_atomic(output_path, conversion["html_content"].encode("utf-8"))
+
+    return {
+        "sha256": content_hash,
+        "size": len(content),
+        "warnings_count": len(conversion["warnings"]),
+        "errors_count": len(conversion["errors"]),
+        "duration_ms": round((time.monotonic() - started) * 1000, 1)
+    }
+
+
+class ConversionManifest:
+    """
+    Манифест обработанных файлов: хэш, размер и mtime исходника,
+    путь к результату и статус.
+
+    По манифесту прерванный запуск продолжается с места остановки,
+    а неизмененные файлы не конвертируются повторно. Файл манифеста
+    записывается атомарно.
+    """
+
+    def __init__(self, path: str):
+        self.logger = get_logger(__name__)
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+
+    def update(self, key: str, entry: Dict[str, Any]) -> None:
+        self.entries[key] = entry
+        self._dirty = True
+
+    def remove(self, key: str) -> None:
+        if self.entries.pop(key, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        Сохраняет манифест, если он изменился
+        """
+        if not self._dirty:
+            return
+        data = json.dumps(
+            {"version": MANIFEST_VERSION, "files": self.entries},
+            ensure_ascii=False, indent=1, sort_keys=True
+        ).encode("utf-8")
+        write_atomic(self.path, data)
+        self._dirty = False
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning("Манифест поврежден, обработка начнется заново",
+                                path=self.path,
+                                error_message=str(e))
+            self.entries = {}
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            # Результаты прежней версии записаны в другом формате
+            self.logger.info("Манифест другой версии, файлы будут сконвертированы заново",
+                             path=self.path,
+                             version=data.get("version"))
+            return
+        self.entries = data.get("files", {})
+
+
+class ConversionReport:
+    """
+    Итоги запуска: счетчики, объем, пропускная способность и время по файлам
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.converted = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.timings: List[Tuple[str, float]] = []
+
+    def add(self, key: str, entry: Dict[str, Any]) -> None:
+        if entry["status"] == "ok":
+            self.converted += 1
+            self.bytes += entry["size"]
+        else:
+            self.failed += 1
+        self.timings.append((key, entry["duration_ms"]))
+
+    def summary(self, slowest: int = 10) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        durations = sorted(duration for _, duration in self.timings)
+        return {
+            "converted": self.converted,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(len(self.timings) / elapsed, 2) if elapsed else None,
+            "megabytes_per_second": round(self.bytes / elapsed / 1024 / 1024, 2) if elapsed else None,
+            "median_ms": durations[len(durations) // 2] if durations else None,
+            "max_ms": durations[-1] if durations else None,
+            "slowest": [
+                {"file": key, "duration_ms": duration}
+                for key, duration in sorted(self.timings, key=lambda t: -t[1])[:slowest]
+            ],
+            "timings": [
+                {"file": key, "duration_ms": duration} for key, duration in self.timings
+            ]
+        }
+
+
+class OfflineConverter:
+    """
+    Конвертация дерева каталогов без HTTP.
+
+    Файлы конвертируются в пуле процессов той же функцией, что использует
+    API (convert_docx_content), поэтому карта стилей и трансформер совпадают.
+    Результаты пишутся в output_dir с сохранением структуры каталогов.
+    """
+
+    def __init__(
+        self,
+        input_dir: str,
+        output_dir: str,
+        manifest_path: Optional[str] = None,
+        options: Optional[ConversionOptions] = None,
+        save_every: int = 20,
+        retry_failed: bool = False
+    ):
+        self.logger = get_logger(__name__)
+        self.input_dir = os.path.abspath(input_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.manifest = ConversionManifest(
+            manifest_path or os.path.join(self.output_dir, MANIFEST_NAME)
+        )
+        self.options = options
+        self.save_every = max(1, save_every)
+        self.retry_failed = retry_failed
+        # Неудачные попытки в этом процессе: (ключ, размер, mtime); при
+        # retry_failed файл с ошибкой повторяется один раз на каждую
+        # версию, а не на каждом проходе наблюдения
+        self._failed_attempts: Set[Tuple[str, int, float]] = set()
+        # Подкаталоги, не прочитанные при последнем обходе (scan)
+        self.unlisted_dirs: List[str] = []
+
+    def scan(self) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """
+        Обходит дерево и возвращает (ключ, путь, stat) для DOCX файлов;
+        ключ - путь относительно input_dir
+
+        Подкаталоги, которые не удалось прочитать, пропускаются и
+        запоминаются в unlisted_dirs (пути относительно input_dir):
+        их файлы нельзя считать удаленными.
+
+        Raises:
+            OSError: Не удалось прочитать сам input_dir (например, том
+                отмонтирован или каталог переименован)
+        """
+        self.unlisted_dirs = []
+        stack = [self.input_dir]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                if directory == self.input_dir:
+                    raise
+                self.logger.warning("Каталог недоступен", path=directory, error_message=str(e))
+                self.unlisted_dirs.append(
+                    os.path.relpath(directory, self.input_dir).replace(os.sep, "/")
+                )
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.abspath(entry.path) != self.output_dir:
+                        stack.append(entry.path)
+                    continue
+                name = entry.name
+                # ~$ - файлы блокировки Word
+                if not name.lower().endswith(".docx") or name.startswith("~$"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                key = os.path.relpath(entry.path, self.input_dir).replace(os.sep, "/")
+                yield key, entry.path, stat
+
+    def is_unlisted(self, key: str) -> bool:
+        """
+        Находится ли файл в подкаталоге, который не удалось прочитать
+        при последнем обходе
+        """
+        return any(key.startswith(directory + "/") for directory in self.unlisted_dirs)
+
+    def output_path(self, key: str) -> str:
+        return os.path.join(self.output_dir, os.path.splitext(key)[0] + ".html")
+
+    def remove_output(self, key: str) -> None:
+        """
+        Удаляет результат исходного файла, которого больше нет, и его
+        запись из манифеста
+        """
+        entry = self.manifest.get(key)
+        if entry is None:
+            return
+        output = entry.get("output")
+        if output:
+            try:
+                os.remove(os.path.join(self.output_dir, output))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning("Не удалось удалить результат",
+                                    file=key,
+                                    error_message=str(e))
+                return
+        self.manifest.remove(key)
+
+    def is_current(self, key: str, path: str, stat: os.stat_result) -> bool:
+        """
+        Проверяет, что файл уже сконвертирован и не изменился.
+
+        Совпадение размера и mtime считается достаточным; при изменении
+        mtime сравнивается хэш, и копирование или touch без изменения
+        содержимого не приводит к повторной конвертации.
+        """
+        entry = self.manifest.get(key)
+        if entry is None:
+            return False
+        if entry.get("status") != "ok":
+            # Файл с ошибкой повторяется после изменения, а по запросу
+            # (retry_failed) - один раз для каждой версии файла
+            if entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+                return False
+            return (
+                not self.retry_failed
+                or (key, stat.st_size, stat.st_mtime) in self._failed_attempts
+            )
+        if not os.path.exists(self.output_path(key)):
+            return False
+        if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return True
+        if entry["size"] != stat.st_size:
+            return False
+        try:
+            unchanged = hash_file(path) == entry["sha256"]
+        except OSError:
+            return False
+        if unchanged:
+            entry["mtime"] = stat.st_mtime
+            self.manifest.update(key, entry)
+        return unchanged
+
+    def convert(
+        self,
+        executor: ProcessPoolExecutor,
+        items: List[Tuple[str, str, os.stat_result]],
+        report: ConversionReport,
+        max_pending: int
+    ) -> None:
+        """
+        Конвертирует файлы в пуле, обновляя манифест по мере завершения
+
+        Args:
+            executor: Пул процессов
+            items: Файлы для конвертации (ключ, путь, stat)
+            report: Отчет, в который добавляются результаты
+            max_pending: Максимум задач, одновременно переданных в пул
+        """
+        pending: Dict[Future, Tuple[str, os.stat_result]] = {}
+        queue = iter(items)
+        completed = 0
+
+        def schedule() -> None:
+            while len(pending) < max_pending:
+                item = next(queue, None)
+                if item is None:
+                    return
+                key, path, stat = item
+                future = executor.submit(
+                    convert_to_file, path, self.output_path(key), self.options
+                )
+                pending[future] = (key, stat)
+
+        schedule()
+        try:
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, stat = pending.pop(future)
+                    entry = self._make_entry(key, stat, future)
+                    if entry["status"] != "ok":
+                        self._failed_attempts.add((key, stat.st_size, stat.st_mtime))
+                    self.manifest.update(key, entry)
+                    report.add(key, entry)
+                    completed += 1
+                    if completed % self.save_every == 0:
+                        self.manifest.save()
+                schedule()
+        finally:
+            for future in pending:
+                future.cancel()
+            self.manifest.save()
+
+    def _make_entry(self, key: str, stat: os.stat_result, future: Future) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "output": os.path.relpath(self.output_path(key), self.output_dir).replace(os.sep, "/"),
+            "converted_at": time.time()
+        }
+        try:
+            entry.update(future.result())
+            entry["status"] = "ok"
+        except Exception as e:
+            self.logger.error("Ошибка конвертации файла",
+                              file=key,
+                              error_type=type(e).__name__,
+                              error_message=str(e))
+            entry.update({
+                "status": "failed",
+                "error": f"{type(e).__name__}: {str(e)}",
+                "duration_ms": 0.0
+            })
+        return entry
+
+    def find_changed(self) -> Tuple[List[Tuple[str, str, os.stat_result]], int]:
+        """
+        Обходит дерево и отбирает новые и измененные файлы
+
+        Returns:
+            Файлы для конвертации и число пропущенных неизмененных файлов
+        """
+        changed = []
+        skipped = 0
+        for key, path, stat in self.scan():
+            if self.is_current(key, path, stat):
+                skipped += 1
+            else:
+                changed.append((key, path, stat))
+        return changed, skipped
+
+    def run(self, executor: ProcessPoolExecutor, max_pending: int) -> ConversionReport:
+        """
+        Один проход по дереву: конвертирует новые и измененные файлы
+
+        Args:
+            executor: Пул процессов
+            max_pending: Максимум задач, одновременно переданных в пул
+
+        Returns:
+            Отчет о проходе
+        """
+        report = ConversionReport()
+        changed, report.skipped = self.find_changed()
+
+        self.logger.info("Обход дерева завершен",
+                         input_dir=self.input_dir,
+                         to_convert=len(changed),
+                         skipped=report.skipped)
+        self.convert(executor, changed, report, max_pending)
+        return report
+
+
+def create_executor(workers: int, start_method: str = "spawn") -> ProcessPoolExecutor:
+    """
+    Создает пул процессов для офлайн конвертации
+    """
+    return ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=multiprocessing.get_context(start_method)
+    )
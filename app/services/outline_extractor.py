@@ -0,0 +1,165 @@
+import re
+import zipfile
+import mammoth
+import mammoth.conversion
+import mammoth.documents
+import mammoth.options
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+from app.models.document_transformer import DocumentTransformer
+from app.models.style_mapper import StyleMapper
+from app.services.native_converter import _val, _w, find_document_part, find_styles_part, read_styles
+from app.services.text_extractor import TextExtractor
+from app.utils.docx_source import DocxSource, open_source
+
+_HEADING_PATTERN = re.compile(r"<h([1-6])[\s>]")
+
+
+class OutlineExtractor(TextExtractor):
+    """
+    Структура заголовков DOCX без конвертации в HTML.
+
+    Уровень заголовка определяется так же, как при конвертации:
+    параграф с идентификатором и именем стиля проходит через
+    DocumentTransformer.transform_paragraph и сопоставляется с той же
+    картой стилей Mammoth; заголовок - параграф, который стал h1-h6.
+    Результат сопоставления запоминается для каждой пары (id, имя) стиля.
+
+    word/document.xml читается потоково; текст читается только
+    у заголовков, изображения, нумерация, сноски и комментарии не читаются.
+    """
+
+    # Увеличивать при изменении логики построения структуры
+    VERSION = 1
+
+    def __init__(self, style_map: str, transformer: DocumentTransformer):
+        super().__init__()
+        self.transformer = transformer
+        self.style_map = mammoth.options.read_options({"style_map": style_map}).value["style_map"]
+        self._levels: Dict[Tuple[Optional[str], Optional[str]], Optional[int]] = {}
+
+    def extract_outline(self, source: DocxSource) -> Dict[str, Any]:
+        """
+        Читает заголовки документа
+
+        Args:
+            source: Байты DOCX файла, путь к нему или открытый файл
+
+        Returns:
+            Dict с заголовками (headings: level, text, block, paragraph),
+            числом элементов верхнего уровня w:body (blocks) и параграфов
+            (paragraphs); block - номер элемента верхнего уровня
+            (совпадает с нумерацией preview_blocks), paragraph - номер
+            параграфа в порядке документа, оба с нуля
+
+        Raises:
+            ValueError: Корневой элемент документа не w:document
+        """
+        with open_source(source) as file_like, zipfile.ZipFile(file_like) as docx:
+            document_path = find_document_part(docx)
+            paragraph_styles, _ = read_styles(docx, find_styles_part(docx, document_path))
+            context: Dict[str, Any] = {
+                "deleted_children": [],
+                "extra": None,
+                "paragraph_styles": paragraph_styles,
+                "headings": [],
+                "block": 0,
+                "paragraphs": 0
+            }
+            with docx.open(document_path) as document_xml:
+                for element in self._iter_body(document_xml):
+                    if element is None:
+                        raise ValueError("Неподдерживаемый корневой элемент документа")
+                    self._read(element, [], context)
+                    context["block"] += 1
+
+        return {
+            "headings": context["headings"],
+            "blocks": context["block"],
+            "paragraphs": context["paragraphs"]
+        }
+
+    def heading_level(self, style_id: Optional[str], style_name: Optional[str]) -> Optional[int]:
+        """
+        Уровень заголовка для стиля параграфа или None, если это не заголовок
+        """
+        key = (style_id, style_name)
+        if key not in self._levels:
+            paragraph = self.transformer.transform_paragraph(mammoth.documents.paragraph(
+                children=[mammoth.documents.text("-")],
+                style_id=style_id,
+                style_name=style_name
+            ))
+            result = mammoth.conversion.convert_document_element_to_html(
+                paragraph, style_map=self.style_map, output_format="html"
+            )
+            match = _HEADING_PATTERN.match(result.value)
+            self._levels[key] = int(match.group(1)) if match else None
+        return self._levels[key]
+
+    def _read_paragraph(self, element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        properties = element.find(_w("pPr"))
+        run_properties = properties.find(_w("rPr")) if properties is not None else None
+        if run_properties is not None and run_properties.find(_w("del")) is not None:
+            # Содержимое удаленного параграфа переносится в следующий
+            context["deleted_children"].extend(element)
+            return
+
+        children = list(element)
+        if context["deleted_children"]:
+            children = context["deleted_children"] + children
+            context["deleted_children"] = []
+
+        index = context["paragraphs"]
+        context["paragraphs"] += 1
+        style_id = _val(properties.find(_w("pStyle"))) if properties is not None else None
+        level = self.heading_level(style_id, context["paragraph_styles"].get(style_id))
+
+        # Заголовок добавляется до чтения содержимого: надписи внутри
+        # параграфа Mammoth выводит после него
+        headings = context["headings"]
+        position = len(headings)
+        if level is not None:
+            headings.append({"level": level, "text": "", "block": context["block"], "paragraph": index})
+
+        # Текст параграфа нужен только заголовку; вложенные параграфы
+        # (надписи) читаются всегда. Текст надписей в заголовок не входит
+        text: List[str] = []
+        outer_extra = context["extra"]
+        context["extra"] = []
+        try:
+            if level is not None:
+                self._read_all(children, text, context)
+            elif any(child.find(f".//{_w('p')}") is not None for child in children):
+                self._read_all(children, [], context)
+        finally:
+            context["extra"] = outer_extra
+
+        if level is not None:
+            title = "".join(text).strip()
+            if title:
+                headings[position]["text"] = title
+            else:
+                # Пустой заголовок не попадает в структуру
+                del headings[position]
+
+
+_worker_extractor: Optional[OutlineExtractor] = None
+
+
+def extract_docx_outline(source: DocxSource) -> Dict[str, Any]:
+    """
+    Точка входа для процессов пула: читает заголовки DOCX
+
+    Args:
+        source: Байты DOCX файла, путь к нему или открытый файл
+
+    Returns:
+        Dict со структурой заголовков, как OutlineExtractor.extract_outline
+    """
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = OutlineExtractor(
+            StyleMapper().create_style_mapping(), DocumentTransformer()
+        )
+    return _worker_extractor.extract_outline(source)
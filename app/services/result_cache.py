@@ -0,0 +1,177 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Приблизительный размер результата конвертации в байтах
+
+    Args:
+        value: Строка, байты, список или словарь из них
+
+    Returns:
+        Оценка размера в байтах
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    return 8
+
+
+class ResultCache:
+    """
+    LRU кэш результатов конвертации, ограниченный суммарным размером в байтах.
+
+    Ключ - SHA-256 содержимого DOCX файла и версия профиля конвертации,
+    поэтому изменение карты стилей или правил трансформации
+    автоматически делает старые записи недоступными.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.logger = get_logger(__name__)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(content_hash: str, profile_version: str) -> str:
+        """
+        Формирует ключ кэша
+
+        Args:
+            content_hash: SHA-256 содержимого файла (hex)
+            profile_version: Версия профиля конвертации
+
+        Returns:
+            Ключ записи кэша
+        """
+        return f"{content_hash}:{profile_version}"
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        """
+        Вычисляет SHA-256 содержимого файла
+
+        Args:
+            content: Байты файла
+
+        Returns:
+            Хэш в шестнадцатеричном виде
+        """
+        return hashlib.sha256(content).hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        """Кэш включен (ненулевой бюджет)"""
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Возвращает запись кэша и отмечает ее как недавно использованную
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            Значение или None при промахе
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Сохраняет запись, вытесняя самые старые при превышении бюджета
+
+        Args:
+            key: Ключ записи
+            value: Результат конвертации
+        """
+        if not self.enabled:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            self.logger.debug("Результат больше бюджета кэша, не сохраняется",
+                              size=size, max_bytes=self.max_bytes)
+            return
+
+        if key in self._entries:
+            self._current_bytes -= self._sizes.pop(key)
+            del self._entries[key]
+
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._current_bytes += size
+
+        while self._current_bytes > self.max_bytes:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._current_bytes -= self._sizes.pop(evicted_key)
+            self._evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает счетчики кэша
+
+        Returns:
+            Словарь со статистикой кэша
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self._current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions
+        }
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Получить общий для процесса кэш результатов
+
+    Returns:
+        Экземпляр ResultCache, настроенный из Settings
+    """
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(max_bytes=get_settings().cache_max_bytes)
+    return _result_cache
+
+
+_representation_cache: Optional[ResultCache] = None
+
+
+def get_representation_cache() -> ResultCache:
+    """
+    Получить кэш сжатых представлений ответов
+
+    Кэш работает, только если включен кэш результатов конвертации.
+
+    Returns:
+        Экземпляр ResultCache для сжатых тел ответов
+    """
+    global _representation_cache
+    if _representation_cache is None:
+        settings = get_settings()
+        max_bytes = settings.representation_cache_max_bytes if settings.cache_max_bytes > 0 else 0
+        _representation_cache = ResultCache(max_bytes=max_bytes)
+    return _representation_cache
@@ -0,0 +1,173 @@
+import hashlib
+import mmap
+import os
+import stat
+import tempfile
+from typing import Callable, List, Optional, Tuple
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.services.upload_ingestor import IngestedUpload
+from app.utils.logger import get_logger
+
+
+class SharedPathService:
+    """
+    Конвертация файлов с общего тома без загрузки по HTTP.
+
+    Доступ разрешен только к файлам внутри каталогов из списка
+    CONVERTER_SHARED_DIRS (после разрешения символических ссылок).
+    Хэш считается по отображению файла в память (mmap), а процесс пула
+    открывает файл по пути сам, поэтому содержимое не копируется
+    в память сервера; перед конвертацией процесс пула сверяет хэш
+    прочитанного содержимого (run_verified), так что файл, измененный
+    после приема, не попадает в кэш под прежним хэшем.
+    """
+
+    def __init__(self, allowed_dirs: List[str], max_size: int):
+        self.logger = get_logger(__name__)
+        self.allowed_dirs = [os.path.realpath(d) for d in allowed_dirs if d]
+        self.max_size = max_size
+
+    @property
+    def enabled(self) -> bool:
+        """Разрешен ли хотя бы один каталог"""
+        return bool(self.allowed_dirs)
+
+    def resolve(self, path: str) -> str:
+        """
+        Проверяет путь по списку разрешенных каталогов
+
+        Args:
+            path: Путь к DOCX файлу на общем томе
+
+        Returns:
+            Канонический путь к файлу
+
+        Raises:
+            HTTPException: 403 вне разрешенных каталогов, 404 если файла нет
+        """
+        if not self.enabled:
+            raise HTTPException(status_code=403, detail="Конвертация по пути отключена")
+
+        real_path = os.path.realpath(path)
+        if not any(self._is_within(real_path, d) for d in self.allowed_dirs):
+            self.logger.warning("Путь вне разрешенных каталогов", path=path)
+            raise HTTPException(status_code=403, detail="Путь вне разрешенных каталогов")
+
+        if not os.path.isfile(real_path):
+            raise HTTPException(status_code=404, detail="Файл не найден")
+
+        return real_path
+
+    async def ingest(
+        self,
+        path: str,
+        validate_filename: Optional[Callable[[str], None]] = None
+    ) -> IngestedUpload:
+        """
+        Принимает файл с общего тома без копирования содержимого
+
+        Args:
+            path: Путь к DOCX файлу
+            validate_filename: Проверка имени файла; вызывается до чтения
+                содержимого, чтобы не хэшировать файлы другого формата
+
+        Returns:
+            Принятый файл; cleanup() не удаляет исходный файл
+        """
+        real_path = self.resolve(path)
+        if validate_filename is not None:
+            validate_filename(os.path.basename(real_path))
+        # Размер проверяется до хэширования, чтобы не читать слишком большой файл
+        try:
+            stat_size = os.stat(real_path).st_size
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Файл не найден")
+        if stat_size > self.max_size:
+            raise self._too_large()
+        size, content_hash = await run_in_threadpool(self._hash_file, real_path)
+        if size > self.max_size:
+            # Файл вырос между проверкой размера и хэшированием
+            raise self._too_large()
+        return IngestedUpload(
+            filename=os.path.basename(real_path),
+            size=size,
+            content_hash=content_hash,
+            path=real_path,
+            owns_path=False
+        )
+
+    def write_output(self, source_path: str, content: str) -> str:
+        """
+        Атомарно записывает HTML рядом с исходным файлом
+
+        Права результата копируются с исходного файла (без битов
+        исполнения): mkstemp создает файл с правами 0600, и без этого
+        результат был бы недоступен другим пользователям общего тома.
+
+        Args:
+            source_path: Канонический путь к исходному файлу
+            content: HTML документ
+
+        Returns:
+            Путь к записанному файлу
+        """
+        output_path = os.path.splitext(source_path)[0] + ".html"
+        directory = os.path.dirname(output_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".html")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                os.fchmod(f.fileno(), stat.S_IMODE(os.stat(source_path).st_mode) & 0o666)
+                f.write(content)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return output_path
+
+    @staticmethod
+    def _is_within(path: str, directory: str) -> bool:
+        return os.path.commonpath([path, directory]) == directory
+
+    def _too_large(self) -> HTTPException:
+        """Ошибка 413 для файла больше max_size"""
+        return HTTPException(
+            status_code=413,
+            detail=f"Файл слишком большой (максимум {self.max_size} байт)"
+        )
+
+    @staticmethod
+    def _hash_file(path: str) -> Tuple[int, str]:
+        """
+        Возвращает размер и SHA-256 файла, читая его через mmap
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 0, hashlib.sha256().hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return size, hashlib.sha256(mapped).hexdigest()
+
+
+_shared_path_service: Optional[SharedPathService] = None
+
+
+def get_shared_path_service() -> SharedPathService:
+    """
+    Получить общий для процесса сервис конвертации по пути
+
+    Returns:
+        Экземпляр SharedPathService, настроенный из Settings
+    """
+    global _shared_path_service
+    if _shared_path_service is None:
+        settings = get_settings()
+        _shared_path_service = SharedPathService(
+            allowed_dirs=settings.shared_dirs,
+            max_size=settings.shared_max_file_size
+        )
+    return _shared_path_service
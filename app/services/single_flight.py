@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.utils.logger import get_logger
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых операций по ключу.
+
+    Первый вызов с ключом запускает операцию в отдельной задаче, остальные
+    ожидают ту же задачу. Ожидающие защищены asyncio.shield: отмена одного
+    из них (например, при разрыве соединения клиентом) не отменяет операцию
+    для остальных, а ее результат все равно попадает в кэш.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._started = 0
+        self._shared = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет операцию или присоединяется к уже выполняющейся
+
+        Args:
+            key: Ключ операции (например, ключ кэша)
+            func: Функция, создающая корутину операции
+
+        Returns:
+            Результат операции
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._in_flight[key] = task
+            self._started += 1
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        else:
+            self._shared += 1
+            self.logger.debug("Присоединение к выполняющейся конвертации", key=key)
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        """
+        Убирает завершенную операцию из реестра
+        """
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Забираем исключение, даже если все ожидающие уже отменены
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает счетчики объединения операций
+
+        Returns:
+            Словарь со статистикой
+        """
+        return {
+            "in_flight": len(self._in_flight),
+            "started": self._started,
+            "shared": self._shared
+        }
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Получить общий для процесса объединитель конвертаций
+
+    Returns:
+        Экземпляр SingleFlight
+    """
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,256 @@
+"""
+Регрессионные тесты NativeHtmlConverter: HTML и предупреждения нативного
+движка должны совпадать с mammoth.convert_to_html при той же карте стилей
+и том же DocumentTransformer, а неподдерживаемые конструкции - приводить
+к NativeUnsupported (документ конвертирует Mammoth)
+"""
+import io
+import zipfile
+import mammoth
+import pytest
+from app.models.document_transformer import DocumentTransformer
+from app.models.style_mapper import StyleMapper
+from app.services.native_converter import NativeHtmlConverter, NativeUnsupported
+
+NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml" '
+    'mc:Ignorable="w14"'
+)
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '<Relationship Id="rLink" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink" '
+    'Target="http://example.com/a?b=1&amp;c#x" TargetMode="External"/>'
+    '</Relationships>'
+)
+
+
+def _style(style_type: str, style_id: str, name: str) -> str:
+    return f'<w:style w:type="{style_type}" w:styleId="{style_id}"><w:name w:val="{name}"/></w:style>'
+
+
+STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:styles {NAMESPACES}>'
+    + _style("paragraph", "Heading1", "heading 1")
+    + _style("paragraph", "Heading2", "heading 2")
+    + _style("paragraph", "Body", "Body Text")
+    + _style("paragraph", "11", "None")
+    + _style("character", "Strong", "Strong")
+    + _style("character", "Custom", "Custom Char")
+    + '</w:styles>'
+)
+
+
+def make_docx(body: str) -> bytes:
+    """
+    Собирает минимальный DOCX с заданным содержимым w:body
+    """
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document {NAMESPACES}><w:body>{body}<w:sectPr/></w:body></w:document>'
+    )
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as docx:
+        docx.writestr("[Content_Types].xml", CONTENT_TYPES)
+        docx.writestr("_rels/.rels", PACKAGE_RELS)
+        docx.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+        docx.writestr("word/document.xml", document)
+        docx.writestr("word/styles.xml", STYLES)
+    return output.getvalue()
+
+
+def paragraph(content: str, style_id: str = None) -> str:
+    properties = f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ""
+    return f"<w:p>{properties}{content}</w:p>"
+
+
+def run(text: str, properties: str = "") -> str:
+    run_properties = f"<w:rPr>{properties}</w:rPr>" if properties else ""
+    return f'<w:r>{run_properties}<w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+@pytest.fixture(scope="module")
+def style_map() -> str:
+    return StyleMapper().create_style_mapping()
+
+
+@pytest.fixture(scope="module")
+def transformer() -> DocumentTransformer:
+    return DocumentTransformer()
+
+
+@pytest.fixture(scope="module")
+def native(style_map, transformer) -> NativeHtmlConverter:
+    return NativeHtmlConverter(style_map, transformer)
+
+
+def convert_with_mammoth(data: bytes, style_map: str, transformer: DocumentTransformer):
+    result = mammoth.convert_to_html(
+        io.BytesIO(data),
+        style_map=style_map,
+        **transformer.get_transform_options()
+    )
+    warnings = [m.message for m in result.messages if m.type == "warning"]
+    return result.value, warnings
+
+
+CASES = {
+    "runs": paragraph(
+        run("жирный курсив", "<w:b/><w:i/>")
+        + run(" жирный ", "<w:b/>")
+        + run("не жирный", '<w:b w:val="0"/>')
+        + run("x", '<w:vertAlign w:val="superscript"/>')
+        + run("2", '<w:vertAlign w:val="subscript"/>')
+        + run("&amp; &lt;зачеркнутый&gt; \"q\"", "<w:strike/>")
+        + run("подчеркнутый", '<w:u w:val="single"/>')
+        + run("без подчеркивания", '<w:u w:val="none"/>')
+        + run("капитель", "<w:smallCaps/><w:caps/>")
+        + '<w:r><w:t>a</w:t><w:tab/><w:t>b</w:t><w:br/><w:noBreakHyphen/><w:softHyphen/></w:r>'
+        + '<w:r><w:br w:type="page"/><w:br w:type="column"/><w:br w:type="unknown"/></w:r>'
+        + run("слитно", "<w:b/>") + run("слитно", "<w:b/>"),
+        "Body"
+    ),
+    "run_styles": paragraph(
+        run("strong", '<w:rStyle w:val="Strong"/>')
+        + run("custom", '<w:rStyle w:val="Custom"/>')
+    ),
+    "headings": (
+        paragraph(run("Глава &amp; &lt;1&gt;"), "Heading1")
+        + paragraph(run("Раздел 1.1"), "Heading2")
+        + paragraph(run("Стиль с id 11"), "11")
+        + paragraph(run("Без стиля"))
+        + paragraph("")
+        + paragraph(run(""), "Body")
+    ),
+    "hyperlinks": paragraph(
+        '<w:hyperlink r:id="rLink"><w:r><w:t>внешняя</w:t></w:r></w:hyperlink>'
+        '<w:hyperlink r:id="rLink" w:anchor="part"><w:r><w:t>с якорем</w:t></w:r></w:hyperlink>'
+        '<w:hyperlink w:anchor="bm1" w:tgtFrame="_blank"><w:r><w:t>закладка</w:t></w:r></w:hyperlink>'
+        '<w:hyperlink><w:r><w:t>без цели</w:t></w:r></w:hyperlink>'
+    ),
+    "bookmarks": paragraph(
+        '<w:bookmarkStart w:id="0" w:name="_GoBack"/><w:bookmarkEnd w:id="0"/>'
+        '<w:bookmarkStart w:id="1" w:name="bm1"/>' + run("текст") + '<w:bookmarkEnd w:id="1"/>'
+    ),
+    "ins_del": (
+        paragraph(
+            '<w:ins w:id="1"><w:r><w:t>вставка</w:t></w:r></w:ins>'
+            '<w:del w:id="2"><w:r><w:delText>удаление</w:delText></w:r></w:del>'
+            + run(" конец")
+        )
+        + '<w:p><w:pPr><w:rPr><w:del w:id="3"/></w:rPr></w:pPr>' + run("удаленный абзац ") + '</w:p>'
+        + paragraph(run("следующий"), "Heading1")
+    ),
+    "fld_simple": paragraph(
+        run("до ")
+        + '<w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple>'
+        + run(" после")
+    ),
+    "sdt": (
+        '<w:sdt><w:sdtPr/><w:sdtContent>' + paragraph(run("блок в sdt")) + '</w:sdtContent></w:sdt>'
+        + paragraph('<w:sdt><w:sdtContent>' + run("в строке") + '</w:sdtContent></w:sdt>')
+    ),
+    "alternate_content": (
+        '<mc:AlternateContent><mc:Choice Requires="w14">' + paragraph(run("choice"))
+        + '</mc:Choice><mc:Fallback>' + paragraph(run("fallback")) + '</mc:Fallback></mc:AlternateContent>'
+        + paragraph(
+            '<mc:AlternateContent><mc:Choice Requires="w14">' + run("choice")
+            + '</mc:Choice><mc:Fallback>' + run("fallback") + '</mc:Fallback></mc:AlternateContent>'
+        )
+    ),
+    "undefined_styles": (
+        paragraph(run("абзац"), "Missing")
+        + paragraph(run("run", '<w:rStyle w:val="MissingRun"/>'))
+    ),
+    "unrecognised_elements": (
+        '<w:customXml/>'
+        + paragraph('<w14:foo/><w:proofErr/>' + run("текст"))
+    ),
+}
+
+
+@pytest.mark.parametrize("body", CASES.values(), ids=CASES.keys())
+def test_matches_mammoth(body, native, style_map, transformer):
+    data = make_docx(body)
+    expected_html, expected_warnings = convert_with_mammoth(data, style_map, transformer)
+
+    result = native.convert(data)
+
+    assert result["html_content"] == expected_html
+    assert result["warnings"] == expected_warnings
+    assert result["errors"] == []
+    assert result["truncated"] is False
+
+
+def test_accepts_path_and_file(native, style_map, transformer, tmp_path):
+    data = make_docx(CASES["headings"])
+    path = tmp_path / "document.docx"
+    path.write_bytes(data)
+    expected_html, _ = convert_with_mammoth(data, style_map, transformer)
+
+    assert native.convert(str(path))["html_content"] == expected_html
+    with open(path, "rb") as f:
+        f.read(10)
+        assert native.convert(f)["html_content"] == expected_html
+
+
+def test_preview_is_prefix(native):
+    data = make_docx(CASES["headings"])
+    full = native.convert(data)["html_content"]
+
+    preview = native.convert(data, max_blocks=2)
+
+    assert preview["truncated"] is True
+    assert full.startswith(preview["html_content"])
+    assert preview["html_content"] != full
+
+
+@pytest.mark.parametrize("body", [
+    '<w:tbl><w:tr><w:tc>' + paragraph(run("ячейка")) + '</w:tc></w:tr></w:tbl>',
+    paragraph(run("до") + '<w:r><w:fldChar w:fldCharType="begin"/></w:r>'),
+    paragraph('<w:r><w:instrText> PAGE </w:instrText></w:r>'),
+    paragraph('<w:r><w:drawing/></w:r>'),
+    paragraph('<w:r><w:footnoteReference w:id="1"/></w:r>'),
+    paragraph(run("текст") + '<w:hyperlink r:id="rMissing"><w:r><w:t>x</w:t></w:r></w:hyperlink>'),
+    '<w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>'
+    + run("пункт") + '</w:p>',
+], ids=["table", "fld_char", "instr_text", "drawing", "footnote", "missing_relationship", "numbering"])
+def test_unsupported_elements_fall_back(body, native):
+    with pytest.raises(NativeUnsupported):
+        native.convert(make_docx(paragraph(run("начало")) + body))
+
+
+def test_collapsing_style_map_disables_engine(transformer):
+    # Без :fresh Mammoth объединяет соседние параграфы, по одному их выдавать нельзя
+    converter = NativeHtmlConverter("p[style-name='Body Text'] => p.body", transformer)
+
+    assert not converter.enabled
+    with pytest.raises(NativeUnsupported):
+        converter.convert(make_docx(CASES["headings"]))
@@ -0,0 +1,198 @@
+import re
+import zipfile
+import mammoth
+from mammoth.docx.dingbats import dingbats
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from xml.etree import ElementTree
+from app.services.native_converter import MC, _w, find_document_part
+from app.utils.docx_source import DocxSource, open_source
+
+
+class TextExtractor:
+    """
+    Потоковое извлечение простого текста из DOCX.
+
+    Результат совпадает с mammoth.extract_raw_text: текст параграфа,
+    затем два перевода строки; табуляция - "\\t". word/document.xml
+    читается инкрементально, модель документа, стили, нумерация,
+    изображения, сноски и комментарии не читаются, карта стилей и
+    трансформации не применяются, предупреждения не собираются.
+    """
+
+    # Увеличивать при изменении логики извлечения текста
+    VERSION = 1
+
+    def __init__(self):
+        self._handlers: Dict[str, Callable[[ElementTree.Element, List[str], Dict[str, Any]], None]] = {
+            _w("p"): self._read_paragraph,
+            _w("t"): self._read_text,
+            _w("tab"): lambda element, out, context: out.append("\t"),
+            _w("noBreakHyphen"): lambda element, out, context: out.append("\u2011"),
+            _w("softHyphen"): lambda element, out, context: out.append("\u00ad"),
+            _w("sym"): self._read_symbol,
+            _w("pict"): self._read_pict,
+            _w("sdt"): self._read_sdt,
+            f"{{{MC}}}AlternateContent": self._read_alternate_content,
+        }
+        # Элементы, текст которых Mammoth читает без изменений
+        for name in ("r", "ins", "object", "smartTag", "drawing", "txbxContent",
+                     "hyperlink", "tbl", "tr", "tc"):
+            self._handlers[_w(name)] = self._read_all
+        for name in ("group", "rect", "roundrect", "shape", "textbox"):
+            self._handlers[f"{{urn:schemas-microsoft-com:vml}}{name}"] = self._read_all
+
+    def extract(self, source: DocxSource) -> str:
+        """
+        Извлекает текст документа целиком
+
+        Args:
+            source: Байты DOCX файла, путь к нему или открытый файл
+
+        Returns:
+            Текст документа
+        """
+        return "".join(self.iter_text(source))
+
+    def iter_text(self, source: DocxSource, chunk_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Выдает текст по мере чтения документа
+
+        Args:
+            source: Байты DOCX файла, путь к нему или открытый файл
+            chunk_size: Объединять текст элементов верхнего уровня в части
+                не короче chunk_size символов; по умолчанию - по одному элементу
+        """
+        with open_source(source) as file_like, zipfile.ZipFile(file_like) as docx:
+            context: Dict[str, Any] = {"deleted_children": [], "extra": None}
+            pending: List[str] = []
+            pending_size = 0
+            with docx.open(find_document_part(docx)) as document_xml:
+                for element in self._iter_body(document_xml):
+                    if element is None:
+                        # Не WordprocessingML transitional (например, strict) - читает Mammoth
+                        file_like.seek(0)
+                        yield mammoth.extract_raw_text(file_like).value
+                        return
+                    out: List[str] = []
+                    self._read(element, out, context)
+                    text = "".join(out)
+                    if not text:
+                        continue
+                    if chunk_size is None:
+                        yield text
+                        continue
+                    pending.append(text)
+                    pending_size += len(text)
+                    if pending_size >= chunk_size:
+                        yield "".join(pending)
+                        pending = []
+                        pending_size = 0
+            if pending:
+                yield "".join(pending)
+
+    @staticmethod
+    def _iter_body(document_xml) -> Iterator[Optional[ElementTree.Element]]:
+        """
+        Выдает элементы верхнего уровня w:body по мере разбора
+        и удаляет их из дерева после обработки; None - если корень
+        документа не w:document
+        """
+        depth = 0
+        body = None
+        for event, element in ElementTree.iterparse(document_xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 1 and element.tag != _w("document"):
+                    yield None
+                    return
+                if depth == 2 and element.tag == _w("body"):
+                    body = element
+                continue
+            depth -= 1
+            if depth == 2 and body is not None:
+                yield element
+                body.remove(element)
+
+    def _read(self, element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        # Неизвестные элементы Mammoth пропускает вместе с содержимым
+        handler = self._handlers.get(element.tag)
+        if handler is not None:
+            handler(element, out, context)
+
+    def _read_all(self, elements, out: List[str], context: Dict[str, Any]) -> None:
+        for element in elements:
+            self._read(element, out, context)
+
+    def _read_paragraph(self, element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        properties = element.find(_w("pPr"))
+        run_properties = properties.find(_w("rPr")) if properties is not None else None
+        if run_properties is not None and run_properties.find(_w("del")) is not None:
+            # Содержимое удаленного параграфа переносится в следующий
+            context["deleted_children"].extend(element)
+            return
+
+        children = list(element)
+        if context["deleted_children"]:
+            children = context["deleted_children"] + children
+            context["deleted_children"] = []
+
+        # Содержимое w:pict Mammoth выводит после параграфа
+        outer_extra = context["extra"]
+        extra: List[str] = []
+        context["extra"] = extra
+        try:
+            self._read_all(children, out, context)
+        finally:
+            context["extra"] = outer_extra
+        out.append("\n\n")
+        out.extend(extra)
+
+    @staticmethod
+    def _read_text(element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        out.append("".join(element.itertext()))
+
+    @staticmethod
+    def _read_symbol(element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        font = element.get(_w("font"))
+        char = element.get(_w("char")) or ""
+        try:
+            code_point = dingbats.get((font, int(char, 16)))
+            if code_point is None and re.match("^F0..", char):
+                code_point = dingbats.get((font, int(char[2:], 16)))
+        except ValueError:
+            code_point = None
+        if code_point is not None:
+            out.append(chr(code_point))
+
+    def _read_pict(self, element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        extra = context["extra"]
+        self._read_all(element, out if extra is None else extra, context)
+
+    def _read_sdt(self, element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        content = element.find(_w("sdtContent"))
+        if content is not None:
+            self._read_all(content, out, context)
+
+    def _read_alternate_content(self, element: ElementTree.Element, out: List[str], context: Dict[str, Any]) -> None:
+        fallback = element.find(f"{{{MC}}}Fallback")
+        if fallback is not None:
+            self._read_all(fallback, out, context)
+
+
+_worker_extractor: Optional[TextExtractor] = None
+
+
+def extract_docx_text(source: DocxSource) -> Dict[str, str]:
+    """
+    Точка входа для процессов пула: извлекает простой текст DOCX
+
+    Args:
+        source: Байты DOCX файла, путь к нему или открытый файл
+
+    Returns:
+        Dict с текстом документа (text)
+    """
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = TextExtractor()
+    return {"text": _worker_extractor.extract(source)}
@@ -0,0 +1,269 @@
+import hashlib
+import io
+import os
+import tempfile
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Optional, Union
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+CHUNK_SIZE = 64 * 1024
+
+
+class SourceChangedError(Exception):
+    """
+    Файл изменился после приема: хэш содержимого, прочитанного
+    для конвертации, не совпадает с хэшем, вычисленным при приеме
+    """
+
+
+class IngestedUpload:
+    """
+    Принятый файл: хэш и размер вычислены при приеме, содержимое
+    хранится в памяти (небольшие файлы) или во временном файле на диске.
+
+    Временный файл удаляется вызовом cleanup() (файлы, переданные
+    с owns_path=False, не удаляются); если в этот момент файл
+    еще читается конвертацией (retain/release), удаление откладывается
+    до ее завершения.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        size: int,
+        content_hash: str,
+        data: Optional[bytes] = None,
+        path: Optional[str] = None,
+        owns_path: bool = True
+    ):
+        self.filename = filename
+        self.size = size
+        self.content_hash = content_hash
+        self.data = data
+        self.path = path
+        # False для файлов, которые принадлежат не нам (например, на общем томе)
+        self.owns_path = owns_path
+        self._retained = 0
+        self._cleanup_requested = False
+
+    @classmethod
+    def from_bytes(cls, filename: str, content: bytes, content_hash: Optional[str] = None) -> "IngestedUpload":
+        """
+        Создает объект для уже прочитанного в память содержимого
+        """
+        return cls(
+            filename=filename,
+            size=len(content),
+            content_hash=content_hash or hashlib.sha256(content).hexdigest(),
+            data=content
+        )
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """
+        Источник для конвертации: путь к временному файлу или байты.
+        Путь передается в процесс пула без копирования содержимого.
+        """
+        return self.path if self.path is not None else self.data
+
+    @property
+    def verify_source(self) -> bool:
+        """
+        Содержимое нужно сверить с хэшем перед конвертацией: файл
+        принадлежит не нам и может измениться после приема
+        """
+        return self.path is not None and not self.owns_path
+
+    def open(self) -> BinaryIO:
+        """
+        Открывает содержимое как файловый объект
+        """
+        if self.path is not None:
+            return open(self.path, "rb")
+        return io.BytesIO(self.data)
+
+    def retain(self) -> None:
+        """Отмечает, что содержимое используется конвертацией"""
+        self._retained += 1
+
+    def release(self) -> None:
+        """Снимает отметку использования и выполняет отложенное удаление"""
+        self._retained -= 1
+        if self._retained <= 0 and self._cleanup_requested:
+            self._remove()
+
+    def cleanup(self) -> None:
+        """
+        Удаляет временный файл (или откладывает удаление до release)
+        """
+        self._cleanup_requested = True
+        if self._retained <= 0:
+            self._remove()
+
+    def _remove(self) -> None:
+        self.data = None
+        if self.path is not None and self.owns_path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+def run_verified(
+    func: Callable[..., Dict[str, Any]],
+    path: str,
+    content_hash: str,
+    *args: Any
+) -> Dict[str, Any]:
+    """
+    Точка входа для процессов пула: сверяет SHA-256 файла с хэшем,
+    вычисленным при приеме, и вызывает func с открытым файлом.
+
+    Файл читается блоками и не копируется в память целиком. Хэш
+    считается по тому же дескриптору, из которого читает func, а
+    изменение размера или времени модификации во время конвертации
+    (запись на месте) тоже считается изменением источника
+
+    Raises:
+        SourceChangedError: Содержимое файла изменилось после приема
+    """
+    with open(path, "rb") as f:
+        before = os.fstat(f.fileno())
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+        if digest.hexdigest() != content_hash:
+            raise SourceChangedError(path)
+        f.seek(0)
+        result = func(f, *args)
+        after = os.fstat(f.fileno())
+        if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+            raise SourceChangedError(path)
+    return result
+
+
+class UploadIngestor:
+    """
+    Потоковый прием загрузок.
+
+    Хэш SHA-256 вычисляется по мере поступления данных, превышение
+    максимального размера прерывает прием сразу, а тела больше порога
+    сбрасываются во временный файл, поэтому пиковое потребление памяти
+    на запрос не зависит от размера файла.
+    """
+
+    def __init__(self, max_size: int, spool_threshold: int, spool_dir: Optional[str] = None):
+        self.logger = get_logger(__name__)
+        self.max_size = max_size
+        self.spool_threshold = spool_threshold
+        self.spool_dir = spool_dir or None
+
+    async def ingest_upload(self, file: UploadFile) -> IngestedUpload:
+        """
+        Принимает файл из multipart запроса
+
+        Args:
+            file: Загруженный файл
+
+        Returns:
+            Принятый файл
+        """
+        async def chunks() -> AsyncIterator[bytes]:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+        return await self.ingest(chunks(), file.filename)
+
+    async def ingest(self, chunks: AsyncIterator[bytes], filename: str) -> IngestedUpload:
+        """
+        Принимает поток байтов
+
+        Args:
+            chunks: Асинхронный поток частей тела
+            filename: Имя исходного файла
+
+        Returns:
+            Принятый файл
+
+        Raises:
+            HTTPException: 413, если размер превышает max_size
+        """
+        digest = hashlib.sha256()
+        buffer = bytearray()
+        spool: Optional[BinaryIO] = None
+        size = 0
+
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > self.max_size:
+                    self.logger.warning("Превышен максимальный размер загрузки",
+                                        filename=filename,
+                                        max_size=self.max_size)
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Файл слишком большой (максимум {self.max_size} байт)"
+                    )
+                digest.update(chunk)
+
+                if spool is not None:
+                    await run_in_threadpool(spool.write, chunk)
+                    continue
+
+                buffer += chunk
+                if len(buffer) > self.spool_threshold:
+                    spool = await run_in_threadpool(self._open_spool)
+                    await run_in_threadpool(spool.write, bytes(buffer))
+                    buffer = bytearray()
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                self._remove(spool.name)
+            raise
+
+        if spool is not None:
+            await run_in_threadpool(spool.close)
+            self.logger.debug("Загрузка сохранена во временный файл",
+                              filename=filename,
+                              file_size=size)
+            return IngestedUpload(filename, size, digest.hexdigest(), path=spool.name)
+
+        return IngestedUpload(filename, size, digest.hexdigest(), data=bytes(buffer))
+
+    def _open_spool(self) -> BinaryIO:
+        return tempfile.NamedTemporaryFile(
+            mode="wb", suffix=".docx", dir=self.spool_dir, delete=False
+        )
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_upload_ingestor: Optional[UploadIngestor] = None
+
+
+def get_upload_ingestor() -> UploadIngestor:
+    """
+    Получить общий для процесса приемник загрузок
+
+    Returns:
+        Экземпляр UploadIngestor, настроенный из Settings
+    """
+    global _upload_ingestor
+    if _upload_ingestor is None:
+        settings = get_settings()
+        _upload_ingestor = UploadIngestor(
+            max_size=settings.max_upload_size,
+            spool_threshold=settings.spool_threshold,
+            spool_dir=settings.spool_dir
+        )
+    return _upload_ingestor
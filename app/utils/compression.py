@@ -0,0 +1,126 @@
+import gzip
+import zlib
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def available_encodings() -> List[str]:
+    """
+    Возвращает поддерживаемые кодировки в порядке предпочтения сервера
+
+    Returns:
+        Список имен кодировок для Content-Encoding
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Выбирает кодировку по заголовку Accept-Encoding
+
+    Среди кодировок с наибольшим q-значением выбирается та,
+    что раньше в списке предпочтений сервера.
+
+    Args:
+        accept_encoding: Значение заголовка Accept-Encoding
+
+    Returns:
+        Имя кодировки или None, если подходящей нет
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+
+    best: Optional[str] = None
+    best_quality = 0.0
+    for encoding in available_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """
+    Сжимает данные указанной кодировкой
+
+    Args:
+        data: Исходные данные
+        encoding: Кодировка (gzip, br, zstd)
+        level: Уровень сжатия (для br ограничивается 11, для gzip - 9)
+
+    Returns:
+        Сжатые данные
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=min(level, 9), mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Неподдерживаемая кодировка: {encoding}")
+
+
+class StreamCompressor:
+    """
+    Потоковое сжатие для ответов, отдаваемых по частям
+    """
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(min(level, 9), zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=min(level, 11))
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            raise ValueError(f"Неподдерживаемая кодировка: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Сжимает очередную часть и сбрасывает буфер, чтобы клиент
+        мог сразу начать разбор полученных данных
+        """
+        if self.encoding == "gzip":
+            return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        """
+        Завершает поток сжатия
+        """
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
@@ -0,0 +1,28 @@
+import io
+from contextlib import nullcontext
+from typing import BinaryIO, ContextManager, Union
+
+# Источник DOCX: байты, путь к файлу или уже открытый файл
+DocxSource = Union[bytes, str, BinaryIO]
+
+
+def open_source(source: DocxSource) -> ContextManager[BinaryIO]:
+    """
+    Открывает источник DOCX для чтения
+
+    Байты оборачиваются в BytesIO, путь открывается с диска. Открытый
+    файл перематывается в начало и при выходе из with не закрывается:
+    им владеет вызывающий код
+
+    Args:
+        source: Байты DOCX файла, путь к нему или открытый файл
+
+    Returns:
+        Контекстный менеджер с файловым объектом
+    """
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, str):
+        return open(source, "rb")
+    source.seek(0)
+    return nullcontext(source)
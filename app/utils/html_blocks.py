@@ -0,0 +1,111 @@
+import html as html_lib
+import re
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Тег в HTML Mammoth: в тексте и значениях атрибутов "<" и ">" экранированы,
+# пустые элементы записываются как <br />
+_TAG_PATTERN = re.compile(r"<(/?)([A-Za-z][A-Za-z0-9]*)[^>]*?(/?)>")
+_ANY_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+
+class HtmlSection(NamedTuple):
+    """
+    Раздел HTML: заголовок и все элементы до следующего заголовка раздела
+    """
+    level: int
+    title: Optional[str]
+    start: int
+    end: int
+    offset: int
+    length: int
+
+
+def iter_top_level_blocks(html: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Перечисляет элементы верхнего уровня HTML, сформированного Mammoth
+
+    Args:
+        html: HTML фрагмент (тело документа)
+
+    Returns:
+        Итератор (начало, конец, имя тега) в символах строки
+    """
+    depth = 0
+    start = 0
+    tag_name = ""
+    for match in _TAG_PATTERN.finditer(html):
+        closing, name, self_closing = match.groups()
+        if closing:
+            depth -= 1
+            if depth == 0:
+                yield start, match.end(), tag_name
+        elif self_closing:
+            if depth == 0:
+                yield match.start(), match.end(), name
+        else:
+            if depth == 0:
+                start = match.start()
+                tag_name = name
+            depth += 1
+
+
+def cut_at_budget(html: str, max_bytes: int) -> Optional[int]:
+    """
+    Находит границу элемента верхнего уровня, на которой HTML
+    достигает бюджета в байтах
+
+    Элемент, на котором бюджет достигнут, включается целиком,
+    поэтому результат может немного превышать бюджет.
+
+    Args:
+        html: HTML фрагмент
+        max_bytes: Бюджет в байтах UTF-8
+
+    Returns:
+        Позиция, по которую нужно обрезать строку, или None,
+        если весь HTML укладывается в бюджет
+    """
+    emitted = 0
+    previous_end = 0
+    for _, end, _ in iter_top_level_blocks(html):
+        if emitted >= max_bytes:
+            return previous_end
+        emitted += len(html[previous_end:end].encode("utf-8"))
+        previous_end = end
+    if emitted >= max_bytes and previous_end < len(html):
+        return previous_end
+    return None
+
+
+def split_sections(html: str, heading_tags: Sequence[str]) -> List[HtmlSection]:
+    """
+    Делит HTML на разделы по заголовкам верхнего уровня
+
+    Текст до первого заголовка образует раздел уровня 0 без названия.
+
+    Args:
+        html: HTML фрагмент, сформированный Mammoth
+        heading_tags: Теги, начинающие раздел (например, h1 и h2)
+
+    Returns:
+        Разделы по порядку: позиции в строке (start, end) и смещение
+        и длина в байтах UTF-8 (offset, length)
+    """
+    starts: List[Tuple[int, int, Optional[str]]] = []
+    for start, end, tag_name in iter_top_level_blocks(html):
+        if tag_name in heading_tags:
+            title = html_lib.unescape(_ANY_TAG_PATTERN.sub("", html[start:end])).strip()
+            starts.append((start, int(tag_name[1:]) if tag_name[1:].isdigit() else 0, title))
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, 0, None))
+
+    sections = []
+    offset = 0
+    for index, (start, level, title) in enumerate(starts):
+        end = starts[index + 1][0] if index + 1 < len(starts) else len(html)
+        if end == start:
+            continue
+        length = len(html[start:end].encode("utf-8"))
+        sections.append(HtmlSection(level, title, start, end, offset, length))
+        offset += length
+    return sections
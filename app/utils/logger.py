@@ -105,6 +105,10 @@ class StructuredLogger:
         else:
             self.logger.log(level, message)
     
+    def is_enabled_for(self, level: int) -> bool:
+        """Проверка, будет ли записано сообщение данного уровня"""
+        return self.logger.isEnabledFor(level)
+    
     def debug(self, message: str, **kwargs):
         """Debug уровень логирования"""
         self._log_with_extra(logging.DEBUG, message, kwargs)
@@ -0,0 +1,145 @@
+"""
+Бенчмарк извлечения простого текста из DOCX (format=text).
+
+Сравнивает полную конвертацию в HTML (ConverterService.convert_content),
+mammoth.extract_raw_text и потоковый TextExtractor на сгенерированных
+документах разного размера.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_text_extraction [--sizes 1000,10000] [--repeat 3]
+"""
+import argparse
+import io
+import random
+import time
+import zipfile
+from typing import Callable, List
+
+import mammoth
+
+from app.services.converter_service import ConverterService
+from app.services.text_extractor import TextExtractor
+
+NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+PACKAGE_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:styles {NAMESPACES}>'
+    '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="BodyText"><w:name w:val="Body Text"/></w:style>'
+    '</w:styles>'
+)
+WORDS = ["договор", "сторона", "обязуется", "оплата", "срок", "акт", "услуга", "приложение"]
+
+
+def make_docx(paragraphs: int) -> bytes:
+    """
+    Генерирует DOCX: заголовки, абзацы из нескольких фрагментов
+    с форматированием и небольшие таблицы
+    """
+    rng = random.Random(paragraphs)
+    body: List[str] = []
+    for index in range(paragraphs):
+        if index % 50 == 0:
+            style = "Heading1"
+        elif index % 10 == 0:
+            style = "Heading2"
+        else:
+            style = "BodyText"
+        runs = "".join(
+            f'<w:r><w:rPr>{"<w:b/>" if rng.random() < 0.2 else ""}</w:rPr>'
+            f'<w:t xml:space="preserve">{" ".join(rng.choices(WORDS, k=6))} </w:t></w:r>'
+            for _ in range(rng.randint(1, 4))
+        )
+        body.append(f'<w:p><w:pPr><w:pStyle w:val="{style}"/></w:pPr>{runs}</w:p>')
+        if index % 100 == 99:
+            cells = "".join(
+                f'<w:tc><w:p><w:r><w:t>{rng.choice(WORDS)}</w:t></w:r></w:p></w:tc>' for _ in range(3)
+            )
+            body.append(f'<w:tbl><w:tr>{cells}</w:tr><w:tr>{cells}</w:tr></w:tbl>')
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document {NAMESPACES}><w:body>{"".join(body)}<w:sectPr/></w:body></w:document>'
+    )
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", CONTENT_TYPES)
+        docx.writestr("_rels/.rels", PACKAGE_RELATIONSHIPS)
+        docx.writestr("word/document.xml", document)
+        docx.writestr("word/styles.xml", STYLES)
+        docx.writestr(
+            "word/_rels/document.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/></Relationships>'
+        )
+    return output.getvalue()
+
+
+def measure(extract: Callable[[bytes], object], content: bytes, repeat: int) -> float:
+    """
+    Лучшее время обработки документа из repeat прогонов, в секундах
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract(content)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000",
+                        help="Число параграфов в документах через запятую")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Число прогонов на каждый размер")
+    args = parser.parse_args()
+
+    service = ConverterService()
+    extractor = TextExtractor()
+
+    print(f"{'paragraphs':>10} {'size, KB':>10} {'impl':>10} {'seconds':>10} {'MB/s':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        content = make_docx(size)
+        megabytes = len(content) / 1024 / 1024
+        implementations = (
+            # Полный путь format=json/html: карта стилей, трансформации, HTML
+            ("html", service.convert_content),
+            ("raw_text", lambda data: mammoth.extract_raw_text(io.BytesIO(data)).value),
+            ("streaming", extractor.extract),
+        )
+        for name, extract in implementations:
+            elapsed = measure(extract, content, args.repeat)
+            print(f"{size:>10} {len(content) // 1024:>10} {name:>10} {elapsed:>10.4f} "
+                  f"{megabytes / elapsed:>8.2f}")
+
+        # Текст должен совпадать с mammoth.extract_raw_text
+        if extractor.extract(content) != mammoth.extract_raw_text(io.BytesIO(content)).value:
+            print(f"{size:>10} ВНИМАНИЕ: текст отличается от mammoth.extract_raw_text")
+
+
+if __name__ == "__main__":
+    main()
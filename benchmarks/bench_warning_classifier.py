@@ -0,0 +1,126 @@
+"""
+Микробенчмарк классификации предупреждений Mammoth.
+
+Сравнивает WarningClassifier с прежней схемой (несколько поисков
+подстрок на предупреждение и re.search с некомпилированными шаблонами
+для извлечения сведений о стиле). Классификатор измеряется без
+запоминания (uncached), с пустым кэшем - новый классификатор на каждый
+прогон (cold) и с кэшем, заполненным предыдущим прогоном (warm).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_warning_classifier [--sizes 10000,100000] [--repeat 5] [--distinct 50]
+"""
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.models.warning_classifier import WarningClassifier
+
+SAMPLE_WARNINGS = [
+    "Unrecognised paragraph style: Основной текст (4) (Style ID: Style{n})",
+    "Paragraph style with ID {n} was referenced but not defined in the document",
+    "An unrecognised element was ignored: w:tblPrEx",
+    "An unrecognised element was ignored: {{http://schemas.microsoft.com/office/word/2010/wordml}}ext{n}",
+    "Image of type image/x-emf is unlikely to be displayed in web browsers",
+]
+
+
+def make_warnings(size: int, distinct_styles: int = 50) -> List[str]:
+    """
+    Генерирует список предупреждений с повторами, как в больших документах
+    """
+    rng = random.Random(size)
+    return [
+        rng.choice(SAMPLE_WARNINGS).format(n=rng.randrange(distinct_styles))
+        for _ in range(size)
+    ]
+
+
+def legacy_classify(warning: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Прежняя схема: поиск подстрок и извлечение стиля через re.search
+    """
+    if 'was referenced but not defined' in warning:
+        category = 'undefined_styles'
+    elif 'Unrecognised paragraph style' in warning:
+        category = 'unrecognized_styles'
+    elif 'unrecognised element was ignored' in warning:
+        if 'w:tblPrEx' in warning:
+            category = 'table_formatting_ignored'
+        else:
+            category = 'missing_elements'
+    else:
+        return 'other_warnings', {}
+
+    if category not in ('undefined_styles', 'unrecognized_styles'):
+        return category, {}
+
+    match = re.search(r"Unrecognised paragraph style: (.+?) \(Style ID: (.+?)\)", warning)
+    if match:
+        return category, {'style_name': match.group(1), 'style_id': match.group(2)}
+    match = re.search(r"Paragraph style with ID (.+?) was referenced", warning)
+    if match:
+        return category, {'style_name': 'Unknown', 'style_id': match.group(1)}
+    return category, {'style_name': 'Unknown', 'style_id': 'Unknown'}
+
+
+def measure(
+    make_classify: Callable[[], Callable[[str], Tuple[str, Dict[str, str]]]],
+    warnings: List[str],
+    repeat: int
+) -> float:
+    """
+    Лучшее время классификации всего списка из repeat прогонов, в секундах;
+    make_classify вызывается перед каждым прогоном вне замера
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        classify = make_classify()
+        started = time.perf_counter()
+        for warning in warnings:
+            classify(warning)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000",
+                        help="Размеры списков предупреждений через запятую")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Число прогонов на каждый размер")
+    parser.add_argument("--distinct", type=int, default=50,
+                        help="Число разных идентификаторов стилей в предупреждениях")
+    args = parser.parse_args()
+
+    print(f"{'warnings':>10} {'impl':>10} {'seconds':>10} {'warnings/s':>14}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        warnings = make_warnings(size, args.distinct)
+        warm = WarningClassifier()
+        for warning in warnings:
+            warm.classify(warning)
+        implementations = (
+            ("legacy", lambda: legacy_classify),
+            # Поиск подстрок и шаблоны стилей без запоминания результатов
+            ("uncached", lambda: WarningClassifier()._classify),
+            ("cold", lambda: WarningClassifier().classify),
+            ("warm", lambda: warm.classify),
+        )
+        for name, make_classify in implementations:
+            elapsed = measure(make_classify, warnings, args.repeat)
+            print(f"{size:>10} {name:>10} {elapsed:>10.4f} {size / elapsed:>14,.0f}")
+
+        # Результаты обеих реализаций должны совпадать
+        classifier = WarningClassifier()
+        mismatches = sum(
+            legacy_classify(warning) != classifier.classify(warning)
+            for warning in warnings
+        )
+        if mismatches:
+            print(f"{size:>10} ВНИМАНИЕ: расхождений с прежней схемой: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
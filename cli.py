@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import signal
+import sys
+from typing import Any, Dict, Optional
+from app.config import get_settings
+from app.models.conversion_options import ConversionOptions
+from app.services.folder_watcher import FolderWatcher
+from app.services.offline_converter import ConversionReport, OfflineConverter, create_executor
+from app.utils.logger import LoggerConfig, get_logger
+
+
+def print_report(summary: Dict[str, Any], slowest: int) -> None:
+    """
+    Печатает итоги запуска: счетчики, пропускную способность и самые медленные файлы
+    """
+    print(f"Сконвертировано: {summary['converted']}, "
+          f"пропущено: {summary['skipped']}, "
+          f"ошибок: {summary['failed']}")
+    print(f"Время: {summary['elapsed_seconds']} с, "
+          f"{summary['files_per_second']} файлов/с, "
+          f"{summary['megabytes_per_second']} МБ/с")
+    if summary["median_ms"] is not None:
+        print(f"Время на файл: медиана {summary['median_ms']} мс, максимум {summary['max_ms']} мс")
+    if summary["slowest"][:slowest]:
+        print("Самые медленные файлы:")
+        for item in summary["slowest"][:slowest]:
+            print(f"  {item['duration_ms']:>10} мс  {item['file']}")
+
+
+def write_report(path: Optional[str], summary: Dict[str, Any]) -> None:
+    """
+    Сохраняет полный отчет (включая время по каждому файлу) в JSON
+    """
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+def run_batch(args: argparse.Namespace, options: ConversionOptions) -> int:
+    converter = OfflineConverter(
+        args.input,
+        args.output,
+        manifest_path=args.manifest,
+        options=options,
+        retry_failed=args.retry_failed
+    )
+    with create_executor(args.workers, get_settings().converter_start_method) as executor:
+        try:
+            report = converter.run(executor, max_pending=args.workers * 2)
+        except KeyboardInterrupt:
+            print("Прервано; манифест сохранен, повторный запуск продолжит с места остановки",
+                  file=sys.stderr)
+            return 130
+        except OSError as e:
+            # Например, входной каталог недоступен
+            print(f"Ошибка ввода-вывода: {e}", file=sys.stderr)
+            return 2
+
+    summary = report.summary()
+    print_report(summary, args.slowest)
+    write_report(args.report, summary)
+    return 1 if report.failed else 0
+
+
+def run_watch(args: argparse.Namespace, options: ConversionOptions) -> int:
+    # Каждый входной каталог пишет в свой подкаталог, если их несколько
+    converters = []
+    for input_dir in args.input:
+        output_dir = args.output
+        if len(args.input) > 1:
+            output_dir = os.path.join(args.output, os.path.basename(os.path.abspath(input_dir)))
+        converters.append(OfflineConverter(
+            input_dir,
+            output_dir,
+            options=options,
+            retry_failed=args.retry_failed
+        ))
+
+    with create_executor(args.workers, get_settings().converter_start_method) as executor:
+        watcher = FolderWatcher(
+            converters,
+            executor,
+            max_pending=args.workers * 2,
+            interval=args.interval
+        )
+        signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+
+        def on_report(report: ConversionReport) -> None:
+            print_report(report.summary(), args.slowest)
+            sys.stdout.flush()
+
+        try:
+            watcher.run_forever(on_report)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Офлайн конвертация DOCX в HTML без HTTP сервера"
+    )
+    parser.add_argument("--workers", type=int, default=settings.converter_workers,
+                        help="Число процессов конвертации")
+    parser.add_argument("--images", choices=[ConversionOptions.IMAGES_INLINE, ConversionOptions.IMAGES_STORE],
+                        default=settings.image_mode,
+                        help="Изображения: inline (data URI) или store (внешнее хранилище)")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Повторить файлы, завершившиеся ошибкой в прошлый раз "
+                             "(в режиме watch - один раз для каждой версии файла)")
+    parser.add_argument("--slowest", type=int, default=10,
+                        help="Сколько самых медленных файлов показать в отчете")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Уровень логирования")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Однократно сконвертировать дерево каталогов")
+    batch.add_argument("input", help="Каталог с DOCX файлами")
+    batch.add_argument("output", help="Каталог для HTML файлов (тот же HTML, что complete_html в API)")
+    batch.add_argument("--manifest", help="Путь к манифесту (по умолчанию <output>/manifest.json)")
+    batch.add_argument("--report", help="Сохранить полный отчет с временем по файлам в JSON")
+
+    watch = subparsers.add_parser("watch", help="Наблюдать за каталогами и конвертировать новые файлы")
+    watch.add_argument("input", nargs="+", help="Каталоги для наблюдения")
+    watch.add_argument("--output", required=True, help="Каталог для HTML файлов (тот же HTML, что complete_html в API)")
+    watch.add_argument("--interval", type=float, default=2.0,
+                       help="Интервал опроса каталогов в секундах")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    LoggerConfig.setup_logging(level=args.log_level, format_type="json")
+    logger = get_logger(__name__)
+    logger.info("Запуск офлайн конвертации", command=args.command, workers=args.workers)
+
+    options = ConversionOptions(image_mode=args.images)
+    if args.command == "batch":
+        return run_batch(args, options)
+    return run_watch(args, options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,26 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.controllers.converter_controller import router as converter_router
+from app.controllers.images_controller import router as images_router
+from app.controllers.jobs_controller import router as jobs_router
+from app.services.conversion_engine import get_conversion_engine
+from app.services.job_service import get_job_manager
 from app.utils.logger import LoggerConfig, get_logger
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Пул процессов запускается вместе с приложением и останавливается при выходе
+    engine = get_conversion_engine()
+    engine.start()
+    job_manager = get_job_manager()
+    job_manager.start()
+    yield
+    await job_manager.shutdown()
+    engine.shutdown()
+
+
 def create_app() -> FastAPI:
     # Настройка логирования
     LoggerConfig.setup_logging(
@@ -19,10 +36,13 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Document Converter API",
         description="API для конвертации документов",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     
     app.include_router(converter_router, prefix="/api/v1")
+    app.include_router(jobs_router, prefix="/api/v1")
+    app.include_router(images_router, prefix="/api/v1")
     logger.info("Маршруты зарегистрированы", prefix="/api/v1")
     
     return app